@@ -0,0 +1,34 @@
+"""seed keyword set version
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    app_settings = sa.table(
+        "app_settings",
+        sa.column("key", sa.String),
+        sa.column("value", sa.Text),
+        sa.column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.bulk_insert(
+        app_settings,
+        [{"key": "keywords.version", "value": uuid.uuid4().hex, "updated_at": datetime.now(timezone.utc)}],
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM app_settings WHERE key = 'keywords.version'")
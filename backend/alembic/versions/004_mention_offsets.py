@@ -0,0 +1,97 @@
+"""store mention context as transcript offsets
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEGMENT_RADIUS = 300
+BATCH_SIZE = 1000
+
+
+def _segment(text: str, match_start: int, match_end: int) -> str:
+    seg_start = max(0, match_start - SEGMENT_RADIUS)
+    seg_end = min(len(text), match_end + SEGMENT_RADIUS)
+    prefix = "..." if seg_start > 0 else ""
+    suffix = "..." if seg_end < len(text) else ""
+    return prefix + text[seg_start:seg_end] + suffix
+
+
+def _find_offsets(transcript: str, matched_text: str, segment: str) -> tuple[int, int] | None:
+    if not matched_text:
+        return None
+    idx = transcript.find(matched_text)
+    while idx != -1:
+        end = idx + len(matched_text)
+        if _segment(transcript, idx, end) == segment:
+            return idx, end
+        idx = transcript.find(matched_text, idx + 1)
+    return None
+
+
+def upgrade() -> None:
+    op.add_column("mentions", sa.Column("match_start", sa.Integer, nullable=True))
+    op.add_column("mentions", sa.Column("match_end", sa.Integer, nullable=True))
+    op.alter_column("mentions", "transcript_segment", existing_type=sa.Text, nullable=True)
+
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        query = (
+            "SELECT m.id, m.matched_text, m.transcript_segment, e.transcript_text "
+            "FROM mentions m JOIN episodes e ON e.id = m.episode_id "
+            "WHERE m.match_start IS NULL AND e.transcript_text IS NOT NULL "
+        )
+        params = {"limit": BATCH_SIZE}
+        if last_id is not None:
+            query += "AND m.id > :last_id "
+            params["last_id"] = last_id
+        rows = conn.execute(sa.text(query + "ORDER BY m.id LIMIT :limit"), params).fetchall()
+        if not rows:
+            break
+
+        for mention_id, matched_text, segment, transcript in rows:
+            offsets = _find_offsets(transcript, matched_text, segment)
+            if offsets is None:
+                # Keep the copied segment for rows the transcript no longer reproduces.
+                continue
+            conn.execute(
+                sa.text(
+                    "UPDATE mentions SET match_start = :start, match_end = :end, "
+                    "transcript_segment = NULL WHERE id = :id"
+                ),
+                {"start": offsets[0], "end": offsets[1], "id": mention_id},
+            )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT m.id, m.match_start, m.match_end, e.transcript_text "
+            "FROM mentions m JOIN episodes e ON e.id = m.episode_id "
+            "WHERE m.transcript_segment IS NULL"
+        )
+    ).fetchall()
+    for mention_id, match_start, match_end, transcript in rows:
+        segment = ""
+        if transcript is not None and match_start is not None and match_end is not None:
+            segment = _segment(transcript, match_start, match_end)
+        conn.execute(
+            sa.text("UPDATE mentions SET transcript_segment = :segment WHERE id = :id"),
+            {"segment": segment, "id": mention_id},
+        )
+
+    op.alter_column("mentions", "transcript_segment", existing_type=sa.Text, nullable=False)
+    op.drop_column("mentions", "match_end")
+    op.drop_column("mentions", "match_start")
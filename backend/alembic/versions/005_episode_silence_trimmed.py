@@ -0,0 +1,23 @@
+"""record seconds of silence trimmed before transcription
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("episodes", sa.Column("silence_trimmed_seconds", sa.Float, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("episodes", "silence_trimmed_seconds")
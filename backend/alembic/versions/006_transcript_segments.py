@@ -0,0 +1,37 @@
+"""add transcript segment timings and mention audio time
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transcript_segments",
+        sa.Column(
+            "episode_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("episodes.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("starts", sa.JSON, nullable=False),
+        sa.Column("ends", sa.JSON, nullable=False),
+        sa.Column("offsets", sa.JSON, nullable=False),
+    )
+    op.add_column("mentions", sa.Column("audio_seconds", sa.Float, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("mentions", "audio_seconds")
+    op.drop_table("transcript_segments")
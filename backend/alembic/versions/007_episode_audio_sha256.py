@@ -0,0 +1,25 @@
+"""add audio content hash to episodes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("episodes", sa.Column("audio_sha256", sa.String(64), nullable=True))
+    op.create_index("ix_episodes_audio_sha256", "episodes", ["audio_sha256"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_episodes_audio_sha256", table_name="episodes")
+    op.drop_column("episodes", "audio_sha256")
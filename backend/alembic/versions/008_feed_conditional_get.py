@@ -0,0 +1,27 @@
+"""add conditional GET validators to feeds
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("feeds", sa.Column("etag", sa.String, nullable=True))
+    op.add_column("feeds", sa.Column("last_modified", sa.String, nullable=True))
+    op.add_column("feeds", sa.Column("content_sha256", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("feeds", "content_sha256")
+    op.drop_column("feeds", "last_modified")
+    op.drop_column("feeds", "etag")
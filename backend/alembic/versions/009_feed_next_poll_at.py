@@ -0,0 +1,25 @@
+"""add adaptive poll schedule to feeds
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("feeds", sa.Column("next_poll_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_feeds_next_poll_at", "feeds", ["next_poll_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feeds_next_poll_at", table_name="feeds")
+    op.drop_column("feeds", "next_poll_at")
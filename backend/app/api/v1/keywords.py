@@ -1,3 +1,4 @@
+import logging
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -7,8 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models import Keyword
 from app.schemas.keywords import KeywordCreate, KeywordResponse
+from app.services.keyword_set_service import bump_keyword_set_version_async
 
 router = APIRouter(prefix="/keywords", tags=["keywords"])
+logger = logging.getLogger(__name__)
 
 
 @router.get("", response_model=list[KeywordResponse])
@@ -28,8 +31,18 @@ async def create_keyword(data: KeywordCreate, db: AsyncSession = Depends(get_db)
 
     keyword = Keyword(phrase=data.phrase, match_type=data.match_type)
     db.add(keyword)
+    await bump_keyword_set_version_async(db)
     await db.commit()
     await db.refresh(keyword)
+
+    # Cover already-transcribed episodes without re-running transcription.
+    try:
+        from app.worker.tasks.backfill import backfill_keyword
+
+        backfill_keyword.delay(str(keyword.id))
+    except Exception:
+        logger.exception("Failed to enqueue backfill for keyword %s", keyword.id)
+
     return KeywordResponse.model_validate(keyword)
 
 
@@ -40,4 +53,5 @@ async def delete_keyword(keyword_id: UUID, db: AsyncSession = Depends(get_db)):
     if not keyword:
         raise HTTPException(status_code=404, detail="Keyword not found")
     await db.delete(keyword)
+    await bump_keyword_set_version_async(db)
     await db.commit()
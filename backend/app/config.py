@@ -22,19 +22,72 @@ class Settings(BaseSettings):
     LLM_ENRICH_MAX_RETRIES: int = 2
     LLM_ENRICH_RETRY_BASE_SECONDS: float = 2.0
     LLM_ENRICH_RETRY_MAX_SECONDS: float = 60.0
+    RATE_LIMIT_BACKEND: str = "redis"
+    LLM_RATE_LIMIT_PER_SECOND: float = 0.0
+    LLM_MODEL_RATE_LIMIT_PER_SECOND: float = 0.0
+    LLM_RATE_LIMIT_BURST: int = 1
+    ENRICHMENT_CONCURRENCY: int = 1
+    ENRICHMENT_BATCH_MAX_ITEMS: int = 1
+    ENRICHMENT_BATCH_PROMPT_TOKENS: int = 3000
+    ENRICHMENT_CACHE_BACKEND: str = "redis"
+    ENRICHMENT_CACHE_TTL_SECONDS: int = 2592000
+    ENRICHMENT_CACHE_MAX_ENTRIES: int = 10000
+    ENRICHMENT_CLUSTER_MATCHES: bool = True
+    ENRICHMENT_CLUSTER_ACROSS_KEYWORDS: bool = False
+    ENRICHMENT_CLUSTER_MAX_CHARS: int = 1500
+    KEYWORD_DETECTION_ENGINE: str = "automaton"
+    KEYWORD_BACKFILL_BATCH_SIZE: int = 200
+    HTTP_CLIENT_HTTP2: bool = True
+    HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST: int = 10
+    HTTP_CLIENT_KEEPALIVE_SECONDS: float = 30.0
+    HTTP_CLIENT_MAX_CLIENTS: int = 64
     AUDIO_DIR: str = "/data/audio"
+    AUDIO_CACHE_MAX_BYTES: int = 5368709120
+    AUDIO_CACHE_HIGH_WATER_PERCENT: float = 90.0
+    AUDIO_CACHE_SPACE_WAIT_SECONDS: int = 300
+    AUDIO_CACHE_ORPHAN_MAX_AGE_SECONDS: int = 86400
     AUDIO_DOWNLOAD_TIMEOUT_SECONDS: int = 900
     AUDIO_DOWNLOAD_MAX_BYTES: int = 524288000
+    AUDIO_DOWNLOAD_SEGMENTS: int = 1
+    AUDIO_DOWNLOAD_SEGMENT_MIN_BYTES: int = 8388608
+    AUDIO_DOWNLOAD_PER_HOST_CONCURRENCY: int = 0
+    AUDIO_DOWNLOAD_HOST_CONCURRENCY: dict[str, int] = {}
+    AUDIO_DOWNLOAD_HOST_BACKOFF_SECONDS: int = 15
+    AUDIO_DOWNLOAD_HOST_BACKOFF_MAX_SECONDS: int = 300
+    AUDIO_DOWNLOAD_HOST_MAX_WAITS: int = 40
     TRANSCRIPTION_EXTERNAL_MAX_UPLOAD_BYTES: int = 26214400
     TRANSCRIPTION_EXTERNAL_CHUNK_SECONDS: int = 600
     TRANSCRIPTION_EXTERNAL_CHUNK_BITRATE_KBPS: int = 48
+    TRANSCRIPTION_CHUNK_CONCURRENCY: int = 1
+    TRANSCRIPTION_CHUNK_MAX_RETRIES: int = 2
+    TRANSCRIPTION_CHUNK_RETRY_BASE_SECONDS: int = 15
+    TRANSCRIPTION_CHUNK_RETRY_MAX_SECONDS: int = 120
+    TRANSCRIPTION_CHECKPOINT_DIR: str = "/data/audio/transcription_checkpoints"
+    TRANSCRIPTION_TIMESTAMPS: bool = False
+    TRANSCRIPTION_VAD_ENABLED: bool = False
+    TRANSCRIPTION_VAD_NOISE_DB: float = -35.0
+    TRANSCRIPTION_VAD_MIN_SILENCE_SECONDS: float = 2.0
+    TRANSCRIPTION_VAD_PADDING_SECONDS: float = 0.3
+    TRANSCRIPTION_VAD_MIN_SAVED_SECONDS: float = 30.0
     TRANSCRIPTION_TIMEOUT_SECONDS: int = 900
     TRANSCRIPTION_TASK_RATE_LIMIT: str = "6/m"
+    TRANSCRIPTION_RATE_LIMIT_PER_SECOND: float = 0.0
+    TRANSCRIPTION_RATE_LIMIT_BURST: int = 1
     TRANSCRIPTION_429_RETRY_BASE_SECONDS: int = 90
     TRANSCRIPTION_429_RETRY_MAX_SECONDS: int = 1800
     PROCESS_EPISODE_SOFT_TIME_LIMIT_SECONDS: int = 1800
     PROCESS_EPISODE_TIME_LIMIT_SECONDS: int = 2100
     INITIAL_IMPORT_EPISODE_LIMIT: int = 10
+    FEED_FETCH_TIMEOUT_SECONDS: float = 30.0
+    FEED_POLL_BATCH_SIZE: int = 0
+    FEED_POLL_CONCURRENCY: int = 50
+    FEED_STREAMING_PARSE: bool = False
+    FEED_KNOWN_GUID_RUN: int = 3
+    FEED_POLL_MIN_SECONDS: int = 300
+    FEED_POLL_MAX_SECONDS: int = 43200
+    FEED_POLL_DEFAULT_SECONDS: int = 900
+    FEED_POLL_INTERVAL_FRACTION: float = 0.1
+    FEED_POLL_JITTER: float = 0.1
     MAX_EPISODES_PER_FEED: int = 10
 
     model_config = {"env_file": ".env"}
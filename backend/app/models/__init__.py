@@ -4,5 +4,6 @@ from app.models.episode import Episode
 from app.models.keyword import Keyword
 from app.models.mention import Mention
 from app.models.app_setting import AppSetting
+from app.models.transcript_segments import TranscriptSegments
 
-__all__ = ["Base", "Feed", "Episode", "Keyword", "Mention", "AppSetting"]
+__all__ = ["Base", "Feed", "Episode", "Keyword", "Mention", "AppSetting", "TranscriptSegments"]
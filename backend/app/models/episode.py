@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Text, DateTime, ForeignKey
+from sqlalchemy import String, Text, DateTime, Float, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -21,6 +21,10 @@ class Episode(Base, UUIDMixin, TimestampMixin):
     # pending → queued → downloading → transcribing → analyzing → completed / failed
     transcript_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Seconds of silence cut before transcription (None when trimming was off or skipped).
+    silence_trimmed_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # SHA-256 of the downloaded audio; identical files reuse one transcript.
+    audio_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
 
     feed: Mapped["Feed"] = relationship(back_populates="episodes")
     mentions: Mapped[list["Mention"]] = relationship(back_populates="episode", cascade="all, delete-orphan")
@@ -16,5 +16,12 @@ class Feed(Base, UUIDMixin, TimestampMixin):
     last_polled_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # Due feeds are dispatched by poll_all_feeds; None means poll on the next beat.
+    next_poll_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+    etag: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    content_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     episodes: Mapped[list["Episode"]] = relationship(back_populates="feed", cascade="all, delete-orphan")
@@ -1,12 +1,23 @@
 import uuid
 from typing import Optional
 
-from sqlalchemy import String, Text, Float, Boolean, ForeignKey
+from sqlalchemy import String, Text, Float, Boolean, Integer, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, UUIDMixin, TimestampMixin
 
+SEGMENT_RADIUS = 300  # chars of context around a match
+
+
+def extract_segment(text: str, match_start: int, match_end: int) -> str:
+    """Return the context window around a match, with ellipses where it was cut."""
+    seg_start = max(0, match_start - SEGMENT_RADIUS)
+    seg_end = min(len(text), match_end + SEGMENT_RADIUS)
+    prefix = "..." if seg_start > 0 else ""
+    suffix = "..." if seg_end < len(text) else ""
+    return prefix + text[seg_start:seg_end] + suffix
+
 
 class Mention(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "mentions"
@@ -14,7 +25,14 @@ class Mention(Base, UUIDMixin, TimestampMixin):
     episode_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("episodes.id", ondelete="CASCADE"))
     keyword_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("keywords.id", ondelete="CASCADE"))
     matched_text: Mapped[str] = mapped_column(String)
-    transcript_segment: Mapped[str] = mapped_column(Text)
+    # Character offsets of the match in episode.transcript_text; the context
+    # segment is rebuilt from them on read. stored_segment is only kept for rows
+    # whose offsets could not be recovered.
+    match_start: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    match_end: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    stored_segment: Mapped[Optional[str]] = mapped_column("transcript_segment", Text, nullable=True)
+    # Playback time of the match in the original audio, when segment timings exist.
+    audio_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     # Enrichment fields (filled by Ollama)
     sentiment: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -28,3 +46,16 @@ class Mention(Base, UUIDMixin, TimestampMixin):
 
     episode: Mapped["Episode"] = relationship(back_populates="mentions")
     keyword: Mapped["Keyword"] = relationship(back_populates="mentions")
+
+    @property
+    def transcript_segment(self) -> str:
+        if self.stored_segment is not None:
+            return self.stored_segment
+        transcript = self.episode.transcript_text if self.episode else None
+        if transcript is None or self.match_start is None or self.match_end is None:
+            return ""
+        return extract_segment(transcript, self.match_start, self.match_end)
+
+    @transcript_segment.setter
+    def transcript_segment(self, value: str | None) -> None:
+        self.stored_segment = value
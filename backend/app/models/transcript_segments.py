@@ -0,0 +1,33 @@
+import bisect
+import uuid
+from typing import Optional
+
+from sqlalchemy import JSON, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class TranscriptSegments(Base):
+    """Segment timings for one episode transcript, as parallel arrays.
+
+    Segment ``i`` starts at character ``offsets[i]`` of episode.transcript_text
+    and plays from ``starts[i]`` to ``ends[i]`` seconds of the original audio.
+    """
+
+    __tablename__ = "transcript_segments"
+
+    episode_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("episodes.id", ondelete="CASCADE"), primary_key=True
+    )
+    starts: Mapped[list] = mapped_column(JSON)
+    ends: Mapped[list] = mapped_column(JSON)
+    offsets: Mapped[list] = mapped_column(JSON)
+
+    def audio_time_at(self, char_offset: Optional[int]) -> Optional[float]:
+        """Start time of the segment containing ``char_offset``."""
+        if char_offset is None or not self.offsets:
+            return None
+        index = bisect.bisect_right(self.offsets, char_offset) - 1
+        return self.starts[max(0, index)]
@@ -22,3 +22,4 @@ class EpisodeResponse(BaseModel):
 class EpisodeDetailResponse(EpisodeResponse):
     transcript_text: Optional[str]
     error_message: Optional[str]
+    silence_trimmed_seconds: Optional[float] = None
@@ -15,6 +15,7 @@ class FeedResponse(BaseModel):
     title: Optional[str]
     image_url: Optional[str]
     last_polled_at: Optional[datetime]
+    next_poll_at: Optional[datetime] = None
     created_at: datetime
     episode_count: int = 0
 
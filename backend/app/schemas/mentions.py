@@ -11,6 +11,7 @@ class MentionResponse(BaseModel):
     keyword_id: UUID
     matched_text: str
     transcript_segment: str
+    audio_seconds: Optional[float] = None
     sentiment: Optional[str]
     sentiment_score: Optional[float]
     context_summary: Optional[str]
@@ -0,0 +1,160 @@
+import logging
+import os
+import shutil
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.config import settings
+from app.services.transcription_checkpoint import audio_sha256
+
+logger = logging.getLogger(__name__)
+
+# Scratch files left next to the cached audio by downloads and trimming.
+TEMP_SUFFIXES = (".part", ".part.json", ".trimmed.mp3")
+
+
+@dataclass(frozen=True)
+class CachedAudio:
+    episode_id: str
+    path: str
+    size: int
+    last_used: float
+
+
+def cached_audio() -> list[CachedAudio]:
+    """Complete ``{episode_id}.mp3`` files in AUDIO_DIR, least recently used first."""
+    entries = []
+    try:
+        names = os.listdir(settings.AUDIO_DIR)
+    except FileNotFoundError:
+        return entries
+    for name in names:
+        if not name.endswith(".mp3") or name.endswith(TEMP_SUFFIXES):
+            continue
+        path = os.path.join(settings.AUDIO_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append(CachedAudio(name[: -len(".mp3")], path, stat.st_size, stat.st_mtime))
+    entries.sort(key=lambda entry: entry.last_used)
+    return entries
+
+
+def touch(path: str) -> None:
+    """Mark cached audio as just used (LRU order is file mtime)."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def disk_above_high_water() -> bool:
+    usage = shutil.disk_usage(settings.AUDIO_DIR)
+    return usage.used * 100 >= usage.total * settings.AUDIO_CACHE_HIGH_WATER_PERCENT
+
+
+def evict(protected: set[str], under_pressure: Callable[[], bool] = lambda: False) -> int:
+    """Delete least recently used audio until the cache fits AUDIO_CACHE_MAX_BYTES.
+
+    Eviction continues past the budget while ``under_pressure()`` is true.
+    Files of ``protected`` episodes (still downloading or transcribing) are
+    never removed. Returns the number of bytes freed.
+    """
+    entries = cached_audio()
+    total = sum(entry.size for entry in entries)
+    budget = max(0, settings.AUDIO_CACHE_MAX_BYTES)
+    freed = 0
+    for entry in entries:
+        if total <= budget and not under_pressure():
+            break
+        if entry.episode_id in protected:
+            continue
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            continue
+        total -= entry.size
+        freed += entry.size
+        logger.info("Evicted cached audio for episode %s (%s bytes)", entry.episode_id, entry.size)
+    return freed
+
+
+def wait_for_space(protected_loader: Callable[[], set[str]]) -> None:
+    """Evict, then wait until the audio disk is below AUDIO_CACHE_HIGH_WATER_PERCENT.
+
+    Raises RuntimeError after AUDIO_CACHE_SPACE_WAIT_SECONDS so the download
+    task retries later instead of filling the volume.
+    """
+    os.makedirs(settings.AUDIO_DIR, exist_ok=True)
+    deadline = time.monotonic() + max(0, settings.AUDIO_CACHE_SPACE_WAIT_SECONDS)
+    while True:
+        evict(protected_loader(), under_pressure=disk_above_high_water)
+        if not disk_above_high_water():
+            return
+        if time.monotonic() >= deadline:
+            raise RuntimeError(
+                f"Audio disk is above {settings.AUDIO_CACHE_HIGH_WATER_PERCENT}% and nothing can be evicted"
+            )
+        logger.info("Audio disk above high-water mark; waiting for space")
+        time.sleep(10)
+
+
+def verify_cached_audio(path: str, expected_sha256: str | None) -> bool:
+    """True when ``path`` exists and still hashes to the digest recorded at download."""
+    if not expected_sha256 or not os.path.exists(path):
+        return False
+    return audio_sha256(path) == expected_sha256
+
+
+def sweep_orphans(orphaned: set[str], protected: set[str]) -> int:
+    """Remove audio of ``orphaned`` episodes and stale scratch files; return files removed.
+
+    Scratch files (partial downloads, trimmed copies, transcription
+    checkpoints) are removed once older than AUDIO_CACHE_ORPHAN_MAX_AGE_SECONDS
+    unless their episode is ``protected``.
+    """
+    removed = 0
+    cutoff = time.time() - settings.AUDIO_CACHE_ORPHAN_MAX_AGE_SECONDS
+
+    for entry in cached_audio():
+        if entry.episode_id in orphaned:
+            removed += _remove(entry.path)
+
+    for name in _listdir(settings.AUDIO_DIR):
+        path = os.path.join(settings.AUDIO_DIR, name)
+        if not name.endswith(TEMP_SUFFIXES) or name.split(".", 1)[0] in protected:
+            continue
+        if _mtime(path) < cutoff:
+            removed += _remove(path)
+
+    for name in _listdir(settings.TRANSCRIPTION_CHECKPOINT_DIR):
+        path = os.path.join(settings.TRANSCRIPTION_CHECKPOINT_DIR, name)
+        if os.path.isdir(path) and _mtime(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def _listdir(path: str) -> list[str]:
+    try:
+        return os.listdir(path)
+    except FileNotFoundError:
+        return []
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return float("inf")
+
+
+def _remove(path: str) -> int:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return 0
+    logger.info("Removed orphaned audio file %s", path)
+    return 1
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from app.config import settings
+from app.services.http_clients import get_http_client
+
+logger = logging.getLogger(__name__)
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+def download_audio(audio_url: str, audio_path: str) -> str:
+    """Download ``audio_url`` to ``audio_path`` and return its SHA-256 hex digest.
+
+    Bytes land in ``<audio_path>.part`` and are renamed into place only when
+    complete. A partial file left by an earlier attempt is resumed with a
+    ``Range`` request guarded by ``If-Range`` (ETag or Last-Modified), so a
+    changed file on the server restarts from zero instead of being spliced.
+    With AUDIO_DOWNLOAD_SEGMENTS > 1, fresh downloads of large files are
+    fetched as parallel byte ranges instead.
+    """
+    os.makedirs(os.path.dirname(audio_path) or ".", exist_ok=True)
+    part_path = f"{audio_path}.part"
+    started_at = time.monotonic()
+    timeout = httpx.Timeout(connect=20.0, read=30.0, write=30.0, pool=20.0)
+    client = get_http_client("download", audio_url)
+
+    if settings.AUDIO_DOWNLOAD_SEGMENTS > 1 and not os.path.exists(part_path):
+        digest = _download_segmented(audio_url, part_path, started_at, timeout)
+        if digest is not None:
+            os.replace(part_path, audio_path)
+            return digest
+
+    for _ in range(2):
+        offset, validator = _partial_download_state(part_path)
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+
+        with client.stream("GET", audio_url, headers=headers, follow_redirects=True, timeout=timeout) as resp:
+            if offset and resp.status_code == 416:
+                logger.info("Server rejected resume range for %s; restarting download", audio_url)
+                _discard_partial_download(part_path)
+                continue
+            resp.raise_for_status()
+
+            if offset and not _is_resumed_response(resp, offset):
+                # Range ignored or If-Range failed: the body is the whole file.
+                logger.info("Server sent the full file for %s; discarding %s partial bytes", audio_url, offset)
+                offset = 0
+            elif offset:
+                logger.info("Resuming download of %s at byte %s", audio_url, offset)
+            _save_validator(part_path, resp.headers)
+            digest = _write_body(resp, part_path, offset, started_at)
+        break
+    else:
+        raise RuntimeError(f"Could not resume or restart download of {audio_url}")
+
+    os.replace(part_path, audio_path)
+    _remove_quietly(_validator_path(part_path))
+    return digest
+
+
+class _RangeNotHonoured(Exception):
+    pass
+
+
+def _download_segmented(audio_url: str, part_path: str, started_at: float, timeout) -> str | None:
+    """Fetch AUDIO_DOWNLOAD_SEGMENTS byte ranges at once into a preallocated file.
+
+    Returns None, leaving no partial file, when the server does not support
+    ranges or the file is too small to be worth splitting; the caller then
+    falls back to a single stream. Segments use HTTP/1.1 so each one gets its
+    own TCP connection, which is what per-connection CDN throttling rewards.
+    """
+    client = get_http_client("download-segments", audio_url, http2=False)
+    with client.stream("GET", audio_url, headers={"Range": "bytes=0-0"}, follow_redirects=True, timeout=timeout) as resp:
+        if resp.status_code != 206:
+            return None
+        match = _CONTENT_RANGE_RE.match(resp.headers.get("Content-Range", ""))
+        if not match or match.group(3) == "*":
+            return None
+        total = int(match.group(3))
+        etag = resp.headers.get("ETag")
+        validator = etag if etag and not etag.startswith("W/") else resp.headers.get("Last-Modified")
+
+    if total > settings.AUDIO_DOWNLOAD_MAX_BYTES:
+        raise RuntimeError(f"Audio exceeds max size ({settings.AUDIO_DOWNLOAD_MAX_BYTES} bytes)")
+    segment_count = min(settings.AUDIO_DOWNLOAD_SEGMENTS, total // max(1, settings.AUDIO_DOWNLOAD_SEGMENT_MIN_BYTES))
+    if segment_count < 2:
+        return None
+
+    segment_size = -(-total // segment_count)
+    ranges = [(start, min(start + segment_size, total) - 1) for start in range(0, total, segment_size)]
+    logger.info("Downloading %s in %s segments (%s bytes)", audio_url, len(ranges), total)
+
+    with open(part_path, "wb") as f:
+        f.truncate(total)
+    try:
+        _fetch_ranges(client, audio_url, part_path, ranges, validator, started_at, timeout)
+    except _RangeNotHonoured:
+        logger.info("Server stopped honouring ranges for %s; using a single stream", audio_url)
+        _discard_partial_download(part_path)
+        return None
+    except BaseException:
+        # Scattered segments cannot be resumed by a Range request from the end.
+        _discard_partial_download(part_path)
+        raise
+
+    digest = hashlib.sha256()
+    _hash_prefix(digest, part_path, total)
+    return digest.hexdigest()
+
+
+def _fetch_ranges(client, audio_url, part_path, ranges, validator, started_at, timeout) -> None:
+    abort = threading.Event()
+    fd = os.open(part_path, os.O_WRONLY)
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="audio-segment") as executor:
+            futures = [
+                executor.submit(_fetch_range, client, audio_url, fd, start, end, validator, started_at, timeout, abort)
+                for start, end in ranges
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                # Stop the other segments instead of finishing a doomed download.
+                abort.set()
+                raise
+    finally:
+        os.close(fd)
+
+
+def _fetch_range(client, audio_url, fd, start, end, validator, started_at, timeout, abort) -> None:
+    headers = {"Range": f"bytes={start}-{end}"}
+    if validator:
+        headers["If-Range"] = validator
+    with client.stream("GET", audio_url, headers=headers, follow_redirects=True, timeout=timeout) as resp:
+        if resp.status_code != 206 or not _is_resumed_response(resp, start):
+            raise _RangeNotHonoured()
+        position = start
+        for chunk in resp.iter_bytes(chunk_size=65536):
+            if abort.is_set():
+                return
+            if position + len(chunk) > end + 1:
+                raise RuntimeError(f"Server sent more than the requested range {start}-{end}")
+            os.pwrite(fd, chunk, position)
+            position += len(chunk)
+            if time.monotonic() - started_at > settings.AUDIO_DOWNLOAD_TIMEOUT_SECONDS:
+                raise RuntimeError(
+                    f"Audio download exceeded {settings.AUDIO_DOWNLOAD_TIMEOUT_SECONDS} seconds"
+                )
+    if position != end + 1 and not abort.is_set():
+        raise RuntimeError(f"Segment {start}-{end} ended early at byte {position}")
+
+
+def _write_body(resp, part_path: str, offset: int, started_at: float) -> str:
+    digest = hashlib.sha256()
+    if offset:
+        _hash_prefix(digest, part_path, offset)
+
+    bytes_written = offset
+    with open(part_path, "r+b" if offset else "wb") as f:
+        f.seek(offset)
+        f.truncate()
+        for chunk in resp.iter_bytes(chunk_size=8192):
+            f.write(chunk)
+            digest.update(chunk)
+            bytes_written += len(chunk)
+            if bytes_written > settings.AUDIO_DOWNLOAD_MAX_BYTES:
+                raise RuntimeError(
+                    f"Audio exceeds max size ({settings.AUDIO_DOWNLOAD_MAX_BYTES} bytes)"
+                )
+            if time.monotonic() - started_at > settings.AUDIO_DOWNLOAD_TIMEOUT_SECONDS:
+                raise RuntimeError(
+                    f"Audio download exceeded {settings.AUDIO_DOWNLOAD_TIMEOUT_SECONDS} seconds"
+                )
+    return digest.hexdigest()
+
+
+def _is_resumed_response(resp, offset: int) -> bool:
+    if resp.status_code != 206:
+        return False
+    match = _CONTENT_RANGE_RE.match(resp.headers.get("Content-Range", ""))
+    return bool(match) and int(match.group(1)) == offset
+
+
+def _hash_prefix(digest, path: str, length: int) -> None:
+    remaining = length
+    with open(path, "rb") as f:
+        while remaining > 0:
+            block = f.read(min(_HASH_BLOCK_BYTES, remaining))
+            if not block:
+                raise RuntimeError(f"Partial download {path} is shorter than expected")
+            digest.update(block)
+            remaining -= len(block)
+
+
+def _validator_path(part_path: str) -> str:
+    return f"{part_path}.json"
+
+
+def _partial_download_state(part_path: str) -> tuple[int, str | None]:
+    """Return the resumable byte offset and its If-Range validator (0 when not resumable)."""
+    if not os.path.exists(part_path):
+        return 0, None
+    try:
+        with open(_validator_path(part_path), encoding="utf-8") as f:
+            validator = json.load(f).get("validator")
+    except (OSError, ValueError):
+        validator = None
+
+    size = os.path.getsize(part_path)
+    if not validator or not size:
+        # Without a strong validator a resumed body could belong to a different file.
+        _discard_partial_download(part_path)
+        return 0, None
+    return size, validator
+
+
+def _save_validator(part_path: str, headers) -> None:
+    etag = headers.get("ETag")
+    validator = etag if etag and not etag.startswith("W/") else headers.get("Last-Modified")
+    if not validator:
+        _remove_quietly(_validator_path(part_path))
+        return
+    with open(_validator_path(part_path), "w", encoding="utf-8") as f:
+        json.dump({"validator": validator}, f)
+
+
+def _discard_partial_download(part_path: str) -> None:
+    _remove_quietly(part_path)
+    _remove_quietly(_validator_path(part_path))
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
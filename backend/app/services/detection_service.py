@@ -1,10 +1,18 @@
 import re
 import logging
+from collections import deque
 from dataclasses import dataclass
 
+from app.config import settings
+from app.models.mention import SEGMENT_RADIUS, extract_segment
+
 logger = logging.getLogger(__name__)
 
-SEGMENT_RADIUS = 300  # chars of context around a match
+DETECTION_ENGINES = ("automaton", "legacy")
+
+# Characters whose re.IGNORECASE folding differs from str.lower(); exact_word
+# phrases fall back to the regex scan when the transcript contains any of them.
+_CASEFOLD_MISMATCH_CHARS = frozenset("\u0130\u0131\u017f")
 
 
 @dataclass
@@ -13,72 +21,285 @@ class KeywordMatch:
     phrase: str
     matched_text: str
     transcript_segment: str
+    match_start: int | None = None
+    match_end: int | None = None
+    audio_seconds: float | None = None
 
 
-def detect_keywords(transcript: str, keywords: list[dict]) -> list[KeywordMatch]:
-    """Find keyword matches in transcript text.
+class PhraseAutomaton:
+    """Aho-Corasick automaton over lowercased phrases.
 
-    Args:
-        transcript: Full transcript text
-        keywords: List of dicts with id, phrase, match_type
+    ``find_all`` reports every (possibly overlapping) occurrence of every
+    phrase in a single pass over the text.
+    """
 
-    Returns:
-        List of KeywordMatch objects with surrounding context
+    def __init__(self, phrases: list[str]):
+        self.phrases = phrases
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+
+        for index, phrase in enumerate(phrases):
+            node = 0
+            for char in phrase:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = next_node
+            self._out[node] += (index,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> list[list[int]]:
+        """Return the sorted start offsets of each phrase, indexed like ``phrases``."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        lengths = [len(phrase) for phrase in self.phrases]
+        positions: list[list[int]] = [[] for _ in self.phrases]
+
+        node = 0
+        for pos, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in out[node]:
+                positions[index].append(pos - lengths[index] + 1)
+
+        return positions
+
+
+class CompiledKeywordSet:
+    """Keyword list with its regexes and phrase automaton built once.
+
+    Build one per keyword-set version and reuse it across transcripts;
+    ``detect`` is then the only per-episode cost.
     """
-    matches = []
-    transcript_lower = transcript.lower()
 
-    for kw in keywords:
-        phrase = kw["phrase"]
-        match_type = kw["match_type"]
+    def __init__(self, keywords: list[dict], version: str | None = None):
+        self.keywords = keywords
+        self.version = version
+        self.patterns: list[re.Pattern | None] = []
+        self.phrases: list[str] = []
+        self._slots: list[int | None] = []
+
+        phrase_index: dict[str, int] = {}
+        for kw in keywords:
+            phrase = kw["phrase"]
+            match_type = kw["match_type"]
+            pattern = None
+            slot = None
+
+            if match_type == "regex":
+                try:
+                    pattern = re.compile(phrase, re.IGNORECASE)
+                except re.error:
+                    logger.warning(f"Invalid regex pattern: {phrase}")
+            elif match_type == "exact_word":
+                pattern = re.compile(r"\b" + re.escape(phrase) + r"\b", re.IGNORECASE)
 
-        if match_type == "regex":
-            try:
-                pattern = re.compile(phrase, re.IGNORECASE)
-            except re.error:
-                logger.warning(f"Invalid regex pattern: {phrase}")
-                continue
-            for m in pattern.finditer(transcript):
-                segment = _extract_segment(transcript, m.start(), m.end())
-                matches.append(KeywordMatch(
-                    keyword_id=kw["id"],
-                    phrase=phrase,
-                    matched_text=m.group(),
-                    transcript_segment=segment,
-                ))
-        elif match_type == "exact_word":
-            pattern = re.compile(r"\b" + re.escape(phrase) + r"\b", re.IGNORECASE)
-            for m in pattern.finditer(transcript):
-                segment = _extract_segment(transcript, m.start(), m.end())
-                matches.append(KeywordMatch(
-                    keyword_id=kw["id"],
-                    phrase=phrase,
-                    matched_text=m.group(),
-                    transcript_segment=segment,
-                ))
-        else:  # contains
-            start = 0
             phrase_lower = phrase.lower()
-            while True:
-                idx = transcript_lower.find(phrase_lower, start)
-                if idx == -1:
-                    break
+            if phrase_lower and (
+                match_type == "contains" or (match_type == "exact_word" and phrase.isascii())
+            ):
+                slot = phrase_index.get(phrase_lower)
+                if slot is None:
+                    slot = phrase_index[phrase_lower] = len(self.phrases)
+                    self.phrases.append(phrase_lower)
+
+            self.patterns.append(pattern)
+            self._slots.append(slot)
+
+        self.automaton = PhraseAutomaton(self.phrases)
+
+    def detect(self, transcript: str, engine: str | None = None) -> list[KeywordMatch]:
+        engine = engine or settings.KEYWORD_DETECTION_ENGINE
+        if engine not in DETECTION_ENGINES:
+            raise ValueError(f"Unknown keyword detection engine: {engine}")
+        if engine == "automaton":
+            return self._detect_automaton(transcript)
+        return self._detect_legacy(transcript)
+
+    def _detect_legacy(self, transcript: str) -> list[KeywordMatch]:
+        matches = []
+        transcript_lower = transcript.lower()
+        for kw, pattern in zip(self.keywords, self.patterns):
+            matches.extend(_scan_keyword(transcript, transcript_lower, kw, pattern))
+        return matches
+
+    def _detect_automaton(self, transcript: str) -> list[KeywordMatch]:
+        transcript_lower = transcript.lower()
+        # Offsets found in the lowercased text only line up with the original for
+        # exact_word (which slices the original) when lowercasing kept every char.
+        exact_word_safe = len(transcript_lower) == len(transcript) and not (
+            _CASEFOLD_MISMATCH_CHARS.intersection(transcript)
+        )
+        positions = self.automaton.find_all(transcript_lower) if self.phrases else []
+
+        matches = []
+        for kw, pattern, slot in zip(self.keywords, self.patterns, self._slots):
+            is_exact_word = kw["match_type"] == "exact_word"
+            if slot is None or (is_exact_word and not exact_word_safe):
+                matches.extend(_scan_keyword(transcript, transcript_lower, kw, pattern))
+                continue
+
+            phrase = kw["phrase"]
+            next_start = 0
+            for idx in positions[slot]:
+                # Mirror the non-overlapping scan of str.find / re.finditer.
+                if idx < next_start:
+                    continue
                 end = idx + len(phrase)
-                segment = _extract_segment(transcript, idx, end)
+                if is_exact_word and not (
+                    _is_word_boundary(transcript, idx) and _is_word_boundary(transcript, end)
+                ):
+                    continue
                 matches.append(KeywordMatch(
                     keyword_id=kw["id"],
                     phrase=phrase,
                     matched_text=transcript[idx:end],
-                    transcript_segment=segment,
+                    transcript_segment=extract_segment(transcript, idx, end),
+                    match_start=idx,
+                    match_end=end,
                 ))
-                start = end
+                next_start = end
+
+        return matches
+
+
+def detect_keywords(
+    transcript: str,
+    keywords: list[dict],
+    engine: str | None = None,
+) -> list[KeywordMatch]:
+    """Find keyword matches in transcript text.
+
+    Args:
+        transcript: Full transcript text
+        keywords: List of dicts with id, phrase, match_type
+        engine: "automaton" (single pass for contains/exact_word phrases) or
+            "legacy" (one scan per keyword); defaults to KEYWORD_DETECTION_ENGINE
+
+    Returns:
+        List of KeywordMatch objects with surrounding context
+    """
+    return CompiledKeywordSet(keywords).detect(transcript, engine)
+
+
+def _scan_keyword(
+    transcript: str,
+    transcript_lower: str,
+    kw: dict,
+    pattern: re.Pattern | None,
+) -> list[KeywordMatch]:
+    """Scan the transcript for one keyword (the legacy per-keyword engine)."""
+    phrase = kw["phrase"]
+    matches = []
+
+    if kw["match_type"] in ("regex", "exact_word"):
+        if pattern is None:
+            return matches
+        for m in pattern.finditer(transcript):
+            segment = extract_segment(transcript, m.start(), m.end())
+            matches.append(KeywordMatch(
+                keyword_id=kw["id"],
+                phrase=phrase,
+                matched_text=m.group(),
+                transcript_segment=segment,
+                match_start=m.start(),
+                match_end=m.end(),
+            ))
+    else:  # contains
+        phrase_lower = phrase.lower()
+        if not phrase_lower:
+            return matches
+        start = 0
+        while True:
+            idx = transcript_lower.find(phrase_lower, start)
+            if idx == -1:
+                break
+            end = idx + len(phrase)
+            segment = extract_segment(transcript, idx, end)
+            matches.append(KeywordMatch(
+                keyword_id=kw["id"],
+                phrase=phrase,
+                matched_text=transcript[idx:end],
+                transcript_segment=segment,
+                match_start=idx,
+                match_end=end,
+            ))
+            start = end
 
     return matches
 
 
-def _extract_segment(text: str, match_start: int, match_end: int) -> str:
-    seg_start = max(0, match_start - SEGMENT_RADIUS)
-    seg_end = min(len(text), match_end + SEGMENT_RADIUS)
-    prefix = "..." if seg_start > 0 else ""
-    suffix = "..." if seg_end < len(text) else ""
-    return prefix + text[seg_start:seg_end] + suffix
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _is_word_boundary(text: str, pos: int) -> bool:
+    """Match the semantics of the regex ``\\b`` assertion at ``pos``."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+def cluster_match_windows(
+    spans: list[tuple[str, int | None, int | None]],
+    max_span_chars: int,
+) -> list[list[int]]:
+    """Group matches whose context windows overlap.
+
+    Args:
+        spans: (group key, match start, match end) per match; only matches with
+            the same key are merged, and matches without offsets stay alone
+        max_span_chars: largest match-to-match span a merged group may cover
+
+    Returns:
+        Lists of indices into ``spans``, ordered by each group's first index
+    """
+    clusters: list[list[int]] = []
+    positioned = sorted(
+        (i for i, (_, start, end) in enumerate(spans) if start is not None and end is not None),
+        key=lambda i: (spans[i][0], spans[i][1]),
+    )
+
+    current: list[int] = []
+    current_key = None
+    current_start = current_end = 0
+    for i in positioned:
+        key, start, end = spans[i]
+        # Windows [start - R, end + R] overlap when the gap between matches is under 2R.
+        if (
+            current
+            and key == current_key
+            and start - current_end < 2 * SEGMENT_RADIUS
+            and max(end, current_end) - current_start <= max_span_chars
+        ):
+            current.append(i)
+            current_end = max(current_end, end)
+            continue
+        if current:
+            clusters.append(current)
+        current = [i]
+        current_key, current_start, current_end = key, start, end
+    if current:
+        clusters.append(current)
+
+    clusters.extend([i] for i, (_, start, end) in enumerate(spans) if start is None or end is None)
+    return sorted(clusters, key=lambda cluster: min(cluster))
+
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "podlistener:enrichment-cache:"
+
+
+def enrichment_cache_key(keyword: str, segment: str, model: str, prompt_version: str) -> str:
+    """Content address of one enrichment request."""
+    payload = json.dumps([prompt_version, model, keyword, segment], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LocalEnrichmentCache:
+    """In-process LRU cache with TTL (tests, single worker)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def set(self, key: str, value: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class RedisEnrichmentCache:
+    """Enrichment results shared by all workers through Redis.
+
+    Reads refresh the TTL, so entries that keep being reused stay while cold
+    ones expire (approximate LRU on top of Redis' own maxmemory policy).
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._client = redis.Redis.from_url(redis_url)
+
+    def get(self, key: str) -> dict | None:
+        pipe = self._client.pipeline()
+        pipe.get(f"{KEY_PREFIX}{key}")
+        pipe.expire(f"{KEY_PREFIX}{key}", self.ttl_seconds)
+        raw, _ = pipe.execute()
+        self._client.incr(f"{KEY_PREFIX}stats:{'hits' if raw is not None else 'misses'}")
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    def set(self, key: str, value: dict) -> None:
+        self._client.set(f"{KEY_PREFIX}{key}", json.dumps(value), ex=self.ttl_seconds)
+
+    def stats(self) -> dict[str, int]:
+        hits, misses = self._client.mget(f"{KEY_PREFIX}stats:hits", f"{KEY_PREFIX}stats:misses")
+        return {"hits": int(hits or 0), "misses": int(misses or 0)}
+
+
+_CACHE_LOCK = threading.Lock()
+_CACHE: LocalEnrichmentCache | RedisEnrichmentCache | None = None
+
+
+def get_enrichment_cache() -> LocalEnrichmentCache | RedisEnrichmentCache | None:
+    """Return the configured cache, or None when ENRICHMENT_CACHE_BACKEND is "none"."""
+    global _CACHE
+
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            backend = settings.ENRICHMENT_CACHE_BACKEND
+            ttl_seconds = max(1, settings.ENRICHMENT_CACHE_TTL_SECONDS)
+            if backend == "redis":
+                _CACHE = RedisEnrichmentCache(settings.REDIS_URL, ttl_seconds)
+            elif backend == "local":
+                _CACHE = LocalEnrichmentCache(settings.ENRICHMENT_CACHE_MAX_ENTRIES, ttl_seconds)
+        return _CACHE
+
+
+def set_enrichment_cache(cache: LocalEnrichmentCache | RedisEnrichmentCache | None) -> None:
+    global _CACHE
+
+    with _CACHE_LOCK:
+        _CACHE = cache
+
+
+def cache_get(key: str) -> dict | None:
+    cache = get_enrichment_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except redis.RedisError:
+        logger.warning("Enrichment cache unavailable; calling the LLM", exc_info=True)
+        return None
+
+
+def cache_set(key: str, value: dict) -> None:
+    cache = get_enrichment_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(key, value)
+    except redis.RedisError:
+        logger.warning("Enrichment cache unavailable; result not cached", exc_info=True)
@@ -1,3 +1,5 @@
+import asyncio
+import hashlib
 import json
 import logging
 import threading
@@ -8,6 +10,9 @@ from email.utils import parsedate_to_datetime
 import httpx
 
 from app.config import settings
+from app.services.http_clients import get_http_client
+from app.services.enrichment_cache import cache_get, cache_set, enrichment_cache_key
+from app.services.rate_limiter import llm_buckets, wait_for_slot, wait_for_slot_async
 
 logger = logging.getLogger(__name__)
 _RATE_LIMIT_LOCK = threading.Lock()
@@ -31,15 +36,47 @@ Respond with ONLY valid JSON (no markdown, no explanation):
   "is_recommendation": true/false (speaker recommends or endorses)
 }}"""
 
+BATCH_ENRICHMENT_PROMPT = """Analyze each of the {count} numbered podcast transcript segments below. Each segment mentions the keyword named in its header.
+
+{segments}
+
+Respond with ONLY valid JSON (no markdown, no explanation), with exactly one result per segment:
+{{
+  "results": [
+    {{
+      "index": segment number,
+      "sentiment": "positive" | "negative" | "neutral" | "mixed",
+      "sentiment_score": 0.0 to 1.0 (0=very negative, 1=very positive),
+      "context_summary": "1-2 sentence summary of how the keyword is discussed",
+      "topics": ["topic1", "topic2"],
+      "is_buying_signal": true/false (speaker expresses intent to purchase/adopt),
+      "is_pain_point": true/false (speaker describes a problem or frustration),
+      "is_recommendation": true/false (speaker recommends or endorses)
+    }}
+  ]
+}}"""
+
+# Changes whenever the prompt template does, so cached results never outlive it.
+ENRICHMENT_PROMPT_VERSION = hashlib.sha256(
+    (ENRICHMENT_PROMPT + BATCH_ENRICHMENT_PROMPT).encode("utf-8")
+).hexdigest()[:12]
+
 
 def enrich_mention(keyword: str, segment: str, raise_on_error: bool = False) -> dict:
     """Call the configured LLM provider to analyze a transcript segment."""
+    cache_key = _enrichment_cache_key(keyword, segment)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     prompt = ENRICHMENT_PROMPT.format(keyword=keyword, segment=segment)
 
     try:
         content = _call_llm(prompt)
         parsed = json.loads(content)
-        return _validate_enrichment(parsed)
+        enrichment = _validate_enrichment(parsed)
+        cache_set(cache_key, enrichment)
+        return enrichment
     except Exception:
         logger.exception("Enrichment failed for provider '%s'", settings.LLM_PROVIDER)
         if raise_on_error:
@@ -47,76 +84,277 @@ def enrich_mention(keyword: str, segment: str, raise_on_error: bool = False) ->
         return _default_enrichment()
 
 
-def _call_llm(prompt: str) -> str:
-    if settings.LLM_PROVIDER == "openrouter":
-        if not settings.OPENROUTER_API_KEY:
-            raise RuntimeError("OPENROUTER_API_KEY is not set")
-
-        headers = {
-            "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
-        }
-        if settings.OPENROUTER_SITE_URL:
-            headers["HTTP-Referer"] = settings.OPENROUTER_SITE_URL
-        if settings.OPENROUTER_APP_NAME:
-            headers["X-Title"] = settings.OPENROUTER_APP_NAME
-
-        response = _post_with_backoff(
-            _openrouter_endpoint(),
-            headers=headers,
-            json={
-                "model": settings.OPENROUTER_MODEL,
-                "messages": [{"role": "user", "content": prompt}],
-                "response_format": {"type": "json_object"},
-            },
-            timeout=120.0,
-        )
-        try:
-            response.raise_for_status()
-        except httpx.HTTPStatusError as exc:
+def enrich_mentions_concurrently(
+    items: list[tuple[str, str]],
+    concurrency: int,
+    batch_max_items: int = 1,
+) -> list[dict | Exception]:
+    """Enrich (keyword, segment) pairs with up to ``concurrency`` requests in flight.
+
+    With ``batch_max_items`` above 1, segments are packed into multi-segment
+    prompts sized to ENRICHMENT_BATCH_PROMPT_TOKENS; batch items the model
+    does not answer validly are retried with single-segment prompts.
+
+    Results are returned in input order; a failed item yields its exception
+    instead of a default enrichment so callers can decide how to resume.
+    """
+    if not items:
+        return []
+    return asyncio.run(_enrich_all_async(items, max(1, concurrency), max(1, batch_max_items)))
+
+
+async def _enrich_all_async(
+    items: list[tuple[str, str]],
+    concurrency: int,
+    batch_max_items: int,
+) -> list[dict | Exception]:
+    results: list[dict | Exception | None] = [None] * len(items)
+    cache_keys = [_enrichment_cache_key(keyword, segment) for keyword, segment in items]
+    pending = []
+    for index, cache_key in enumerate(cache_keys):
+        results[index] = cache_get(cache_key)
+        if results[index] is None:
+            pending.append(index)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits) as client:
+        async def run_single(index: int) -> None:
+            keyword, segment = items[index]
+            try:
+                async with semaphore:
+                    prompt = ENRICHMENT_PROMPT.format(keyword=keyword, segment=segment)
+                    content = await _call_llm_async(client, prompt)
+                    results[index] = _validate_enrichment(json.loads(content))
+            except Exception as exc:
+                results[index] = exc
+
+        async def run_batch(indices: list[int]) -> None:
+            if len(indices) == 1:
+                await run_single(indices[0])
+                return
+
+            try:
+                async with semaphore:
+                    prompt = _batch_prompt([items[index] for index in indices])
+                    content = await _call_llm_async(client, prompt)
+                batch_results = _parse_batch_enrichment(content, len(indices))
+            except Exception:
+                logger.warning(
+                    "Batch enrichment of %s segments failed; falling back to single prompts",
+                    len(indices),
+                    exc_info=True,
+                )
+                batch_results = [None] * len(indices)
+
+            fallbacks = []
+            for index, enrichment in zip(indices, batch_results):
+                if enrichment is None:
+                    fallbacks.append(run_single(index))
+                else:
+                    results[index] = enrichment
+            await asyncio.gather(*fallbacks)
+
+        batches = _pack_batches(items, pending, batch_max_items)
+        await asyncio.gather(*(run_batch(indices) for indices in batches))
+
+    for index in pending:
+        result = results[index]
+        if isinstance(result, Exception):
             logger.error(
-                "OpenRouter request failed: status=%s body=%s",
-                exc.response.status_code,
-                exc.response.text,
+                "Enrichment failed for provider '%s'",
+                settings.LLM_PROVIDER,
+                exc_info=result,
             )
-            raise
-        result = response.json()
-        return result["choices"][0]["message"]["content"]
+        else:
+            cache_set(cache_keys[index], result)
+    return list(results)
+
+
+def _estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English prose.
+    return len(text) // 4 + 1
+
+
+def _pack_batches(items: list[tuple[str, str]], indices: list[int], batch_max_items: int) -> list[list[int]]:
+    """Greedily pack items into batches within the item and prompt-token budgets."""
+    if batch_max_items <= 1:
+        return [[index] for index in indices]
+
+    budget = max(1, settings.ENRICHMENT_BATCH_PROMPT_TOKENS)
+    overhead = _estimate_tokens(BATCH_ENRICHMENT_PROMPT)
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = overhead
+    for index in indices:
+        item_tokens = _estimate_tokens(_batch_segment_block(0, *items[index]))
+        if current and (len(current) >= batch_max_items or current_tokens + item_tokens > budget):
+            batches.append(current)
+            current = []
+            current_tokens = overhead
+        current.append(index)
+        current_tokens += item_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _batch_segment_block(number: int, keyword: str, segment: str) -> str:
+    return f'Segment {number} (keyword "{keyword}"):\n---\n{segment}\n---'
+
+
+def _batch_prompt(batch: list[tuple[str, str]]) -> str:
+    blocks = "\n\n".join(
+        _batch_segment_block(number, keyword, segment)
+        for number, (keyword, segment) in enumerate(batch, start=1)
+    )
+    return BATCH_ENRICHMENT_PROMPT.format(count=len(batch), segments=blocks)
+
+
+def _parse_batch_enrichment(content: str, expected: int) -> list[dict | None]:
+    """Validate a batch response item by item; unusable items come back as None."""
+    data = json.loads(content)
+    if isinstance(data, dict):
+        data = data.get("results")
+    if not isinstance(data, list):
+        raise ValueError("Batch enrichment response has no results array")
+
+    parsed: list[dict | None] = [None] * expected
+    for position, item in enumerate(data):
+        if not isinstance(item, dict):
+            continue
+        try:
+            number = int(item.get("index", position + 1))
+        except (TypeError, ValueError):
+            continue
+        if not 1 <= number <= expected or parsed[number - 1] is not None:
+            continue
+        try:
+            parsed[number - 1] = _validate_enrichment(item)
+        except (TypeError, ValueError):
+            continue
+    return parsed
+
+
+def _call_llm(prompt: str) -> str:
+    if settings.LLM_PROVIDER == "openrouter":
+        response = _post_with_backoff(_openrouter_endpoint(), **_openrouter_request(prompt))
+        return _openrouter_content(response)
 
     chat_response = _post_with_backoff(
         f"{settings.OLLAMA_BASE_URL}/api/chat",
-        json={
-            "model": settings.OLLAMA_MODEL,
-            "messages": [{"role": "user", "content": prompt}],
-            "stream": False,
-            "format": "json",
-        },
-        timeout=120.0,
+        **_ollama_chat_request(prompt),
     )
     if chat_response.status_code == 404:
         _raise_ollama_model_error_if_needed(chat_response)
         logger.warning("Ollama /api/chat returned 404, trying /api/generate fallback")
         generate_response = _post_with_backoff(
             f"{settings.OLLAMA_BASE_URL}/api/generate",
-            json={
-                "model": settings.OLLAMA_MODEL,
-                "prompt": prompt,
-                "stream": False,
-                "format": "json",
-            },
-            timeout=120.0,
+            **_ollama_generate_request(prompt),
         )
-        if generate_response.status_code == 404:
-            _raise_ollama_model_error_if_needed(generate_response)
-        generate_response.raise_for_status()
-        result = generate_response.json()
-        return result["response"]
+        return _ollama_generate_content(generate_response)
 
     chat_response.raise_for_status()
     result = chat_response.json()
     return result["message"]["content"]
 
 
+async def _call_llm_async(client: httpx.AsyncClient, prompt: str) -> str:
+    if settings.LLM_PROVIDER == "openrouter":
+        response = await _post_with_backoff_async(client, _openrouter_endpoint(), **_openrouter_request(prompt))
+        return _openrouter_content(response)
+
+    chat_response = await _post_with_backoff_async(
+        client,
+        f"{settings.OLLAMA_BASE_URL}/api/chat",
+        **_ollama_chat_request(prompt),
+    )
+    if chat_response.status_code == 404:
+        _raise_ollama_model_error_if_needed(chat_response)
+        logger.warning("Ollama /api/chat returned 404, trying /api/generate fallback")
+        generate_response = await _post_with_backoff_async(
+            client,
+            f"{settings.OLLAMA_BASE_URL}/api/generate",
+            **_ollama_generate_request(prompt),
+        )
+        return _ollama_generate_content(generate_response)
+
+    chat_response.raise_for_status()
+    result = chat_response.json()
+    return result["message"]["content"]
+
+
+def _openrouter_request(prompt: str) -> dict:
+    if not settings.OPENROUTER_API_KEY:
+        raise RuntimeError("OPENROUTER_API_KEY is not set")
+
+    headers = {
+        "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+    }
+    if settings.OPENROUTER_SITE_URL:
+        headers["HTTP-Referer"] = settings.OPENROUTER_SITE_URL
+    if settings.OPENROUTER_APP_NAME:
+        headers["X-Title"] = settings.OPENROUTER_APP_NAME
+
+    return {
+        "headers": headers,
+        "json": {
+            "model": settings.OPENROUTER_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "response_format": {"type": "json_object"},
+        },
+        "timeout": 120.0,
+    }
+
+
+def _openrouter_content(response: httpx.Response) -> str:
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as exc:
+        logger.error(
+            "OpenRouter request failed: status=%s body=%s",
+            exc.response.status_code,
+            exc.response.text,
+        )
+        raise
+    result = response.json()
+    return result["choices"][0]["message"]["content"]
+
+
+def _ollama_chat_request(prompt: str) -> dict:
+    return {
+        "json": {
+            "model": settings.OLLAMA_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False,
+            "format": "json",
+        },
+        "timeout": 120.0,
+    }
+
+
+def _ollama_generate_request(prompt: str) -> dict:
+    return {
+        "json": {
+            "model": settings.OLLAMA_MODEL,
+            "prompt": prompt,
+            "stream": False,
+            "format": "json",
+        },
+        "timeout": 120.0,
+    }
+
+
+def _ollama_generate_content(response: httpx.Response) -> str:
+    if response.status_code == 404:
+        _raise_ollama_model_error_if_needed(response)
+    response.raise_for_status()
+    result = response.json()
+    return result["response"]
+
+
 def _openrouter_endpoint() -> str:
     base = settings.OPENROUTER_BASE_URL.rstrip("/")
     if base.endswith("/api/v1") or base.endswith("/v1"):
@@ -129,8 +367,9 @@ def _post_with_backoff(url: str, **kwargs) -> httpx.Response:
 
     for attempt in range(max_attempts):
         _apply_rate_limit()
+        wait_for_slot(_llm_rate_limit_buckets())
         try:
-            response = httpx.post(url=url, **kwargs)
+            response = get_http_client("llm", url).post(url=url, **kwargs)
         except httpx.RequestError:
             if attempt == max_attempts - 1:
                 raise
@@ -172,6 +411,87 @@ def _post_with_backoff(url: str, **kwargs) -> httpx.Response:
     raise RuntimeError("Retry loop exhausted without returning or raising")
 
 
+async def _post_with_backoff_async(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    max_attempts = max(1, settings.LLM_ENRICH_MAX_RETRIES + 1)
+
+    for attempt in range(max_attempts):
+        wait_seconds = _reserve_rate_limit_slot()
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+        await wait_for_slot_async(_llm_rate_limit_buckets())
+        try:
+            response = await client.post(url=url, **kwargs)
+        except httpx.RequestError:
+            if attempt == max_attempts - 1:
+                raise
+
+            delay = _retry_delay(status_code=None, attempt=attempt, retry_after=None)
+            logger.warning(
+                "LLM request failed (%s); retrying in %.2fs (%s/%s)",
+                url,
+                delay,
+                attempt + 1,
+                max_attempts,
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        if _is_retryable_status(response.status_code):
+            if attempt == max_attempts - 1:
+                response.raise_for_status()
+
+            retry_after = _parse_retry_after_seconds(response.headers.get("Retry-After"))
+            delay = _retry_delay(
+                status_code=response.status_code,
+                attempt=attempt,
+                retry_after=retry_after,
+            )
+            logger.warning(
+                "LLM request got retryable status %s (%s); retrying in %.2fs (%s/%s)",
+                response.status_code,
+                url,
+                delay,
+                attempt + 1,
+                max_attempts,
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        return response
+
+    raise RuntimeError("Retry loop exhausted without returning or raising")
+
+
+def _llm_model() -> tuple[str, str]:
+    if settings.LLM_PROVIDER == "openrouter":
+        return "openrouter", settings.OPENROUTER_MODEL
+    return "ollama", settings.OLLAMA_MODEL
+
+
+def _enrichment_cache_key(keyword: str, segment: str) -> str:
+    provider, model = _llm_model()
+    return enrichment_cache_key(keyword, segment, f"{provider}:{model}", ENRICHMENT_PROMPT_VERSION)
+
+
+def _llm_rate_limit_buckets():
+    return llm_buckets(*_llm_model())
+
+
+def _reserve_rate_limit_slot() -> float:
+    """Claim the next paced request slot and return how long to wait for it."""
+    global _NEXT_ALLOWED_TS
+
+    min_interval = max(0.0, settings.LLM_ENRICH_MIN_INTERVAL_SECONDS)
+    if min_interval <= 0:
+        return 0.0
+
+    with _RATE_LIMIT_LOCK:
+        now = time.monotonic()
+        slot = max(now, _NEXT_ALLOWED_TS)
+        _NEXT_ALLOWED_TS = slot + min_interval
+        return slot - now
+
+
 def _apply_rate_limit() -> None:
     global _NEXT_ALLOWED_TS
 
@@ -0,0 +1,42 @@
+import random
+import statistics
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+
+
+def poll_interval_seconds(published: list[datetime], now: datetime) -> float:
+    """Seconds until a feed is worth polling again, before jitter.
+
+    The estimate is FEED_POLL_INTERVAL_FRACTION of the median gap between
+    recent episodes, widened to the time since the last episode once that
+    is longer, so a dormant show backs off. Feeds with fewer than two dated
+    episodes use FEED_POLL_DEFAULT_SECONDS. The result is clamped to
+    FEED_POLL_MIN_SECONDS..FEED_POLL_MAX_SECONDS.
+    """
+    times = sorted(_as_utc(value) for value in published)
+    if len(times) < 2:
+        interval = settings.FEED_POLL_DEFAULT_SECONDS
+    else:
+        gaps = [(later - earlier).total_seconds() for earlier, later in zip(times, times[1:])]
+        cadence = max(statistics.median(gaps), (now - times[-1]).total_seconds())
+        interval = cadence * settings.FEED_POLL_INTERVAL_FRACTION
+
+    floor = max(1, settings.FEED_POLL_MIN_SECONDS)
+    ceiling = max(floor, settings.FEED_POLL_MAX_SECONDS)
+    return min(max(interval, floor), ceiling)
+
+
+def next_poll_at(published: list[datetime], now: datetime | None = None) -> datetime:
+    """When to poll next, with FEED_POLL_JITTER spread so feeds added together drift apart."""
+    now = now or datetime.now(timezone.utc)
+    jitter = max(0.0, min(settings.FEED_POLL_JITTER, 1.0))
+    seconds = poll_interval_seconds(published, now) * random.uniform(1 - jitter, 1 + jitter)
+    return now + timedelta(seconds=seconds)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -1,15 +1,282 @@
+import asyncio
+import hashlib
 import logging
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 
 import feedparser
+import httpx
+
+from app.config import settings
+from app.services.http_clients import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class FeedFetch:
+    """Result of a conditional feed download.
+
+    ``content`` is None when the server answered 304 or the body hashes to
+    the ``content_sha256`` stored from the previous poll.
+    """
+
+    content: bytes | None
+    etag: str | None
+    last_modified: str | None
+    content_sha256: str | None
+    content_type: str | None = None
+
+    @property
+    def unchanged(self) -> bool:
+        return self.content is None
+
+
+def fetch_feed(
+    rss_url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    content_sha256: str | None = None,
+) -> FeedFetch:
+    """Download ``rss_url`` with If-None-Match/If-Modified-Since from the last poll."""
+    response = get_http_client("feed", rss_url).get(
+        rss_url,
+        headers=_conditional_headers(etag, last_modified),
+        follow_redirects=True,
+        timeout=httpx.Timeout(settings.FEED_FETCH_TIMEOUT_SECONDS),
+    )
+    return _fetch_result(response, etag, last_modified, content_sha256)
+
+
+def fetch_feeds_concurrently(
+    requests: list[tuple[str, str | None, str | None, str | None]],
+    concurrency: int,
+) -> list[FeedFetch | Exception]:
+    """Conditionally download many feeds with up to ``concurrency`` requests in flight.
+
+    ``requests`` holds ``(rss_url, etag, last_modified, content_sha256)``
+    tuples. Connections to any one host stay within
+    HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST. Results are returned in input
+    order; a failed feed yields its exception.
+    """
+    if not requests:
+        return []
+    return asyncio.run(_fetch_all_async(requests, max(1, concurrency)))
+
+
+async def _fetch_all_async(
+    requests: list[tuple[str, str | None, str | None, str | None]],
+    concurrency: int,
+) -> list[FeedFetch | Exception]:
+    semaphore = asyncio.Semaphore(concurrency)
+    per_host = max(1, settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST)
+    host_semaphores: dict[str, asyncio.Semaphore] = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    timeout = httpx.Timeout(settings.FEED_FETCH_TIMEOUT_SECONDS)
+
+    async with httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True) as client:
+        async def fetch_one(rss_url, etag, last_modified, content_sha256) -> FeedFetch | Exception:
+            host = (urlsplit(rss_url).hostname or "").lower()
+            host_semaphore = host_semaphores.setdefault(host, asyncio.Semaphore(per_host))
+            try:
+                async with host_semaphore, semaphore:
+                    response = await client.get(rss_url, headers=_conditional_headers(etag, last_modified))
+                return _fetch_result(response, etag, last_modified, content_sha256)
+            except Exception as exc:
+                return exc
+
+        return list(await asyncio.gather(*(fetch_one(*request) for request in requests)))
+
+
+def _conditional_headers(etag: str | None, last_modified: str | None) -> dict:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _fetch_result(
+    response: httpx.Response,
+    etag: str | None,
+    last_modified: str | None,
+    content_sha256: str | None,
+) -> FeedFetch:
+    # Servers may omit validators on a 304; keep the ones we sent.
+    new_etag = response.headers.get("ETag", etag)
+    new_last_modified = response.headers.get("Last-Modified", last_modified)
+    if response.status_code == 304:
+        return FeedFetch(None, new_etag, new_last_modified, content_sha256)
+    response.raise_for_status()
+
+    digest = hashlib.sha256(response.content).hexdigest()
+    if digest == content_sha256:
+        return FeedFetch(None, new_etag, new_last_modified, digest)
+    return FeedFetch(response.content, new_etag, new_last_modified, digest, response.headers.get("Content-Type"))
+
+
 def parse_feed(rss_url: str) -> dict:
     """Parse an RSS feed and return feed metadata + episodes."""
-    feed = feedparser.parse(rss_url)
+    return _feed_data(feedparser.parse(rss_url))
+
+
+def parse_feed_content(content: bytes, content_type: str | None = None) -> dict:
+    """Parse an already downloaded feed body, as returned by ``fetch_feed``."""
+    response_headers = {"content-type": content_type} if content_type else None
+    return _feed_data(feedparser.parse(content, response_headers=response_headers))
+
+
+def parse_feed_streaming(
+    content: bytes,
+    content_type: str | None = None,
+    known_guids: set[str] | frozenset[str] = frozenset(),
+    limit: int = 0,
+) -> dict:
+    """Parse only the head of a feed, newest entries first, stopping as early as possible.
+
+    Entries are read lazily with an incremental XML parser and parsing stops
+    after FEED_KNOWN_GUID_RUN consecutive ``known_guids`` or once ``limit``
+    audio entries (0 for no limit) have been seen, so the cost follows the
+    number of new items rather than the size of the back catalogue. Only
+    unknown entries are returned. Bodies the streaming parser cannot read
+    fall back to feedparser.
+    """
+    feed_info = {"title": None, "image_url": None}
+    try:
+        episodes = _select_new_entries(_iter_entries(content, feed_info), known_guids, limit)
+    except (ET.ParseError, _UnsupportedFeed) as exc:
+        logger.info("Streaming feed parse failed (%s); falling back to feedparser", exc)
+        data = parse_feed_content(content, content_type)
+        return {"feed": data["feed"], "episodes": _select_new_entries(iter(data["episodes"]), known_guids, limit)}
+    return {"feed": feed_info, "episodes": episodes}
+
+
+class _UnsupportedFeed(Exception):
+    pass
+
+
+_STREAM_CHUNK_BYTES = 65536
+_FEED_ROOTS = ("rss", "feed", "RDF")
+_ENTRY_TAGS = ("item", "entry")
+_CHANNEL_TAGS = ("channel", "feed")
+
+
+def _select_new_entries(entries: Iterator[dict], known_guids, limit: int) -> list[dict]:
+    known_run = max(1, settings.FEED_KNOWN_GUID_RUN)
+    episodes = []
+    seen = 0
+    run = 0
+    for entry in entries:
+        if not entry["audio_url"]:
+            continue
+        seen += 1
+        if entry["guid"] in known_guids:
+            # A run, not the first hit, so a pinned or re-dated old item
+            # at the top does not hide the new ones below it.
+            run += 1
+            if run >= known_run:
+                break
+        else:
+            run = 0
+            episodes.append(entry)
+        if limit and seen >= limit:
+            break
+    return episodes
+
+
+def _iter_entries(content: bytes, feed_info: dict) -> Iterator[dict]:
+    """Yield RSS items / Atom entries as they close, filling ``feed_info`` on the way."""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: list[str] = []
+    for start in range(0, len(content), _STREAM_CHUNK_BYTES):
+        parser.feed(content[start:start + _STREAM_CHUNK_BYTES])
+        for event, elem in parser.read_events():
+            name = _local_name(elem.tag)
+            if event == "start":
+                if not stack and name not in _FEED_ROOTS:
+                    raise _UnsupportedFeed(f"unexpected root element <{name}>")
+                stack.append(name)
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if name in _ENTRY_TAGS:
+                yield _entry_data(elem)
+                elem.clear()
+            elif parent in _CHANNEL_TAGS and "item" not in stack and "entry" not in stack:
+                _update_feed_info(feed_info, name, elem)
+    parser.close()
+
+
+def _update_feed_info(feed_info: dict, name: str, elem) -> None:
+    if name == "title" and feed_info["title"] is None:
+        feed_info["title"] = (elem.text or "").strip() or None
+    elif name in ("image", "logo") and feed_info["image_url"] is None:
+        # RSS <image><url>, itunes:image href, or Atom <logo>.
+        url = elem.get("href") or _child_text(elem, "url") or (elem.text or "").strip()
+        feed_info["image_url"] = url or None
+
+
+def _entry_data(elem) -> dict:
+    guid = link = title = published_text = None
+    audio_url = None
+    for child in elem:
+        name = _local_name(child.tag)
+        text = (child.text or "").strip()
+        if name in ("guid", "id"):
+            guid = text
+        elif name == "title":
+            title = text or None
+        elif name in ("pubDate", "published") or (name == "updated" and published_text is None):
+            published_text = text
+        elif name == "link":
+            if child.get("type", "").startswith("audio/"):
+                audio_url = audio_url or child.get("href")
+            elif link is None:
+                link = child.get("href") or text
+        elif name == "enclosure" and child.get("type", "").startswith("audio/"):
+            audio_url = audio_url or child.get("url") or child.get("href")
+
+    return {
+        "guid": guid or link or "",
+        "title": title,
+        "audio_url": audio_url,
+        "published_at": _parse_entry_date(published_text),
+    }
+
+
+def _parse_entry_date(text: str | None) -> datetime | None:
+    if not text:
+        return None
+    try:
+        published = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        try:
+            published = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published.astimezone(timezone.utc)
+
+
+def _child_text(elem, name: str) -> str | None:
+    for child in elem:
+        if _local_name(child.tag) == name:
+            return (child.text or "").strip() or None
+    return None
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
 
+def _feed_data(feed) -> dict:
     if feed.bozo and not feed.entries:
         raise ValueError(f"Failed to parse feed: {feed.bozo_exception}")
 
@@ -0,0 +1,145 @@
+import logging
+import random
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+import redis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "podlistener:hostslots:"
+
+# Leases are sorted-set members scored by expiry, so a worker that dies
+# mid-download frees its slot once the lease runs out.
+_ACQUIRE_LUA = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+  return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])) + 60)
+return 1
+"""
+
+
+class LocalHostSemaphore:
+    """In-process per-host lease counter with the same semantics as the Redis one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._leases: dict[str, dict[str, float]] = {}
+
+    def acquire(self, host: str, limit: int, ttl_seconds: float, token: str) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            leases = {t: expiry for t, expiry in self._leases.get(host, {}).items() if expiry > now}
+            if len(leases) >= limit:
+                self._leases[host] = leases
+                return False
+            leases[token] = now + ttl_seconds
+            self._leases[host] = leases
+            return True
+
+    def release(self, host: str, token: str) -> None:
+        with self._lock:
+            self._leases.get(host, {}).pop(token, None)
+
+
+class RedisHostSemaphore:
+    """Per-host download slots shared by every worker process through Redis."""
+
+    def __init__(self, redis_url: str):
+        self._client = redis.Redis.from_url(redis_url)
+        self._acquire = self._client.register_script(_ACQUIRE_LUA)
+
+    def acquire(self, host: str, limit: int, ttl_seconds: float, token: str) -> bool:
+        return bool(self._acquire(keys=[f"{KEY_PREFIX}{host}"], args=[limit, ttl_seconds, token]))
+
+    def release(self, host: str, token: str) -> None:
+        self._client.zrem(f"{KEY_PREFIX}{host}", token)
+
+
+_SEMAPHORE_LOCK = threading.Lock()
+_SEMAPHORE: LocalHostSemaphore | RedisHostSemaphore | None = None
+
+
+def get_host_semaphore() -> LocalHostSemaphore | RedisHostSemaphore:
+    global _SEMAPHORE
+
+    with _SEMAPHORE_LOCK:
+        if _SEMAPHORE is None:
+            if settings.RATE_LIMIT_BACKEND == "redis":
+                _SEMAPHORE = RedisHostSemaphore(settings.REDIS_URL)
+            else:
+                _SEMAPHORE = LocalHostSemaphore()
+        return _SEMAPHORE
+
+
+def set_host_semaphore(semaphore: LocalHostSemaphore | RedisHostSemaphore | None) -> None:
+    global _SEMAPHORE
+
+    with _SEMAPHORE_LOCK:
+        _SEMAPHORE = semaphore
+
+
+def download_host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def host_concurrency(host: str) -> int:
+    """Concurrent downloads allowed for ``host``; 0 means unlimited."""
+    overrides = settings.AUDIO_DOWNLOAD_HOST_CONCURRENCY
+    if host in overrides:
+        return max(0, int(overrides[host]))
+    return max(0, settings.AUDIO_DOWNLOAD_PER_HOST_CONCURRENCY)
+
+
+class HostSlot:
+    def __init__(self, host: str, token: str | None):
+        self.host = host
+        self.token = token
+
+    def release(self) -> None:
+        if self.token is None:
+            return
+        try:
+            get_host_semaphore().release(self.host, self.token)
+        except redis.RedisError:
+            logger.warning("Could not release download slot for %s; it will expire", self.host, exc_info=True)
+        self.token = None
+
+
+def acquire_host_slot(url: str) -> HostSlot | None:
+    """Take a download slot for the URL's host, or return None when the host is saturated.
+
+    Unlimited hosts and a Redis outage both get an untracked slot, so
+    downloads never stall on the scheduler itself.
+    """
+    host = download_host(url)
+    limit = host_concurrency(host)
+    if not host or limit <= 0:
+        return HostSlot(host, None)
+
+    token = uuid.uuid4().hex
+    ttl_seconds = settings.AUDIO_DOWNLOAD_TIMEOUT_SECONDS + 60
+    try:
+        if not get_host_semaphore().acquire(host, limit, ttl_seconds, token):
+            return None
+    except redis.RedisError:
+        logger.warning("Download scheduler unavailable for %s; not limiting", host, exc_info=True)
+        return HostSlot(host, None)
+    return HostSlot(host, token)
+
+
+def host_backoff_countdown(waits: int) -> int:
+    """Jittered exponential delay before retrying a download on a saturated host."""
+    base = max(1, settings.AUDIO_DOWNLOAD_HOST_BACKOFF_SECONDS)
+    ceiling = max(base, settings.AUDIO_DOWNLOAD_HOST_BACKOFF_MAX_SECONDS)
+    delay = min(base * (2 ** max(0, waits)), ceiling)
+    return max(1, int(delay * random.uniform(0.5, 1.0)))
@@ -0,0 +1,91 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - h2 ships with requirements.txt
+    _HTTP2_AVAILABLE = False
+else:
+    _HTTP2_AVAILABLE = True
+
+_CLIENTS_LOCK = threading.Lock()
+# Least recently used first; download URLs span many CDN and redirect hosts.
+_CLIENTS: OrderedDict[tuple[str, str], httpx.Client] = OrderedDict()
+_CLIENTS_PID: int | None = None
+
+
+def get_http_client(purpose: str, url: str, http2: bool = True) -> httpx.Client:
+    """Return this process's keep-alive client for ``purpose`` and the URL's host.
+
+    Clients are keyed per host so HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST bounds
+    the connections to each server. A client inherited across a fork is never
+    reused; the child builds its own on first use. ``http2=False`` pins the
+    purpose to HTTP/1.1, for callers that need separate TCP connections.
+    At most HTTP_CLIENT_MAX_CLIENTS are kept; the least recently used
+    client is closed to make room.
+    """
+    global _CLIENTS_PID
+
+    parts = urlsplit(url)
+    key = (purpose, f"{parts.scheme}://{parts.netloc}")
+    evicted = []
+    with _CLIENTS_LOCK:
+        pid = os.getpid()
+        if _CLIENTS_PID != pid:
+            # Sockets in inherited pools belong to the parent; drop them unclosed.
+            _CLIENTS.clear()
+            _CLIENTS_PID = pid
+
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = _build_client(http2)
+            _CLIENTS[key] = client
+            while len(_CLIENTS) > max(1, settings.HTTP_CLIENT_MAX_CLIENTS):
+                evicted.append(_CLIENTS.popitem(last=False)[1])
+        else:
+            _CLIENTS.move_to_end(key)
+
+    for old_client in evicted:
+        _close_client(old_client)
+    return client
+
+
+def close_http_clients() -> None:
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values()) if _CLIENTS_PID == os.getpid() else []
+        _CLIENTS.clear()
+
+    for client in clients:
+        _close_client(client)
+
+
+def reset_http_clients() -> None:
+    """Forget clients without closing them (after fork, the parent still owns them)."""
+    with _CLIENTS_LOCK:
+        _CLIENTS.clear()
+
+
+def _close_client(client: httpx.Client) -> None:
+    try:
+        client.close()
+    except Exception:
+        logger.warning("Failed to close HTTP client", exc_info=True)
+
+
+def _build_client(http2: bool = True) -> httpx.Client:
+    per_host = max(1, settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST)
+    limits = httpx.Limits(
+        max_connections=per_host,
+        max_keepalive_connections=per_host,
+        keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_SECONDS,
+    )
+    return httpx.Client(limits=limits, http2=http2 and settings.HTTP_CLIENT_HTTP2 and _HTTP2_AVAILABLE)
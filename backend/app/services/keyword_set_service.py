@@ -0,0 +1,66 @@
+import threading
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import AppSetting, Keyword
+from app.services.detection_service import CompiledKeywordSet
+
+KEYWORD_SET_VERSION_KEY = "keywords.version"
+
+_CACHE_LOCK = threading.Lock()
+_COMPILED_KEYWORDS: CompiledKeywordSet | None = None
+
+
+def keyword_dicts(keywords: list[Keyword]) -> list[dict]:
+    return [
+        {"id": str(k.id), "phrase": k.phrase, "match_type": k.match_type}
+        for k in keywords
+    ]
+
+
+def get_keyword_set_version_sync(db: Session) -> str | None:
+    result = db.execute(select(AppSetting.value).where(AppSetting.key == KEYWORD_SET_VERSION_KEY))
+    return result.scalar_one_or_none()
+
+
+async def bump_keyword_set_version_async(db: AsyncSession) -> str:
+    """Stage a new keyword-set version; the caller commits it with the keyword change."""
+    result = await db.execute(select(AppSetting).where(AppSetting.key == KEYWORD_SET_VERSION_KEY))
+    row = result.scalar_one_or_none()
+    version = uuid.uuid4().hex
+    if row:
+        row.value = version
+    else:
+        row = AppSetting(key=KEYWORD_SET_VERSION_KEY, value=version)
+    db.add(row)
+    return version
+
+
+def get_compiled_keyword_set_sync(db: Session) -> CompiledKeywordSet:
+    """Return the worker-process keyword set, rebuilding it only when the version changes.
+
+    Without a stored version there is nothing to key the cache on, so the set
+    is rebuilt on every call.
+    """
+    global _COMPILED_KEYWORDS
+
+    version = get_keyword_set_version_sync(db)
+    with _CACHE_LOCK:
+        cached = _COMPILED_KEYWORDS
+        if cached is not None and version is not None and cached.version == version:
+            return cached
+
+        keywords = db.execute(select(Keyword)).scalars().all()
+        compiled = CompiledKeywordSet(keyword_dicts(keywords), version=version)
+        _COMPILED_KEYWORDS = compiled
+        return compiled
+
+
+def clear_compiled_keyword_set_cache() -> None:
+    global _COMPILED_KEYWORDS
+
+    with _CACHE_LOCK:
+        _COMPILED_KEYWORDS = None
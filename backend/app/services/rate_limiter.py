@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+import redis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "podlistener:ratelimit:"
+
+# Reservation-style token bucket. The balance may go negative: each caller
+# takes a token immediately and is told how long to wait until it is covered,
+# so concurrent callers queue fairly without polling Redis.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = capacity
+  ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+
+if tokens >= 0 then
+  return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+@dataclass(frozen=True)
+class Bucket:
+    name: str
+    rate_per_second: float
+    capacity: int
+
+
+class LocalTokenBucketLimiter:
+    """In-process limiter with the same semantics as the Redis one (tests, single host)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: dict[str, tuple[float, float]] = {}
+
+    def reserve(self, bucket: Bucket) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, ts = self._state.get(bucket.name, (float(bucket.capacity), now))
+            tokens = min(bucket.capacity, tokens + max(0.0, now - ts) * bucket.rate_per_second) - 1
+            self._state[bucket.name] = (tokens, now)
+        if tokens >= 0:
+            return 0.0
+        return -tokens / bucket.rate_per_second
+
+
+class RedisTokenBucketLimiter:
+    """Token buckets shared by every worker process through Redis."""
+
+    def __init__(self, redis_url: str):
+        self._client = redis.Redis.from_url(redis_url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_LUA)
+
+    def reserve(self, bucket: Bucket) -> float:
+        result = self._script(
+            keys=[f"{KEY_PREFIX}{bucket.name}"],
+            args=[bucket.rate_per_second, bucket.capacity],
+        )
+        return float(result)
+
+
+_LIMITER_LOCK = threading.Lock()
+_LIMITER: LocalTokenBucketLimiter | RedisTokenBucketLimiter | None = None
+
+
+def get_limiter() -> LocalTokenBucketLimiter | RedisTokenBucketLimiter:
+    global _LIMITER
+
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            if settings.RATE_LIMIT_BACKEND == "redis":
+                _LIMITER = RedisTokenBucketLimiter(settings.REDIS_URL)
+            else:
+                _LIMITER = LocalTokenBucketLimiter()
+        return _LIMITER
+
+
+def set_limiter(limiter: LocalTokenBucketLimiter | RedisTokenBucketLimiter | None) -> None:
+    global _LIMITER
+
+    with _LIMITER_LOCK:
+        _LIMITER = limiter
+
+
+def llm_buckets(provider: str, model: str) -> list[Bucket]:
+    burst = max(1, settings.LLM_RATE_LIMIT_BURST)
+    buckets = []
+    if settings.LLM_RATE_LIMIT_PER_SECOND > 0:
+        buckets.append(Bucket(f"llm:{provider}", settings.LLM_RATE_LIMIT_PER_SECOND, burst))
+    if settings.LLM_MODEL_RATE_LIMIT_PER_SECOND > 0:
+        buckets.append(Bucket(f"llm:{provider}:{model}", settings.LLM_MODEL_RATE_LIMIT_PER_SECOND, burst))
+    return buckets
+
+
+def transcription_buckets(provider: str, model: str) -> list[Bucket]:
+    if settings.TRANSCRIPTION_RATE_LIMIT_PER_SECOND <= 0:
+        return []
+    burst = max(1, settings.TRANSCRIPTION_RATE_LIMIT_BURST)
+    return [Bucket(f"transcription:{provider}:{model}", settings.TRANSCRIPTION_RATE_LIMIT_PER_SECOND, burst)]
+
+
+def reserve(buckets: list[Bucket]) -> float:
+    """Take one token from every bucket and return the longest wait.
+
+    A Redis outage fails open so enrichment and transcription keep running
+    with only their local pacing.
+    """
+    if not buckets:
+        return 0.0
+
+    limiter = get_limiter()
+    wait_seconds = 0.0
+    for bucket in buckets:
+        try:
+            wait_seconds = max(wait_seconds, limiter.reserve(bucket))
+        except redis.RedisError:
+            logger.warning("Rate limiter unavailable for bucket %s; not throttling", bucket.name, exc_info=True)
+    return wait_seconds
+
+
+def wait_for_slot(buckets: list[Bucket]) -> None:
+    wait_seconds = reserve(buckets)
+    if wait_seconds > 0:
+        time.sleep(wait_seconds)
+
+
+async def wait_for_slot_async(buckets: list[Bucket]) -> None:
+    if not buckets:
+        return
+    # The Redis reservation is a blocking round trip; keep it off the event loop.
+    wait_seconds = await asyncio.to_thread(reserve, buckets)
+    if wait_seconds > 0:
+        await asyncio.sleep(wait_seconds)
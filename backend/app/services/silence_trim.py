@@ -0,0 +1,163 @@
+import bisect
+import logging
+import re
+import subprocess
+from dataclasses import dataclass
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+@dataclass(frozen=True)
+class OffsetMap:
+    """Maps times in trimmed audio back to the original recording.
+
+    ``spans`` are the kept ``(start, end)`` ranges of the original audio, in
+    order; the trimmed file is those ranges played back to back.
+    """
+
+    spans: tuple[tuple[float, float], ...]
+
+    @property
+    def trimmed_starts(self) -> list[float]:
+        starts = []
+        position = 0.0
+        for start, end in self.spans:
+            starts.append(position)
+            position += end - start
+        return starts
+
+    def to_original(self, trimmed_seconds: float) -> float:
+        if not self.spans:
+            return trimmed_seconds
+        starts = self.trimmed_starts
+        index = max(0, bisect.bisect_right(starts, trimmed_seconds) - 1)
+        span_start, span_end = self.spans[index]
+        return min(span_start + (trimmed_seconds - starts[index]), span_end)
+
+
+@dataclass(frozen=True)
+class TrimResult:
+    audio_path: str
+    offset_map: OffsetMap
+    original_seconds: float
+    seconds_saved: float
+
+
+def detect_silences(audio_path: str) -> tuple[list[tuple[float, float]], float | None]:
+    """Run ffmpeg silencedetect; return silent ranges and the input duration."""
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostdin",
+        "-i",
+        audio_path,
+        "-vn",
+        "-af",
+        (
+            f"silencedetect=noise={settings.TRANSCRIPTION_VAD_NOISE_DB}dB"
+            f":d={settings.TRANSCRIPTION_VAD_MIN_SILENCE_SECONDS}"
+        ),
+        "-f",
+        "null",
+        "-",
+    ]
+    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return _parse_silencedetect(result.stderr)
+
+
+def _parse_silencedetect(output: str) -> tuple[list[tuple[float, float]], float | None]:
+    duration = None
+    match = _DURATION_RE.search(output)
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    silences = []
+    open_start = None
+    for line in output.splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            open_start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and open_start is not None:
+            silences.append((open_start, float(end_match.group(1))))
+            open_start = None
+
+    # Silence running to the end of the file never gets a silence_end line.
+    if open_start is not None and duration is not None and duration > open_start:
+        silences.append((open_start, duration))
+    return silences, duration
+
+
+def speech_spans(
+    silences: list[tuple[float, float]],
+    duration: float,
+    padding_seconds: float,
+) -> list[tuple[float, float]]:
+    """Complement of ``silences`` within ``[0, duration]``, keeping ``padding_seconds`` around speech."""
+    spans = []
+    position = 0.0
+    for silence_start, silence_end in silences:
+        cut_start = silence_start + padding_seconds if silence_start > 0 else 0.0
+        cut_end = silence_end - padding_seconds if silence_end < duration else duration
+        if cut_end <= cut_start:
+            continue
+        if cut_start > position:
+            spans.append((position, cut_start))
+        position = max(position, cut_end)
+    if position < duration:
+        spans.append((position, duration))
+    return spans
+
+
+def trim_silence(audio_path: str, output_path: str) -> TrimResult | None:
+    """Write ``audio_path`` without its silent spans to ``output_path``.
+
+    Returns None when trimming would save less than
+    TRANSCRIPTION_VAD_MIN_SAVED_SECONDS, in which case nothing is written.
+    """
+    silences, duration = detect_silences(audio_path)
+    if duration is None or not silences:
+        return None
+
+    spans = speech_spans(silences, duration, max(0.0, settings.TRANSCRIPTION_VAD_PADDING_SECONDS))
+    kept_seconds = sum(end - start for start, end in spans)
+    seconds_saved = duration - kept_seconds
+    if not spans or seconds_saved < settings.TRANSCRIPTION_VAD_MIN_SAVED_SECONDS:
+        return None
+
+    selection = "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in spans)
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        audio_path,
+        "-vn",
+        "-af",
+        f"aselect='{selection}',asetpts=N/SR/TB",
+        "-ac",
+        "1",
+        "-ar",
+        "16000",
+        "-b:a",
+        "64k",
+        output_path,
+    ]
+    subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return TrimResult(
+        audio_path=output_path,
+        offset_map=OffsetMap(tuple(spans)),
+        original_seconds=duration,
+        seconds_saved=seconds_saved,
+    )
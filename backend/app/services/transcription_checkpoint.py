@@ -0,0 +1,76 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+def audio_sha256(audio_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(audio_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkCheckpoint:
+    """Per-audio store of finished chunk transcripts.
+
+    Entries live under TRANSCRIPTION_CHECKPOINT_DIR in a directory named
+    after the audio hash and the parameters that shape the chunks (URL,
+    model, chunk length, bitrate), so a retry only resumes work produced by
+    an identical split. Storage errors are logged and never fail a
+    transcription.
+    """
+
+    def __init__(self, audio_hash: str, params: dict):
+        params_hash = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        self.directory = os.path.join(settings.TRANSCRIPTION_CHECKPOINT_DIR, f"{audio_hash}-{params_hash}")
+
+    def load(self) -> tuple[dict[int, tuple[float, str]], int | None]:
+        """Return finished ``(start_seconds, text)`` chunks by index and the chunk count, if known."""
+        done: dict[int, tuple[float, str]] = {}
+        chunk_count = None
+        if not os.path.isdir(self.directory):
+            return done, chunk_count
+
+        try:
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if name == "manifest.json":
+                    with open(path, encoding="utf-8") as f:
+                        chunk_count = int(json.load(f)["chunk_count"])
+                elif name.startswith("chunk_") and name.endswith(".json"):
+                    with open(path, encoding="utf-8") as f:
+                        entry = json.load(f)
+                    done[int(name[len("chunk_"):-len(".json")])] = (float(entry["start"]), entry["text"])
+        except (OSError, ValueError, KeyError):
+            logger.warning("Ignoring unreadable transcription checkpoint %s", self.directory, exc_info=True)
+            return {}, None
+        return done, chunk_count
+
+    def save_chunk(self, index: int, start: float, text: str) -> None:
+        self._write(f"chunk_{index:04d}.json", json.dumps({"start": start, "text": text}, ensure_ascii=False))
+
+    def save_chunk_count(self, chunk_count: int) -> None:
+        self._write("manifest.json", json.dumps({"chunk_count": chunk_count}))
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write(self, name: str, content: str) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp_")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except OSError:
+            logger.warning("Failed to write transcription checkpoint %s/%s", self.directory, name, exc_info=True)
@@ -1,12 +1,23 @@
+import json
 import logging
 import os
-import glob
 import subprocess
 import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
 import httpx
 
 from app.config import settings
+from app.services.http_clients import get_http_client
+from app.services.rate_limiter import transcription_buckets, wait_for_slot
+from app.services.silence_trim import OffsetMap
+from app.services.transcription_checkpoint import ChunkCheckpoint, audio_sha256
 from app.services.transcription_runtime_config import get_transcription_config_sync
 
 logger = logging.getLogger(__name__)
@@ -17,7 +28,7 @@ def _format_mb(num_bytes: int) -> str:
 
 def _submit_transcription_request(url: str, headers: dict[str, str], model: str, audio_path: str) -> str:
     with open(audio_path, "rb") as f:
-        response = httpx.post(
+        response = get_http_client("transcription", url).post(
             url,
             headers=headers,
             files={"file": (os.path.basename(audio_path), f, "audio/mpeg")},
@@ -28,21 +39,104 @@ def _submit_transcription_request(url: str, headers: dict[str, str], model: str,
     return response.text.strip()
 
 
-def _split_audio_into_chunks(
+def _submit_timestamped_transcription_request(
+    url: str,
+    headers: dict[str, str],
+    model: str,
+    audio_path: str,
+) -> str:
+    """Request verbose_json and return its segments as compact JSON ``[[start, end, text], ...]``."""
+    with open(audio_path, "rb") as f:
+        response = get_http_client("transcription", url).post(
+            url,
+            headers=headers,
+            files={"file": (os.path.basename(audio_path), f, "audio/mpeg")},
+            data={"model": model, "response_format": "verbose_json", "timestamp_granularities[]": "segment"},
+            timeout=settings.TRANSCRIPTION_TIMEOUT_SECONDS,
+        )
+    response.raise_for_status()
+    body = response.json()
+    segments = [
+        [float(segment["start"]), float(segment["end"]), segment.get("text", "")]
+        for segment in body.get("segments") or []
+    ]
+    if not segments and (body.get("text") or "").strip():
+        segments = [[0.0, float(body.get("duration") or 0.0), body["text"]]]
+    return json.dumps(segments, ensure_ascii=False)
+
+
+@dataclass
+class TimedTranscript:
+    """Transcript text plus parallel segment arrays (empty in text-only mode).
+
+    Segment ``i`` begins at character ``offsets[i]`` of ``text`` and spans
+    ``starts[i]``..``ends[i]`` seconds of audio.
+    """
+
+    text: str
+    starts: list[float] = field(default_factory=list)
+    ends: list[float] = field(default_factory=list)
+    offsets: list[int] = field(default_factory=list)
+
+
+def _merge_chunk_results(results: list[tuple[float, str]], timestamps: bool) -> TimedTranscript:
+    """Join ``(start_seconds, result)`` chunks in order, shifting segment times by each chunk's start."""
+    if not timestamps:
+        return TimedTranscript("\n".join(text for _, text in results if text).strip())
+
+    merged = TimedTranscript("")
+    lines = []
+    length = 0
+    for chunk_offset, result in results:
+        pieces = []
+        for start, end, text in json.loads(result):
+            text = text.strip()
+            if not text:
+                continue
+            if pieces:
+                length += 1  # joining space
+            elif lines:
+                length += 1  # newline between chunks
+            merged.starts.append(round(start + chunk_offset, 3))
+            merged.ends.append(round(end + chunk_offset, 3))
+            merged.offsets.append(length)
+            pieces.append(text)
+            length += len(text)
+        if pieces:
+            lines.append(" ".join(pieces))
+    merged.text = "\n".join(lines)
+    return merged
+
+
+def _stream_audio_chunks(
     *,
     audio_path: str,
+    output_dir: str,
     chunk_seconds: int,
     bitrate_kbps: int,
     max_upload_bytes: int,
-) -> tuple[tempfile.TemporaryDirectory[str], list[str]]:
-    tmpdir = tempfile.TemporaryDirectory(prefix="transcription_chunks_")
-    output_pattern = os.path.join(tmpdir.name, "chunk_%04d.mp3")
+    start_index: int = 0,
+) -> Iterator[tuple[int, str, float]]:
+    """Yield ``(chunk_index, path, start_seconds)`` for each chunk as soon as ffmpeg finishes it.
+
+    ffmpeg prints every completed segment to stdout through its CSV segment
+    list, so uploads can start while the rest of the episode is still
+    transcoding. The list also carries each segment's actual start time:
+    segments are cut on packet boundaries and drift from ``chunk_seconds``.
+    The first ``start_index`` chunks are skipped; files keep their absolute
+    numbering (``chunk_%04d``) and start times when resuming.
+    """
+    output_pattern = os.path.join(output_dir, "chunk_%04d.mp3")
+    seek_seconds = start_index * chunk_seconds
+    seek_args = ["-ss", str(seek_seconds)] if start_index > 0 else []
     cmd = [
         "ffmpeg",
         "-hide_banner",
+        "-nostdin",
         "-loglevel",
         "error",
         "-y",
+        *seek_args,
         "-i",
         audio_path,
         "-vn",
@@ -56,43 +150,284 @@ def _split_audio_into_chunks(
         "segment",
         "-segment_time",
         str(chunk_seconds),
+        "-segment_start_number",
+        str(start_index),
+        "-segment_list",
+        "pipe:1",
+        "-segment_list_type",
+        "csv",
         "-reset_timestamps",
         "1",
         output_pattern,
     ]
 
-    try:
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
-    except FileNotFoundError as exc:
-        tmpdir.cleanup()
-        raise RuntimeError(
-            "ffmpeg is required for chunked external transcription but is not installed."
-        ) from exc
-    except subprocess.CalledProcessError as exc:
-        tmpdir.cleanup()
-        stderr = (exc.stderr or "").strip()
-        raise RuntimeError(f"Failed to chunk audio for transcription: {stderr or str(exc)}") from exc
-
-    chunk_paths = sorted(glob.glob(os.path.join(tmpdir.name, "chunk_*.mp3")))
-    if not chunk_paths:
-        tmpdir.cleanup()
-        raise RuntimeError("Failed to chunk audio for transcription: no chunks were generated.")
+    # stderr goes to a file: an undrained pipe could stall ffmpeg mid-episode.
+    with tempfile.TemporaryFile(mode="w+") as stderr_file:
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
+            )
+        except FileNotFoundError as exc:
+            raise RuntimeError(
+                "ffmpeg is required for chunked external transcription but is not installed."
+            ) from exc
+
+        chunk_count = 0
+        try:
+            for line in process.stdout:
+                line = line.strip()
+                if not line:
+                    continue
+                # "<filename>,<start>,<end>", times relative to the seek point.
+                filename, segment_start, _ = line.rsplit(",", 2)
+                name = os.path.basename(filename)
+                chunk_path = os.path.join(output_dir, name)
+                chunk_size = os.path.getsize(chunk_path)
+                if chunk_size > max_upload_bytes:
+                    raise RuntimeError(
+                        f"Chunk {name} is too large for external transcription: "
+                        f"{_format_mb(chunk_size)} (max {_format_mb(max_upload_bytes)}). "
+                        "Reduce chunk seconds or bitrate."
+                    )
+                chunk_count += 1
+                index = int(os.path.splitext(name)[0].rsplit("_", 1)[1])
+                yield index, chunk_path, seek_seconds + float(segment_start)
+
+            returncode = process.wait()
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
 
-    for chunk_path in chunk_paths:
-        chunk_size = os.path.getsize(chunk_path)
-        if chunk_size > max_upload_bytes:
-            tmpdir.cleanup()
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().strip()
             raise RuntimeError(
-                f"Chunk {os.path.basename(chunk_path)} is too large for external transcription: "
-                f"{_format_mb(chunk_size)} (max {_format_mb(max_upload_bytes)}). "
-                "Reduce chunk seconds or bitrate."
+                f"Failed to chunk audio for transcription: {stderr or f'ffmpeg exited with {returncode}'}"
+            )
+
+    if chunk_count == 0 and start_index == 0:
+        raise RuntimeError("Failed to chunk audio for transcription: no chunks were generated.")
+
+
+def _transcribe_chunks(
+    url: str,
+    headers: dict[str, str],
+    model: str,
+    provider: str,
+    chunks: Iterable[tuple[int, str]],
+    on_chunk_done: Callable[[int, str], None] | None = None,
+    timestamps: bool = False,
+) -> dict[int, str]:
+    """Transcribe chunks as they arrive, up to TRANSCRIPTION_CHUNK_CONCURRENCY at once.
+
+    Each chunk file is deleted once uploaded, and ``on_chunk_done(index,
+    text)`` runs as soon as it succeeds, so finished work is recorded even if
+    a later chunk fails. Returns texts by chunk index.
+    """
+
+    def transcribe_chunk(index: int, chunk_path: str) -> str:
+        logger.info("Transcribing chunk %s (%s)", index + 1, _format_mb(os.path.getsize(chunk_path)))
+        text = _submit_chunk_with_retries(url, headers, model, provider, chunk_path, timestamps)
+        os.remove(chunk_path)
+        if on_chunk_done is not None:
+            on_chunk_done(index, text)
+        return text
+
+    texts: dict[int, str] = {}
+    concurrency = max(1, settings.TRANSCRIPTION_CHUNK_CONCURRENCY)
+    if concurrency <= 1:
+        for index, path in chunks:
+            texts[index] = transcribe_chunk(index, path)
+        return texts
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="transcribe-chunk") as executor:
+        pending = {}
+        try:
+            for index, path in chunks:
+                pending[executor.submit(transcribe_chunk, index, path)] = index
+                if len(pending) >= concurrency:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        texts[pending.pop(future)] = future.result()
+            for future, index in pending.items():
+                texts[index] = future.result()
+        except Exception:
+            # One chunk is out of retries; don't upload the rest for nothing.
+            for future in pending:
+                future.cancel()
+            raise
+    return texts
+
+
+def _transcribe_chunks_resumable(
+    url: str,
+    headers: dict[str, str],
+    model: str,
+    provider: str,
+    *,
+    audio_path: str,
+    chunk_seconds: int,
+    bitrate_kbps: int,
+    max_upload_bytes: int,
+    timestamps: bool = False,
+) -> list[tuple[float, str]]:
+    """Transcribe chunks, reusing any a previous attempt already finished.
+
+    Returns ``(start_seconds, result)`` per chunk in order.
+
+    Finished chunks are checkpointed by audio hash and chunk parameters, so a
+    task retry only re-splits from the first missing chunk and uploads the
+    chunks that are still missing.
+    """
+    checkpoint = ChunkCheckpoint(
+        audio_sha256(audio_path),
+        {
+            "url": url,
+            "model": model,
+            "chunk_seconds": chunk_seconds,
+            "bitrate_kbps": bitrate_kbps,
+            "timestamps": timestamps,
+        },
+    )
+    done, chunk_count = checkpoint.load()
+    if chunk_count is not None and all(index in done for index in range(chunk_count)):
+        logger.info("All %s chunks already transcribed; reusing checkpoint", chunk_count)
+        return [done[index] for index in range(chunk_count)]
+
+    start_index = 0
+    while start_index in done:
+        start_index += 1
+    if start_index:
+        logger.info("Resuming chunked transcription at chunk %s (%s already done)", start_index + 1, len(done))
+
+    seen: list[int] = []
+    starts: dict[int, float] = {}
+
+    def missing_chunks(output_dir: str) -> Iterator[tuple[int, str]]:
+        stream = _stream_audio_chunks(
+            audio_path=audio_path,
+            output_dir=output_dir,
+            chunk_seconds=chunk_seconds,
+            bitrate_kbps=bitrate_kbps,
+            max_upload_bytes=max_upload_bytes,
+            start_index=start_index,
+        )
+        with closing(stream):
+            for index, path, start in stream:
+                seen.append(index)
+                starts[index] = start
+                if index in done:
+                    os.remove(path)
+                    continue
+                yield index, path
+        checkpoint.save_chunk_count(start_index + len(seen))
+
+    def save_chunk(index: int, text: str) -> None:
+        checkpoint.save_chunk(index, starts[index], text)
+
+    with tempfile.TemporaryDirectory(prefix="transcription_chunks_") as output_dir:
+        # Closing the stream stops ffmpeg before its output directory goes away.
+        with closing(missing_chunks(output_dir)) as chunks:
+            texts = _transcribe_chunks(url, headers, model, provider, chunks, save_chunk, timestamps)
+    done.update((index, (starts[index], text)) for index, text in texts.items())
+
+    checkpoint.clear()
+    return [done[index] for index in range(start_index + len(seen))]
+
+
+def _submit_chunk_with_retries(
+    url: str,
+    headers: dict[str, str],
+    model: str,
+    provider: str,
+    chunk_path: str,
+    timestamps: bool = False,
+) -> str:
+    submit = _submit_timestamped_transcription_request if timestamps else _submit_transcription_request
+    max_retries = max(0, settings.TRANSCRIPTION_CHUNK_MAX_RETRIES)
+    for attempt in range(max_retries + 1):
+        wait_for_slot(transcription_buckets(provider, model))
+        try:
+            return submit(url, headers, model, chunk_path)
+        except (httpx.HTTPStatusError, httpx.RequestError) as exc:
+            if attempt >= max_retries or not _is_retryable_chunk_error(exc):
+                raise
+            delay = _chunk_retry_delay(exc, attempt)
+            logger.warning(
+                "Chunk %s failed; retrying in %ss (%s/%s)",
+                os.path.basename(chunk_path),
+                delay,
+                attempt + 1,
+                max_retries,
+                exc_info=exc,
             )
+            time.sleep(delay)
 
-    return tmpdir, chunk_paths
+    raise RuntimeError("Retry loop exhausted without returning or raising")
+
+
+def _is_retryable_chunk_error(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in {408, 425, 429, 500, 502, 503, 504}
+    return isinstance(exc, httpx.RequestError)
+
+
+def _chunk_retry_delay(exc: Exception, attempt: int) -> int:
+    """429-aware exponential backoff, bounded so retries fit inside the task."""
+    max_delay = max(1, settings.TRANSCRIPTION_CHUNK_RETRY_MAX_SECONDS)
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429:
+        retry_after = _parse_retry_after_seconds(exc.response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(retry_after, max_delay)
+
+    base = max(1, settings.TRANSCRIPTION_CHUNK_RETRY_BASE_SECONDS)
+    return min(base * (2 ** max(0, attempt)), max_delay)
+
+
+def _parse_retry_after_seconds(raw_value: str | None) -> int | None:
+    if not raw_value:
+        return None
+
+    value = raw_value.strip()
+    if value.isdigit():
+        return int(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except Exception:
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    seconds = int((retry_at - datetime.now(timezone.utc)).total_seconds())
+    return max(0, seconds)
 
 
 def transcribe_audio(audio_path: str) -> str:
     """Transcribe audio via local whisper server or runtime-configured external provider."""
+    return _transcribe(audio_path, timestamps=False).text
+
+
+def transcribe_audio_timed(audio_path: str, offset_map: OffsetMap | None = None) -> TimedTranscript:
+    """Transcribe with segment timestamps (verbose_json).
+
+    Chunk offsets are applied while merging; ``offset_map`` then maps times
+    in silence-trimmed audio back to the original recording.
+    """
+    transcript = _transcribe(audio_path, timestamps=True)
+    if offset_map is not None:
+        transcript.starts = [round(offset_map.to_original(t), 3) for t in transcript.starts]
+        transcript.ends = [round(offset_map.to_original(t), 3) for t in transcript.ends]
+    return transcript
+
+
+def _transcribe(audio_path: str, timestamps: bool) -> TimedTranscript:
     runtime_config = get_transcription_config_sync()
     provider = runtime_config["provider"]
     model = runtime_config["model"]
@@ -120,29 +455,25 @@ def transcribe_audio(audio_path: str) -> str:
             )
             chunk_seconds = max(60, settings.TRANSCRIPTION_EXTERNAL_CHUNK_SECONDS)
             bitrate_kbps = max(16, settings.TRANSCRIPTION_EXTERNAL_CHUNK_BITRATE_KBPS)
-            tmpdir, chunk_paths = _split_audio_into_chunks(
+            chunk_results = _transcribe_chunks_resumable(
+                url,
+                headers,
+                model,
+                provider,
                 audio_path=audio_path,
                 chunk_seconds=chunk_seconds,
                 bitrate_kbps=bitrate_kbps,
                 max_upload_bytes=external_upload_max_bytes,
+                timestamps=timestamps,
             )
-            try:
-                chunk_texts = []
-                for index, chunk_path in enumerate(chunk_paths, start=1):
-                    logger.info(
-                        "Transcribing chunk %s/%s (%s)",
-                        index,
-                        len(chunk_paths),
-                        _format_mb(os.path.getsize(chunk_path)),
-                    )
-                    chunk_text = _submit_transcription_request(url, headers, model, chunk_path)
-                    if chunk_text:
-                        chunk_texts.append(chunk_text)
-            finally:
-                tmpdir.cleanup()
-            return "\n".join(chunk_texts).strip()
-
-        return _submit_transcription_request(url, headers, model, audio_path)
+            return _merge_chunk_results(chunk_results, timestamps)
+
+        if provider == "external":
+            wait_for_slot(transcription_buckets(provider, model))
+        if timestamps:
+            result = _submit_timestamped_transcription_request(url, headers, model, audio_path)
+            return _merge_chunk_results([(0.0, result)], timestamps)
+        return TimedTranscript(_submit_transcription_request(url, headers, model, audio_path))
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code == 413:
             raise RuntimeError(
@@ -1,5 +1,6 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.config import settings
 
@@ -9,6 +10,8 @@ celery.conf.update(
     include=[
         "app.worker.tasks.poll",
         "app.worker.tasks.process",
+        "app.worker.tasks.backfill",
+        "app.worker.tasks.maintenance",
     ],
     result_backend=settings.REDIS_URL,
     task_serializer="json",
@@ -24,11 +27,32 @@ celery.conf.update(
         "app.worker.tasks.process.transcribe_episode_audio": {"queue": "transcription"},
         "app.worker.tasks.process.detect_episode_keywords": {"queue": "keywords"},
         "app.worker.tasks.process.enrich_episode_mentions": {"queue": "llm"},
+        "app.worker.tasks.backfill.*": {"queue": "keywords"},
+        "app.worker.tasks.maintenance.*": {"queue": "download"},
     },
     beat_schedule={
         "poll-all-feeds": {
             "task": "app.worker.tasks.poll.poll_all_feeds",
-            "schedule": crontab(minute="*/15"),
+            # Only due feeds are dispatched; each feed's cadence lives in Feed.next_poll_at.
+            "schedule": crontab(minute="*"),
+        },
+        "sweep-audio-cache": {
+            "task": "app.worker.tasks.maintenance.sweep_audio_cache",
+            "schedule": crontab(minute="*/30"),
         },
     },
 )
+
+
+@worker_process_init.connect
+def _reset_http_clients(**kwargs):
+    from app.services.http_clients import reset_http_clients
+
+    reset_http_clients()
+
+
+@worker_process_shutdown.connect
+def _close_http_clients(**kwargs):
+    from app.services.http_clients import close_http_clients
+
+    close_http_clients()
@@ -0,0 +1,123 @@
+import logging
+import uuid
+
+from sqlalchemy import select
+
+from app.worker.celery_app import celery
+from app.database import SyncSessionLocal
+from app.config import settings
+from app.models import Episode, Keyword
+from app.services.detection_service import CompiledKeywordSet
+from app.services.keyword_set_service import keyword_dicts
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(
+    name="app.worker.tasks.backfill.backfill_keyword",
+    bind=True,
+    max_retries=2,
+    soft_time_limit=settings.PROCESS_EPISODE_SOFT_TIME_LIMIT_SECONDS,
+    time_limit=settings.PROCESS_EPISODE_TIME_LIMIT_SECONDS,
+)
+def backfill_keyword(self, keyword_id: str):
+    """Fan a new keyword out over stored transcripts as per-batch detection tasks.
+
+    Batches run as Celery subtasks rather than in a local process pool:
+    prefork workers are daemonic and cannot start child processes.
+    """
+    with SyncSessionLocal() as db:
+        keyword = db.query(Keyword).filter(Keyword.id == uuid.UUID(keyword_id)).first()
+        if not keyword:
+            logger.warning("Keyword %s not found; skipping backfill", keyword_id)
+            return {"keyword_id": keyword_id, "episodes": 0, "batches": 0}
+
+        phrase = keyword.phrase
+        batch_size = max(1, settings.KEYWORD_BACKFILL_BATCH_SIZE)
+        batch_count = 0
+        episode_count = 0
+        try:
+            # Episodes still mid-pipeline may have run detection before this
+            # keyword existed, so every non-failed transcript is scanned; the
+            # additive enrichment skips mentions that already exist.
+            # yield_per streams ids through a server-side cursor on Postgres,
+            # and each batch is dispatched as soon as it is read.
+            result = db.execute(
+                select(Episode.id)
+                .where(Episode.status != "failed", Episode.transcript_text.isnot(None))
+                .execution_options(yield_per=batch_size)
+            )
+            for partition in result.partitions():
+                episode_ids = [str(episode_id) for (episode_id,) in partition]
+                backfill_keyword_batch.delay(keyword_id, episode_ids)
+                batch_count += 1
+                episode_count += len(episode_ids)
+        except Exception as exc:
+            logger.exception("Keyword backfill failed for keyword %s", keyword_id)
+            self.retry(countdown=120, exc=exc)
+            return
+
+    logger.info(
+        "Keyword '%s': backfill queued %s batches over %s episodes",
+        phrase,
+        batch_count,
+        episode_count,
+    )
+    return {"keyword_id": keyword_id, "episodes": episode_count, "batches": batch_count}
+
+
+@celery.task(
+    name="app.worker.tasks.backfill.backfill_keyword_batch",
+    bind=True,
+    max_retries=2,
+    soft_time_limit=settings.PROCESS_EPISODE_SOFT_TIME_LIMIT_SECONDS,
+    time_limit=settings.PROCESS_EPISODE_TIME_LIMIT_SECONDS,
+)
+def backfill_keyword_batch(self, keyword_id: str, episode_ids: list[str]):
+    """Run one keyword over a batch of stored transcripts and enrich only its new matches."""
+    from app.worker.tasks.process import attach_audio_times, detection_payload_for, enrich_episode_mentions
+
+    with SyncSessionLocal() as db:
+        keyword = db.query(Keyword).filter(Keyword.id == uuid.UUID(keyword_id)).first()
+        if not keyword:
+            logger.warning("Keyword %s not found; skipping backfill batch", keyword_id)
+            return {"keyword_id": keyword_id, "episodes": 0, "matches": 0}
+
+        kw = keyword_dicts([keyword])[0]
+        try:
+            rows = db.execute(
+                select(Episode.id, Episode.transcript_text).where(
+                    Episode.id.in_([uuid.UUID(episode_id) for episode_id in episode_ids]),
+                    Episode.transcript_text.isnot(None),
+                )
+            ).all()
+            batch_result = _detect_batch(kw, [(str(episode_id), transcript) for episode_id, transcript in rows])
+        except Exception as exc:
+            logger.exception("Keyword backfill batch failed for keyword %s", keyword_id)
+            self.retry(countdown=120, exc=exc)
+            return
+
+        match_count = 0
+        for episode_id, matches in batch_result:
+            attach_audio_times(db, uuid.UUID(episode_id), matches)
+            payload = detection_payload_for(episode_id, matches, replace_existing=False)
+            enrich_episode_mentions.apply_async(args=[payload], queue="llm")
+            match_count += len(matches)
+
+    logger.info(
+        "Keyword '%s': backfill batch queued enrichment for %s matches across %s episodes",
+        kw["phrase"],
+        match_count,
+        len(batch_result),
+    )
+    return {"keyword_id": keyword_id, "episodes": len(batch_result), "matches": match_count}
+
+
+def _detect_batch(kw: dict, rows: list[tuple[str, str]]) -> list[tuple[str, list]]:
+    keyword_set = CompiledKeywordSet([kw])
+    results = []
+    for episode_id, transcript in rows:
+        matches = keyword_set.detect(transcript)
+        if matches:
+            results.append((episode_id, matches))
+    return results
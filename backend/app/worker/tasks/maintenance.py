@@ -0,0 +1,45 @@
+import logging
+import uuid
+
+from app.worker.celery_app import celery
+from app.database import SyncSessionLocal
+from app.models import Episode
+from app.services import audio_cache
+
+logger = logging.getLogger(__name__)
+
+# Episodes in these states still need their audio file.
+AUDIO_IN_USE_STATUSES = ("pending", "queued", "downloading", "transcribing")
+
+
+@celery.task(name="app.worker.tasks.maintenance.sweep_audio_cache")
+def sweep_audio_cache():
+    """Drop orphaned audio and scratch files, then evict down to the cache budget."""
+    with SyncSessionLocal() as db:
+        protected, orphaned = classify_cached_audio(db)
+    removed = audio_cache.sweep_orphans(orphaned, protected)
+    freed = audio_cache.evict(protected)
+    logger.info("Audio cache sweep: removed %s orphaned files, evicted %s bytes", removed, freed)
+    return {"removed": removed, "evicted_bytes": freed}
+
+
+def classify_cached_audio(db) -> tuple[set[str], set[str]]:
+    """Split episode ids with audio on disk into (still in use, no longer in the database)."""
+    on_disk = {entry.episode_id for entry in audio_cache.cached_audio()}
+    episode_ids = {}
+    for episode_id in on_disk:
+        try:
+            episode_ids[uuid.UUID(episode_id)] = episode_id
+        except ValueError:
+            continue
+    if not episode_ids:
+        return set(), set()
+
+    rows = db.query(Episode.id, Episode.status).filter(Episode.id.in_(list(episode_ids))).all()
+    known = {episode_ids[row.id] for row in rows}
+    protected = {episode_ids[row.id] for row in rows if row.status in AUDIO_IN_USE_STATUSES}
+    return protected, set(episode_ids.values()) - known
+
+
+def protected_audio_ids(db) -> set[str]:
+    return classify_cached_audio(db)[0]
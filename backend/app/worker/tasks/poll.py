@@ -1,23 +1,70 @@
 import logging
-from datetime import datetime, timezone
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from celery import group
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.worker.celery_app import celery
 from app.database import SyncSessionLocal
 from app.config import settings
 from app.models import Feed, Episode
-from app.services.feed_service import parse_feed
+from app.services.feed_schedule import next_poll_at
+from app.services.feed_service import (
+    FeedFetch,
+    fetch_feed,
+    fetch_feeds_concurrently,
+    parse_feed_content,
+    parse_feed_streaming,
+)
 
 logger = logging.getLogger(__name__)
 
+# Keeps multi-row INSERTs well under Postgres' 65535 bind-parameter limit.
+_INSERT_BATCH_ROWS = 1000
+# Newest stored GUIDs per feed that the streaming parser checks entries against.
+_KNOWN_GUID_LOOKBACK = 100
+# Recent publish dates per feed that the adaptive schedule is estimated from.
+_SCHEDULE_LOOKBACK = 10
+# How long a dispatched feed is held back from the next beat while it is polled.
+_DISPATCH_LEASE = timedelta(minutes=15)
+
 
 @celery.task(name="app.worker.tasks.poll.poll_all_feeds")
 def poll_all_feeds():
-    """Fan out polling to individual feed tasks."""
+    """Dispatch feeds whose next_poll_at is due, per feed or in shards of FEED_POLL_BATCH_SIZE.
+
+    Dispatched feeds are leased forward so a slow poll is not dispatched
+    again by the next beat; the poll itself sets the real next_poll_at.
+    """
+    now = datetime.now(timezone.utc)
     with SyncSessionLocal() as db:
-        feeds = db.query(Feed).all()
-        for feed in feeds:
-            poll_single_feed.delay(str(feed.id))
-        logger.info(f"Queued polling for {len(feeds)} feeds")
+        due_ids = list(
+            db.execute(
+                select(Feed.id)
+                .where(or_(Feed.next_poll_at.is_(None), Feed.next_poll_at <= now))
+                .order_by(Feed.next_poll_at.asc().nullsfirst())
+                .with_for_update(skip_locked=True)
+            ).scalars()
+        )
+        if due_ids:
+            db.execute(update(Feed).where(Feed.id.in_(due_ids)).values(next_poll_at=now + _DISPATCH_LEASE))
+        db.commit()
+    feed_ids = [str(feed_id) for feed_id in due_ids]
+
+    batch_size = settings.FEED_POLL_BATCH_SIZE
+    if batch_size > 0:
+        shards = [feed_ids[start:start + batch_size] for start in range(0, len(feed_ids), batch_size)]
+        if shards:
+            group(poll_feed_batch.s(shard) for shard in shards).apply_async()
+        logger.info("Queued polling for %s due feeds in %s batches", len(feed_ids), len(shards))
+        return
+
+    for feed_id in feed_ids:
+        poll_single_feed.delay(feed_id)
+    logger.info(f"Queued polling for {len(feed_ids)} due feeds")
 
 
 @celery.task(name="app.worker.tasks.poll.poll_single_feed", bind=True, max_retries=3)
@@ -32,66 +79,29 @@ def poll_single_feed(self, feed_id: str):
             return
 
         try:
-            data = parse_feed(feed.rss_url)
+            fetched = fetch_feed(feed.rss_url, feed.etag, feed.last_modified, feed.content_sha256)
+            if fetched.unchanged:
+                data = None
+            else:
+                known_guids = _known_guids(db, [feed.id])[feed.id]
+                data = _parse_content(fetched.content, fetched.content_type, known_guids, _parse_window(feed))
         except Exception as exc:
             logger.error(f"Failed to parse feed {feed.rss_url}: {exc}")
             self.retry(countdown=60, exc=exc)
             return
 
-        if data["feed"]["title"] and not feed.title:
-            feed.title = data["feed"]["title"]
-        if data["feed"]["image_url"] and not feed.image_url:
-            feed.image_url = data["feed"]["image_url"]
-
-        episodes = data["episodes"]
-
-        new_count = 0
-        for ep_data in episodes:
-            existing = db.query(Episode).filter(Episode.guid == ep_data["guid"]).first()
-            if existing:
-                continue
-
-            if not ep_data["audio_url"]:
-                continue
+        _store_validators(feed, fetched)
+        if fetched.unchanged:
+            _schedule_next_polls(db, [feed])
+            db.commit()
+            logger.info("Feed '%s' unchanged since last poll; next poll at %s", feed.title, feed.next_poll_at)
+            return
 
-            episode = Episode(
-                feed_id=feed.id,
-                guid=ep_data["guid"],
-                title=ep_data["title"],
-                audio_url=ep_data["audio_url"],
-                published_at=ep_data["published_at"],
-                status="pending",
-            )
-            db.add(episode)
-            new_count += 1
-
-        feed.last_polled_at = datetime.now(timezone.utc)
+        new_count = _add_new_episodes(db, feed, data)
+        _schedule_next_polls(db, [feed])
         db.commit()
 
-        max_episodes = settings.MAX_EPISODES_PER_FEED
-        if max_episodes > 0:
-            recent_episodes = (
-                db.query(Episode)
-                .filter(Episode.feed_id == feed.id)
-                .order_by(Episode.published_at.desc().nullslast(), Episode.created_at.desc())
-                .limit(max_episodes)
-                .all()
-            )
-        else:
-            recent_episodes = (
-                db.query(Episode)
-                .filter(Episode.feed_id == feed.id)
-                .order_by(Episode.published_at.desc().nullslast(), Episode.created_at.desc())
-                .all()
-            )
-
-        queued_episode_ids: list[str] = []
-        for episode in recent_episodes:
-            if episode.status != "pending":
-                continue
-            episode.status = "queued"
-            queued_episode_ids.append(str(episode.id))
-
+        queued_episode_ids = _claim_recent_pending(db, feed)
         if queued_episode_ids:
             db.commit()
 
@@ -105,3 +115,222 @@ def poll_single_feed(self, feed_id: str):
             new_count,
             queued_count,
         )
+
+
+@celery.task(name="app.worker.tasks.poll.poll_feed_batch")
+def poll_feed_batch(feed_ids: list[str]):
+    """Poll a shard of feeds: fetch concurrently, then parse and ingest them in one transaction.
+
+    A feed that fails to download or parse is logged and left for the next
+    beat; its stored validators are untouched so nothing is skipped.
+    """
+    from app.worker.tasks.process import process_episode
+
+    with SyncSessionLocal() as db:
+        feeds = db.query(Feed).filter(Feed.id.in_([uuid.UUID(feed_id) for feed_id in feed_ids])).all()
+        fetches = fetch_feeds_concurrently(
+            [(feed.rss_url, feed.etag, feed.last_modified, feed.content_sha256) for feed in feeds],
+            settings.FEED_POLL_CONCURRENCY,
+        )
+        known_guids = _known_guids(db, [feed.id for feed in feeds])
+        parsed = _parse_fetches(
+            fetches,
+            [known_guids[feed.id] for feed in feeds],
+            [_parse_window(feed) for feed in feeds],
+        )
+
+        polled_feeds = []
+        changed_feeds = []
+        new_count = 0
+        failed_count = 0
+        for feed, fetched, data in zip(feeds, fetches, parsed):
+            error = fetched if isinstance(fetched, Exception) else data
+            if isinstance(error, Exception):
+                logger.error("Failed to poll feed %s: %s", feed.rss_url, error)
+                failed_count += 1
+                continue
+            _store_validators(feed, fetched)
+            polled_feeds.append(feed)
+            if data is not None:
+                new_count += _add_new_episodes(db, feed, data)
+                changed_feeds.append(feed)
+        _schedule_next_polls(db, polled_feeds)
+        db.commit()
+
+        queued_episode_ids = []
+        for feed in changed_feeds:
+            queued_episode_ids.extend(_claim_recent_pending(db, feed))
+        if queued_episode_ids:
+            db.commit()
+
+    for episode_id in queued_episode_ids:
+        process_episode.delay(episode_id)
+
+    logger.info(
+        "Polled %s feeds: %s changed, %s failed, %s new episodes, queued %s for processing",
+        len(feeds),
+        len(changed_feeds),
+        failed_count,
+        new_count,
+        len(queued_episode_ids),
+    )
+    return {"feeds": len(feeds), "changed": len(changed_feeds), "failed": failed_count, "new_episodes": new_count}
+
+
+def _store_validators(feed: Feed, fetched: FeedFetch) -> None:
+    # Validators are saved with the episodes they describe, so a failed
+    # commit never makes the next poll skip entries it has not stored.
+    feed.etag = fetched.etag
+    feed.last_modified = fetched.last_modified
+    feed.content_sha256 = fetched.content_sha256
+    feed.last_polled_at = datetime.now(timezone.utc)
+
+
+def _add_new_episodes(db, feed: Feed, data: dict) -> int:
+    """Apply parsed feed metadata and add unseen episodes; return how many were added."""
+    if data["feed"]["title"] and not feed.title:
+        feed.title = data["feed"]["title"]
+    if data["feed"]["image_url"] and not feed.image_url:
+        feed.image_url = data["feed"]["image_url"]
+
+    rows: dict[str, dict] = {}
+    for ep_data in data["episodes"]:
+        if not ep_data["audio_url"] or ep_data["guid"] in rows:
+            continue
+        rows[ep_data["guid"]] = {
+            "feed_id": feed.id,
+            "guid": ep_data["guid"],
+            "title": ep_data["title"],
+            "audio_url": ep_data["audio_url"],
+            "published_at": ep_data["published_at"],
+            "status": "pending",
+        }
+
+    new_count = 0
+    batch = list(rows.values())
+    for start in range(0, len(batch), _INSERT_BATCH_ROWS):
+        new_count += _insert_new_episodes(db, batch[start:start + _INSERT_BATCH_ROWS])
+    return new_count
+
+
+def _insert_new_episodes(db, rows: list[dict]) -> int:
+    """Insert ``rows`` whose GUID is not stored yet; return how many were inserted.
+
+    ON CONFLICT DO NOTHING lets a concurrent poll of the same feed win the
+    race without failing this transaction. Dialects without it fall back to
+    a single GUID lookup.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(Episode).values(rows).on_conflict_do_nothing(index_elements=["guid"]).returning(Episode.id)
+        return len(db.execute(stmt).scalars().all())
+
+    known = set(db.execute(select(Episode.guid).where(Episode.guid.in_([row["guid"] for row in rows]))).scalars())
+    new_rows = [row for row in rows if row["guid"] not in known]
+    db.add_all(Episode(**row) for row in new_rows)
+    return len(new_rows)
+
+
+def _claim_recent_pending(db, feed: Feed) -> list[str]:
+    """Mark the feed's MAX_EPISODES_PER_FEED newest pending episodes queued; return their ids."""
+    query = (
+        db.query(Episode)
+        .filter(Episode.feed_id == feed.id)
+        .order_by(Episode.published_at.desc().nullslast(), Episode.created_at.desc())
+    )
+    max_episodes = settings.MAX_EPISODES_PER_FEED
+    if max_episodes > 0:
+        query = query.limit(max_episodes)
+
+    queued_episode_ids: list[str] = []
+    for episode in query.all():
+        if episode.status != "pending":
+            continue
+        episode.status = "queued"
+        queued_episode_ids.append(str(episode.id))
+    return queued_episode_ids
+
+
+def _known_guids(db, feed_ids: list[uuid.UUID]) -> dict[uuid.UUID, set[str]]:
+    """Newest stored GUIDs per feed, for the streaming parser's early stop.
+
+    Only the top of a feed decides where parsing stops, so a bounded
+    lookback suffices; an older GUID missed here is still deduplicated by
+    the ON CONFLICT insert.
+    """
+    known: dict[uuid.UUID, set[str]] = {feed_id: set() for feed_id in feed_ids}
+    if not settings.FEED_STREAMING_PARSE or not feed_ids:
+        return known
+
+    for feed_id, guid in _newest_per_feed(db, Episode.guid, feed_ids, _KNOWN_GUID_LOOKBACK):
+        known[feed_id].add(guid)
+    return known
+
+
+def _schedule_next_polls(db, feeds: list[Feed]) -> None:
+    """Set next_poll_at from each feed's recent publishing cadence."""
+    if not feeds:
+        return
+    published: dict[uuid.UUID, list[datetime]] = {feed.id: [] for feed in feeds}
+    rows = _newest_per_feed(db, Episode.published_at, list(published), _SCHEDULE_LOOKBACK)
+    for feed_id, published_at in rows:
+        published[feed_id].append(published_at)
+
+    now = datetime.now(timezone.utc)
+    for feed in feeds:
+        feed.next_poll_at = next_poll_at(published[feed.id], now)
+
+
+def _newest_per_feed(db, column, feed_ids: list[uuid.UUID], limit: int):
+    """``(feed_id, column)`` rows of each feed's ``limit`` newest episodes, in one query."""
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=Episode.feed_id,
+            order_by=(Episode.published_at.desc().nullslast(), Episode.created_at.desc()),
+        )
+        .label("rank")
+    )
+    recent = (
+        select(Episode.feed_id, column.label("value"), rank)
+        .where(Episode.feed_id.in_(feed_ids), column.isnot(None))
+        .subquery()
+    )
+    return db.execute(select(recent.c.feed_id, recent.c.value).where(recent.c.rank <= limit))
+
+
+def _parse_window(feed: Feed) -> int:
+    """Entries worth reading: INITIAL_IMPORT_EPISODE_LIMIT on a feed's first poll, else MAX_EPISODES_PER_FEED."""
+    if feed.last_polled_at is None:
+        return max(0, settings.INITIAL_IMPORT_EPISODE_LIMIT)
+    return max(0, settings.MAX_EPISODES_PER_FEED)
+
+
+def _parse_content(content: bytes, content_type: str | None, known_guids: set[str], limit: int) -> dict:
+    if settings.FEED_STREAMING_PARSE:
+        return parse_feed_streaming(content, content_type, known_guids, limit)
+    return parse_feed_content(content, content_type)
+
+
+def _parse_fetches(
+    fetches: list[FeedFetch | Exception],
+    known_guids: list[set[str]],
+    limits: list[int],
+) -> list[dict | Exception | None]:
+    """Parse changed feed bodies in the worker; unchanged and failed fetches map to None.
+
+    Shards running on separate workers provide the parsing parallelism.
+    """
+    results: list[dict | Exception | None] = [None] * len(fetches)
+    for index, fetched in enumerate(fetches):
+        if isinstance(fetched, FeedFetch) and not fetched.unchanged:
+            results[index] = _parse_safely(fetched.content, fetched.content_type, known_guids[index], limits[index])
+    return results
+
+
+def _parse_safely(content: bytes, content_type: str | None, known_guids: set[str], limit: int) -> dict | Exception:
+    try:
+        return _parse_content(content, content_type, known_guids, limit)
+    except Exception as exc:
+        return exc
@@ -1,7 +1,6 @@
 import os
 import logging
 import uuid
-import time
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 
@@ -9,12 +8,19 @@ import httpx
 from celery import chain
 
 from app.worker.celery_app import celery
+from app.worker.tasks.maintenance import protected_audio_ids
 from app.database import SyncSessionLocal
 from app.config import settings
-from app.models import Episode, Keyword, Mention
-from app.services.transcription_service import transcribe_audio
-from app.services.detection_service import detect_keywords
-from app.services.enrichment_service import enrich_mention
+from app.models import Episode, Mention, TranscriptSegments
+from app.models.mention import extract_segment
+from app.services import audio_cache
+from app.services.audio_download import download_audio
+from app.services.host_limiter import HostSlot, acquire_host_slot, download_host, host_backoff_countdown
+from app.services.silence_trim import TrimResult, trim_silence
+from app.services.transcription_service import transcribe_audio, transcribe_audio_timed
+from app.services.detection_service import KeywordMatch, cluster_match_windows
+from app.services.keyword_set_service import get_compiled_keyword_set_sync
+from app.services.enrichment_service import enrich_mention, enrich_mentions_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +47,7 @@ def process_episode(self, episode_id: str):
     soft_time_limit=settings.PROCESS_EPISODE_SOFT_TIME_LIMIT_SECONDS,
     time_limit=settings.PROCESS_EPISODE_TIME_LIMIT_SECONDS,
 )
-def download_episode_audio(self, episode_id: str):
+def download_episode_audio(self, episode_id: str, host_waits: int = 0):
     """Download episode audio to disk and hand off to pipeline task."""
     with SyncSessionLocal() as db:
         episode = db.query(Episode).filter(Episode.id == episode_id).first()
@@ -50,17 +56,60 @@ def download_episode_audio(self, episode_id: str):
             self.retry(countdown=10, exc=ValueError(f"Episode {episode_id} not found"))
             return
 
+        audio_path = _audio_path(episode_id)
+        if audio_cache.verify_cached_audio(audio_path, episode.audio_sha256):
+            audio_cache.touch(audio_path)
+            logger.info("Episode %s: reusing cached audio", episode_id)
+            return episode_id
+
+        # Make room first: the host slot's lease only covers the download itself
+        # (AUDIO_DOWNLOAD_TIMEOUT_SECONDS), not time spent waiting for disk space.
+        try:
+            audio_cache.wait_for_space(lambda: protected_audio_ids(db))
+        except Exception as exc:
+            logger.exception("No disk space to download episode %s", episode_id)
+            _mark_episode_failed(db, episode, exc)
+            self.retry(countdown=120, exc=exc, max_retries=self.max_retries + host_waits)
+            return
+
+        slot = acquire_host_slot(episode.audio_url or "")
+        if slot is None:
+            if host_waits < settings.AUDIO_DOWNLOAD_HOST_MAX_WAITS:
+                countdown = host_backoff_countdown(host_waits)
+                logger.info(
+                    "Episode %s: %s is at its download limit; rescheduling in %ss",
+                    episode_id,
+                    download_host(episode.audio_url),
+                    countdown,
+                )
+                # Host waits don't use up the retry budget for real failures.
+                self.retry(
+                    countdown=countdown,
+                    kwargs={"host_waits": host_waits + 1},
+                    max_retries=self.max_retries + host_waits + 1,
+                )
+                return
+            logger.warning(
+                "Episode %s: waited %s times for a download slot; downloading anyway",
+                episode_id,
+                host_waits,
+            )
+            slot = HostSlot(download_host(episode.audio_url), None)
+
         try:
             logger.info("Episode %s: starting download", episode_id)
             _update_status(db, episode, "downloading")
-            _download_audio(episode.audio_url, episode_id)
+            episode.audio_sha256 = _download_audio(episode.audio_url, episode_id)
+            db.commit()
             logger.info("Episode %s: download completed", episode_id)
             return episode_id
 
         except Exception as exc:
             logger.exception("Audio download failed for episode %s", episode_id)
             _mark_episode_failed(db, episode, exc)
-            self.retry(countdown=120, exc=exc)
+            self.retry(countdown=120, exc=exc, max_retries=self.max_retries + host_waits)
+        finally:
+            slot.release()
 
 
 @celery.task(
@@ -85,12 +134,32 @@ def transcribe_episode_audio(self, episode_id: str):
             logger.warning("Episode %s audio file missing; retrying", episode_id)
             self.retry(countdown=30, exc=FileNotFoundError(audio_path))
             return
+        audio_cache.touch(audio_path)
 
         try:
             logger.info("Episode %s: starting transcription", episode_id)
             _update_status(db, episode, "transcribing")
-            transcript = transcribe_audio(audio_path)
+            if _reuse_duplicate_transcript(db, episode):
+                return {"episode_id": episode_id, "transcription_done": True}
+
+            trim = _trim_silence(episode_id, audio_path)
+            try:
+                if settings.TRANSCRIPTION_TIMESTAMPS:
+                    timed = transcribe_audio_timed(
+                        trim.audio_path if trim else audio_path,
+                        trim.offset_map if trim else None,
+                    )
+                    transcript = timed.text
+                    _store_transcript_segments(db, episode, timed)
+                else:
+                    transcript = transcribe_audio(trim.audio_path if trim else audio_path)
+                    _clear_transcript_segments(db, episode)
+            finally:
+                if trim and os.path.exists(trim.audio_path):
+                    os.remove(trim.audio_path)
+            _clear_episode_mentions(db, episode)
             episode.transcript_text = transcript
+            episode.silence_trimmed_seconds = trim.seconds_saved if trim else None
             db.commit()
             logger.info("Episode %s: transcription complete", episode_id)
             return {"episode_id": episode_id, "transcription_done": True}
@@ -152,30 +221,16 @@ def detect_episode_keywords(self, transcription_result):
         try:
             logger.info("Episode %s: starting keyword detection", episode_id)
             _update_status(db, episode, "analyzing")
-            keywords = db.query(Keyword).all()
-            if not keywords:
+            keyword_set = get_compiled_keyword_set_sync(db)
+            if not keyword_set.keywords:
                 _update_status(db, episode, "completed")
                 logger.info("Episode %s: completed (no keywords)", episode_id)
                 return {"episode_id": episode_id, "matches": []}
 
-            kw_dicts = [
-                {"id": str(k.id), "phrase": k.phrase, "match_type": k.match_type}
-                for k in keywords
-            ]
-            matches = detect_keywords(episode.transcript_text, kw_dicts)
+            matches = keyword_set.detect(episode.transcript_text)
+            attach_audio_times(db, episode.id, matches)
             logger.info("Episode %s: found %s matches", episode_id, len(matches))
-            detection_payload = {
-                "episode_id": episode_id,
-                "matches": [
-                    {
-                        "keyword_id": match.keyword_id,
-                        "phrase": match.phrase,
-                        "matched_text": match.matched_text,
-                        "transcript_segment": match.transcript_segment,
-                    }
-                    for match in matches
-                ],
-            }
+            detection_payload = detection_payload_for(episode_id, matches)
             # Queue enrichment explicitly so direct/manual keyword detection runs
             # still trigger LLM processing and mention persistence.
             enrich_episode_mentions.apply_async(args=[detection_payload], queue="llm")
@@ -198,7 +253,10 @@ def enrich_episode_mentions(self, detection_result: dict):
     """Enrich detected matches and persist mentions."""
     episode_id = detection_result["episode_id"]
     matches = detection_result.get("matches", [])
-    start_index = int(detection_result.get("start_index", 0))
+    start_index = max(0, min(int(detection_result.get("start_index", 0)), len(matches)))
+    # Keyword backfills add to an already processed episode's mentions; they
+    # never replace its mentions or change its status.
+    additive = not detection_result.get("replace_existing", True)
     audio_path = _audio_path(episode_id)
 
     with SyncSessionLocal() as db:
@@ -209,23 +267,40 @@ def enrich_episode_mentions(self, detection_result: dict):
             return
 
         try:
+            next_index = start_index
             if not matches:
-                _update_status(db, episode, "completed")
+                if not additive:
+                    _update_status(db, episode, "completed")
                 logger.info("Episode %s: completed (no matches)", episode_id)
                 return
 
-            start_index = max(0, min(start_index, len(matches)))
             logger.info(
                 "Episode %s: enriching %s matches (starting at index %s)",
                 episode_id,
                 len(matches),
                 start_index,
             )
-            next_index = start_index
-            if start_index == 0:
+            unit_of, units = _plan_enrichment_units(episode.transcript_text, matches)
+            unit_results: dict[int, dict] = {}
+            if len(units) < len(matches):
+                logger.info(
+                    "Episode %s: merged %s matches into %s enrichment contexts",
+                    episode_id,
+                    len(matches),
+                    len(units),
+                )
+            if start_index == 0 and not additive:
                 db.query(Mention).filter(Mention.episode_id == episode.id).delete(synchronize_session=False)
                 db.commit()
 
+            if settings.ENRICHMENT_CONCURRENCY > 1 or settings.ENRICHMENT_BATCH_MAX_ITEMS > 1:
+                # Fetch LLM results concurrently and/or in batched prompts; the loop
+                # below still persists in match order and retries any unit that
+                # failed here on its own.
+                unit_results.update(
+                    _prefetch_unit_enrichments(db, episode, matches, start_index, unit_of, units)
+                )
+
             while next_index < len(matches):
                 match = matches[next_index]
                 keyword_id = uuid.UUID(match["keyword_id"])
@@ -236,7 +311,7 @@ def enrich_episode_mentions(self, detection_result: dict):
                         Mention.episode_id == episode.id,
                         Mention.keyword_id == keyword_id,
                         Mention.matched_text == match["matched_text"],
-                        Mention.transcript_segment == match["transcript_segment"],
+                        *_mention_position_filter(match),
                     )
                     .first()
                 )
@@ -244,16 +319,20 @@ def enrich_episode_mentions(self, detection_result: dict):
                     next_index += 1
                     continue
 
-                enrichment = enrich_mention(
-                    match["phrase"],
-                    match["transcript_segment"],
-                    raise_on_error=True,
-                )
+                unit = unit_of[next_index]
+                enrichment = unit_results.get(unit)
+                if enrichment is None:
+                    keyword, segment = units[unit]
+                    enrichment = enrich_mention(keyword, segment, raise_on_error=True)
+                    unit_results[unit] = enrichment
                 mention = Mention(
                     episode_id=episode.id,
                     keyword_id=keyword_id,
                     matched_text=match["matched_text"],
-                    transcript_segment=match["transcript_segment"],
+                    match_start=match.get("match_start"),
+                    match_end=match.get("match_end"),
+                    audio_seconds=match.get("audio_seconds"),
+                    transcript_segment=match.get("transcript_segment"),
                     sentiment=enrichment["sentiment"],
                     sentiment_score=enrichment["sentiment_score"],
                     context_summary=enrichment["context_summary"],
@@ -267,7 +346,8 @@ def enrich_episode_mentions(self, detection_result: dict):
                 db.commit()
                 next_index += 1
 
-            _update_status(db, episode, "completed")
+            if not additive:
+                _update_status(db, episode, "completed")
             logger.info("Episode %s: completed", episode_id)
 
         except Exception as exc:
@@ -277,7 +357,8 @@ def enrich_episode_mentions(self, detection_result: dict):
             retry_payload = _enrichment_retry_payload(detection_result, next_index)
             if retries_used >= max_retries:
                 logger.exception("Enrichment failed for episode %s (retries exhausted)", episode_id)
-                _mark_episode_failed(db, episode, exc)
+                if not additive:
+                    _mark_episode_failed(db, episode, exc)
                 raise
 
             logger.warning(
@@ -291,10 +372,143 @@ def enrich_episode_mentions(self, detection_result: dict):
             )
             self.retry(countdown=120, args=[retry_payload], exc=exc)
         finally:
-            if os.path.exists(audio_path):
+            # With a cache budget the file stays for reprocessing; the sweeper evicts it.
+            if settings.AUDIO_CACHE_MAX_BYTES <= 0 and os.path.exists(audio_path):
                 os.remove(audio_path)
 
 
+def attach_audio_times(db, episode_id, matches: list[KeywordMatch]) -> None:
+    """Fill each match's audio time from the episode's segment timings, if stored."""
+    if not matches:
+        return
+    segments = db.get(TranscriptSegments, episode_id)
+    if segments is None:
+        return
+    for match in matches:
+        match.audio_seconds = segments.audio_time_at(match.match_start)
+
+
+def detection_payload_for(episode_id: str, matches: list[KeywordMatch], replace_existing: bool = True) -> dict:
+    payload = {
+        "episode_id": episode_id,
+        "matches": [
+            {
+                "keyword_id": match.keyword_id,
+                "phrase": match.phrase,
+                "matched_text": match.matched_text,
+                "match_start": match.match_start,
+                "match_end": match.match_end,
+                "audio_seconds": match.audio_seconds,
+            }
+            for match in matches
+        ],
+    }
+    if not replace_existing:
+        payload["replace_existing"] = False
+    return payload
+
+
+def _prefetch_unit_enrichments(
+    db,
+    episode,
+    matches: list[dict],
+    start_index: int,
+    unit_of: list[int],
+    units: list[tuple[str, str]],
+) -> dict[int, dict]:
+    rows = db.query(
+        Mention.keyword_id,
+        Mention.matched_text,
+        Mention.match_start,
+        Mention.match_end,
+        Mention.stored_segment,
+    ).filter(Mention.episode_id == episode.id)
+    existing = {(str(row[0]), *row[1:]) for row in rows}
+    needed = sorted({
+        unit_of[i]
+        for i in range(start_index, len(matches))
+        if _mention_key(matches[i]) not in existing
+    })
+    if not needed:
+        return {}
+
+    logger.info(
+        "Episode %s: prefetching %s enrichments (concurrency %s, batch size up to %s)",
+        episode.id,
+        len(needed),
+        settings.ENRICHMENT_CONCURRENCY,
+        settings.ENRICHMENT_BATCH_MAX_ITEMS,
+    )
+    results = enrich_mentions_concurrently(
+        [units[unit] for unit in needed],
+        settings.ENRICHMENT_CONCURRENCY,
+        batch_max_items=settings.ENRICHMENT_BATCH_MAX_ITEMS,
+    )
+    return {unit: result for unit, result in zip(needed, results) if not isinstance(result, Exception)}
+
+
+def _mention_key(match: dict) -> tuple:
+    return (
+        match["keyword_id"],
+        match["matched_text"],
+        match.get("match_start"),
+        match.get("match_end"),
+        match.get("transcript_segment"),
+    )
+
+
+def _plan_enrichment_units(transcript: str | None, matches: list[dict]) -> tuple[list[int], list[tuple[str, str]]]:
+    """Merge matches with overlapping context windows into shared enrichment units.
+
+    Returns the unit index for every match and the (keyword, segment) prompt
+    input of every unit. The plan only depends on the payload, so a retry
+    resuming at ``start_index`` rebuilds the same units.
+    """
+    if settings.ENRICHMENT_CLUSTER_MATCHES and transcript is not None:
+        spans = [
+            (
+                "" if settings.ENRICHMENT_CLUSTER_ACROSS_KEYWORDS else match["keyword_id"],
+                match.get("match_start"),
+                match.get("match_end"),
+            )
+            for match in matches
+        ]
+        clusters = cluster_match_windows(spans, settings.ENRICHMENT_CLUSTER_MAX_CHARS)
+    else:
+        clusters = [[i] for i in range(len(matches))]
+
+    unit_of = [0] * len(matches)
+    units = []
+    for unit, members in enumerate(clusters):
+        for i in members:
+            unit_of[i] = unit
+        if len(members) == 1:
+            match = matches[members[0]]
+            units.append((match["phrase"], _match_segment(transcript, match)))
+            continue
+        phrases = list(dict.fromkeys(matches[i]["phrase"] for i in members))
+        segment = extract_segment(
+            transcript,
+            min(matches[i]["match_start"] for i in members),
+            max(matches[i]["match_end"] for i in members),
+        )
+        units.append((", ".join(phrases), segment))
+    return unit_of, units
+
+
+def _match_segment(transcript: str | None, match: dict) -> str:
+    """Context segment for a payload match; older payloads carry the text itself."""
+    if "transcript_segment" in match:
+        return match["transcript_segment"]
+    return extract_segment(transcript or "", match["match_start"], match["match_end"])
+
+
+def _mention_position_filter(match: dict) -> tuple:
+    if "transcript_segment" in match:
+        return (Mention.stored_segment == match["transcript_segment"],)
+    return (Mention.match_start == match["match_start"], Mention.match_end == match["match_end"])
+
+
 def _update_status(db, episode, status):
     episode.status = status
     db.commit()
@@ -310,6 +524,92 @@ def _audio_path(episode_id: str) -> str:
     return os.path.join(settings.AUDIO_DIR, f"{episode_id}.mp3")
 
 
+def _reuse_duplicate_transcript(db, episode) -> bool:
+    """Copy the transcript of an episode with byte-identical audio, skipping Whisper.
+
+    Feeds often republish the same file under a new GUID (reruns, cross-posts
+    between shows), so the audio hash from the download is checked first.
+    """
+    if not episode.audio_sha256:
+        return False
+    donor = (
+        db.query(Episode)
+        .filter(
+            Episode.audio_sha256 == episode.audio_sha256,
+            Episode.id != episode.id,
+            Episode.transcript_text.isnot(None),
+        )
+        .order_by(Episode.created_at)
+        .first()
+    )
+    if donor is None:
+        return False
+
+    _clear_episode_mentions(db, episode)
+    episode.transcript_text = donor.transcript_text
+    episode.silence_trimmed_seconds = donor.silence_trimmed_seconds
+    donor_segments = db.get(TranscriptSegments, donor.id)
+    if donor_segments is not None:
+        _store_transcript_segments(db, episode, donor_segments)
+    else:
+        _clear_transcript_segments(db, episode)
+    db.commit()
+    logger.info("Episode %s: reused transcript of episode %s (identical audio)", episode.id, donor.id)
+    return True
+
+
+def _store_transcript_segments(db, episode, timed) -> None:
+    segments = db.get(TranscriptSegments, episode.id)
+    if segments is None:
+        segments = TranscriptSegments(episode_id=episode.id)
+        db.add(segments)
+    segments.starts = timed.starts
+    segments.ends = timed.ends
+    segments.offsets = timed.offsets
+
+
+def _clear_transcript_segments(db, episode) -> None:
+    """Drop timings of a previous transcript so audio times never point into the wrong text."""
+    segments = db.get(TranscriptSegments, episode.id)
+    if segments is not None:
+        db.delete(segments)
+
+
+def _clear_episode_mentions(db, episode) -> None:
+    """Drop mentions of a previous transcript; their offsets would slice the new text."""
+    db.query(Mention).filter(Mention.episode_id == episode.id).delete(synchronize_session=False)
+
+
+def _trim_silence(episode_id: str, audio_path: str) -> TrimResult | None:
+    """Cut silent spans before transcription when TRANSCRIPTION_VAD_ENABLED is set.
+
+    Trimming only saves cost, so any failure falls back to the original audio.
+    """
+    if not settings.TRANSCRIPTION_VAD_ENABLED:
+        return None
+
+    trimmed_path = os.path.join(settings.AUDIO_DIR, f"{episode_id}.trimmed.mp3")
+    try:
+        trim = trim_silence(audio_path, trimmed_path)
+    except Exception:
+        logger.warning("Episode %s: silence trimming failed; transcribing full audio", episode_id, exc_info=True)
+        if os.path.exists(trimmed_path):
+            os.remove(trimmed_path)
+        return None
+
+    if trim is None:
+        logger.info("Episode %s: not enough silence to trim", episode_id)
+        return None
+    logger.info(
+        "Episode %s: trimmed %.1fs of silence (%.1fs -> %.1fs)",
+        episode_id,
+        trim.seconds_saved,
+        trim.original_seconds,
+        trim.original_seconds - trim.seconds_saved,
+    )
+    return trim
+
+
 def _enrichment_retry_payload(detection_result: dict, start_index: int) -> dict:
     payload = dict(detection_result)
     payload["start_index"] = max(0, int(start_index))
@@ -317,29 +617,8 @@ def _enrichment_retry_payload(detection_result: dict, start_index: int) -> dict:
 
 
 def _download_audio(audio_url: str, episode_id: str) -> str:
-    """Stream download audio to disk."""
-    os.makedirs(settings.AUDIO_DIR, exist_ok=True)
-    audio_path = _audio_path(episode_id)
-    started_at = time.monotonic()
-    bytes_written = 0
-
-    timeout = httpx.Timeout(connect=20.0, read=30.0, write=30.0, pool=20.0)
-    with httpx.stream("GET", audio_url, follow_redirects=True, timeout=timeout) as resp:
-        resp.raise_for_status()
-        with open(audio_path, "wb") as f:
-            for chunk in resp.iter_bytes(chunk_size=8192):
-                f.write(chunk)
-                bytes_written += len(chunk)
-                if bytes_written > settings.AUDIO_DOWNLOAD_MAX_BYTES:
-                    raise RuntimeError(
-                        f"Audio exceeds max size ({settings.AUDIO_DOWNLOAD_MAX_BYTES} bytes)"
-                    )
-                if time.monotonic() - started_at > settings.AUDIO_DOWNLOAD_TIMEOUT_SECONDS:
-                    raise RuntimeError(
-                        f"Audio download exceeded {settings.AUDIO_DOWNLOAD_TIMEOUT_SECONDS} seconds"
-                    )
-
-    return audio_path
+    """Download episode audio to disk and return its SHA-256 hex digest."""
+    return download_audio(audio_url, _audio_path(episode_id))
 
 
 def _transcription_retry_countdown(exc: Exception, retries_used: int) -> int:
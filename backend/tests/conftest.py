@@ -5,7 +5,9 @@ from datetime import datetime, timezone
 import pytest
 import pytest_asyncio
 from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker
 from httpx import ASGITransport, AsyncClient
 
@@ -21,6 +23,14 @@ os.environ["REDIS_URL"] = "redis://localhost:6379/15"
 os.environ["WHISPER_API_URL"] = "http://localhost:9000"
 os.environ["OLLAMA_BASE_URL"] = "http://localhost:11434"
 
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    """Let the Postgres-only JSONB columns (mentions.topics) be created on SQLite."""
+    return "JSON"
+
+
 test_async_engine = create_async_engine(TEST_DB_URL, echo=False)
 TestAsyncSession = async_sessionmaker(test_async_engine, expire_on_commit=False)
 
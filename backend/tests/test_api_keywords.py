@@ -1,5 +1,6 @@
 """Tests for keyword API endpoints."""
 import pytest
+from unittest.mock import patch
 from httpx import AsyncClient
 
 
@@ -88,3 +89,11 @@ async def test_delete_keyword_not_found(client: AsyncClient):
         "/api/v1/keywords/00000000-0000-0000-0000-000000000000"
     )
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+@patch("app.worker.tasks.backfill.backfill_keyword.delay")
+async def test_create_keyword_queues_backfill(mock_delay, client: AsyncClient):
+    resp = await client.post("/api/v1/keywords", json={"phrase": "Acme Corp"})
+    assert resp.status_code == 201
+    mock_delay.assert_called_once_with(resp.json()["id"])
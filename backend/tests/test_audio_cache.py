@@ -0,0 +1,96 @@
+"""Tests for the bounded on-disk audio cache."""
+import hashlib
+import os
+
+import pytest
+
+from app.services import audio_cache
+
+
+@pytest.fixture
+def audio_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr("app.services.audio_cache.settings.AUDIO_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        "app.services.audio_cache.settings.TRANSCRIPTION_CHECKPOINT_DIR", str(tmp_path / "checkpoints")
+    )
+    return tmp_path
+
+
+def _write(audio_dir, name: str, size: int, mtime: float) -> str:
+    path = audio_dir / name
+    path.write_bytes(b"a" * size)
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_evicts_least_recently_used_until_within_budget(audio_dir, monkeypatch):
+    monkeypatch.setattr("app.services.audio_cache.settings.AUDIO_CACHE_MAX_BYTES", 250)
+    _write(audio_dir, "old.mp3", 100, 1000)
+    _write(audio_dir, "busy.mp3", 100, 1500)
+    _write(audio_dir, "mid.mp3", 100, 2000)
+    _write(audio_dir, "new.mp3", 100, 3000)
+
+    freed = audio_cache.evict(protected={"busy"})
+
+    assert freed == 200
+    assert sorted(os.listdir(audio_dir)) == ["busy.mp3", "new.mp3"]
+
+
+def test_touch_moves_file_to_most_recent(audio_dir, monkeypatch):
+    monkeypatch.setattr("app.services.audio_cache.settings.AUDIO_CACHE_MAX_BYTES", 100)
+    old = _write(audio_dir, "old.mp3", 100, 1000)
+    _write(audio_dir, "new.mp3", 100, 3000)
+
+    audio_cache.touch(old)
+    audio_cache.evict(protected=set())
+
+    assert os.listdir(audio_dir) == ["old.mp3"]
+
+
+def test_disk_pressure_evicts_below_budget(audio_dir, monkeypatch):
+    monkeypatch.setattr("app.services.audio_cache.settings.AUDIO_CACHE_MAX_BYTES", 10_000)
+    _write(audio_dir, "a.mp3", 100, 1000)
+    _write(audio_dir, "b.mp3", 100, 2000)
+    pressure = iter([True, False])
+
+    audio_cache.evict(protected=set(), under_pressure=lambda: next(pressure))
+
+    assert os.listdir(audio_dir) == ["b.mp3"]
+
+
+def test_wait_for_space_gives_up_when_nothing_can_be_evicted(audio_dir, monkeypatch):
+    monkeypatch.setattr("app.services.audio_cache.settings.AUDIO_CACHE_SPACE_WAIT_SECONDS", 0)
+    monkeypatch.setattr("app.services.audio_cache.disk_above_high_water", lambda: True)
+    _write(audio_dir, "busy.mp3", 100, 1000)
+
+    with pytest.raises(RuntimeError, match="above"):
+        audio_cache.wait_for_space(lambda: {"busy"})
+    assert os.listdir(audio_dir) == ["busy.mp3"]
+
+
+def test_sweep_removes_orphans_and_stale_scratch_files(audio_dir, monkeypatch):
+    monkeypatch.setattr("app.services.audio_cache.settings.AUDIO_CACHE_ORPHAN_MAX_AGE_SECONDS", 3600)
+    _write(audio_dir, "deleted.mp3", 10, 4_000_000_000)
+    _write(audio_dir, "kept.mp3", 10, 1000)
+    _write(audio_dir, "stale.mp3.part", 10, 1000)
+    _write(audio_dir, "busy.mp3.part", 10, 1000)
+    _write(audio_dir, "fresh.mp3.part", 10, 4_000_000_000)
+    checkpoint = audio_dir / "checkpoints" / "abc-123"
+    checkpoint.mkdir(parents=True)
+    os.utime(checkpoint, (1000, 1000))
+
+    removed = audio_cache.sweep_orphans(orphaned={"deleted"}, protected={"busy"})
+
+    assert removed == 3
+    assert sorted(os.listdir(audio_dir)) == ["busy.mp3.part", "checkpoints", "fresh.mp3.part", "kept.mp3"]
+    assert os.listdir(audio_dir / "checkpoints") == []
+
+
+def test_verify_cached_audio_checks_recorded_hash(audio_dir):
+    path = _write(audio_dir, "ep.mp3", 10, 1000)
+    digest = hashlib.sha256(b"a" * 10).hexdigest()
+
+    assert audio_cache.verify_cached_audio(path, digest)
+    assert not audio_cache.verify_cached_audio(path, "0" * 64)
+    assert not audio_cache.verify_cached_audio(path, None)
+    assert not audio_cache.verify_cached_audio(str(audio_dir / "missing.mp3"), digest)
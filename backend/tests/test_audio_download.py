@@ -0,0 +1,176 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+
+import httpx
+import pytest
+
+from app.services.audio_download import download_audio
+
+BODY = bytes(range(256)) * 400
+
+
+class _FakeStreamResponse:
+    def __init__(self, body: bytes, status_code: int = 200, headers: dict | None = None, fail_after: int | None = None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.fail_after = fail_after
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            request = httpx.Request("GET", "https://cdn.example.com/ep.mp3")
+            response = httpx.Response(self.status_code, request=request)
+            raise httpx.HTTPStatusError("error", request=request, response=response)
+
+    def iter_bytes(self, chunk_size: int = 8192):
+        for start in range(0, len(self.body), chunk_size):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise httpx.ReadTimeout("stalled")
+            yield self.body[start:start + chunk_size]
+
+
+class _FakeCdn:
+    """Serves BODY, honouring Range/If-Range the way a CDN would."""
+
+    def __init__(self, etag: str | None = '"v1"', honour_ranges: bool = True, fail_after: int | None = None):
+        self.etag = etag
+        self.honour_ranges = honour_ranges
+        self.fail_after = fail_after
+        self.requests = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stream(self, method, url, headers=None, **kwargs):
+        headers = headers or {}
+        with self._lock:
+            self.requests.append(headers)
+            fail_after, self.fail_after = self.fail_after, None
+        response_headers = {"ETag": self.etag} if self.etag else {}
+
+        range_header = headers.get("Range")
+        if_range = headers.get("If-Range")
+        if range_header and self.honour_ranges and if_range in (None, self.etag):
+            start, _, end = range_header.split("=")[1].partition("-")
+            start, end = int(start), int(end or len(BODY) - 1)
+            response_headers["Content-Range"] = f"bytes {start}-{end}/{len(BODY)}"
+            yield _FakeStreamResponse(BODY[start:end + 1], 206, response_headers, fail_after)
+        else:
+            yield _FakeStreamResponse(BODY, 200, response_headers, fail_after)
+
+
+@pytest.fixture
+def audio_path(tmp_path):
+    return str(tmp_path / "ep-1.mp3")
+
+
+def _use(monkeypatch, cdn):
+    monkeypatch.setattr("app.services.audio_download.get_http_client", lambda purpose, url, http2=True: cdn)
+
+
+def test_download_renames_part_file_and_returns_sha256(monkeypatch, audio_path):
+    _use(monkeypatch, _FakeCdn())
+
+    digest = download_audio("https://cdn.example.com/ep.mp3", audio_path)
+
+    assert digest == hashlib.sha256(BODY).hexdigest()
+    assert open(audio_path, "rb").read() == BODY
+    assert sorted(os.listdir(os.path.dirname(audio_path))) == ["ep-1.mp3"]
+
+
+def test_interrupted_download_resumes_with_if_range(monkeypatch, audio_path):
+    cdn = _FakeCdn(fail_after=40960)
+    _use(monkeypatch, cdn)
+    with pytest.raises(httpx.ReadTimeout):
+        download_audio("https://cdn.example.com/ep.mp3", audio_path)
+    assert not os.path.exists(audio_path)
+    assert os.path.getsize(f"{audio_path}.part") == 40960
+
+    digest = download_audio("https://cdn.example.com/ep.mp3", audio_path)
+
+    assert cdn.requests[-1] == {"Range": "bytes=40960-", "If-Range": '"v1"'}
+    assert digest == hashlib.sha256(BODY).hexdigest()
+    assert open(audio_path, "rb").read() == BODY
+
+
+def test_server_ignoring_range_restarts_cleanly(monkeypatch, audio_path):
+    cdn = _FakeCdn(honour_ranges=False, fail_after=40960)
+    _use(monkeypatch, cdn)
+    with pytest.raises(httpx.ReadTimeout):
+        download_audio("https://cdn.example.com/ep.mp3", audio_path)
+
+    digest = download_audio("https://cdn.example.com/ep.mp3", audio_path)
+
+    assert cdn.requests[-1]["Range"] == "bytes=40960-"
+    assert digest == hashlib.sha256(BODY).hexdigest()
+    assert open(audio_path, "rb").read() == BODY
+
+
+def test_partial_without_validator_is_not_resumed(monkeypatch, audio_path):
+    cdn = _FakeCdn(etag=None, fail_after=40960)
+    _use(monkeypatch, cdn)
+    with pytest.raises(httpx.ReadTimeout):
+        download_audio("https://cdn.example.com/ep.mp3", audio_path)
+
+    download_audio("https://cdn.example.com/ep.mp3", audio_path)
+
+    assert cdn.requests[-1] == {}
+    assert open(audio_path, "rb").read() == BODY
+
+
+@pytest.fixture
+def segmented(monkeypatch):
+    monkeypatch.setattr("app.services.audio_download.settings.AUDIO_DOWNLOAD_SEGMENTS", 4)
+    monkeypatch.setattr("app.services.audio_download.settings.AUDIO_DOWNLOAD_SEGMENT_MIN_BYTES", 10000)
+
+
+def test_segmented_download_fetches_ranges_in_parallel(monkeypatch, audio_path, segmented):
+    cdn = _FakeCdn()
+    _use(monkeypatch, cdn)
+
+    digest = download_audio("https://cdn.example.com/ep.mp3", audio_path)
+
+    assert digest == hashlib.sha256(BODY).hexdigest()
+    assert open(audio_path, "rb").read() == BODY
+    ranges = sorted(request["Range"] for request in cdn.requests[1:])
+    assert ranges == ["bytes=0-25599", "bytes=25600-51199", "bytes=51200-76799", "bytes=76800-102399"]
+    assert all(request["If-Range"] == '"v1"' for request in cdn.requests[1:])
+
+
+def test_segmented_download_falls_back_without_range_support(monkeypatch, audio_path, segmented):
+    cdn = _FakeCdn(honour_ranges=False)
+    _use(monkeypatch, cdn)
+
+    digest = download_audio("https://cdn.example.com/ep.mp3", audio_path)
+
+    assert digest == hashlib.sha256(BODY).hexdigest()
+    assert len(cdn.requests) == 2
+
+
+def test_segmented_download_enforces_max_bytes(monkeypatch, audio_path, segmented):
+    monkeypatch.setattr("app.services.audio_download.settings.AUDIO_DOWNLOAD_MAX_BYTES", 50000)
+    _use(monkeypatch, _FakeCdn())
+
+    with pytest.raises(RuntimeError, match="max size"):
+        download_audio("https://cdn.example.com/ep.mp3", audio_path)
+    assert os.listdir(os.path.dirname(audio_path)) == []
+
+
+def test_failed_segment_discards_partial_file(monkeypatch, audio_path, segmented):
+    cdn = _FakeCdn()
+    original_stream = cdn.stream
+
+    @contextmanager
+    def _stream(method, url, headers=None, **kwargs):
+        with original_stream(method, url, headers=headers, **kwargs) as resp:
+            if headers and headers.get("Range") == "bytes=25600-51199":
+                resp.fail_after = 0
+            yield resp
+
+    cdn.stream = _stream
+    _use(monkeypatch, cdn)
+
+    with pytest.raises(httpx.ReadTimeout):
+        download_audio("https://cdn.example.com/ep.mp3", audio_path)
+    assert os.listdir(os.path.dirname(audio_path)) == []
@@ -1,5 +1,10 @@
 """Tests for keyword detection service."""
-from app.services.detection_service import detect_keywords, _extract_segment
+from app.services.detection_service import (
+    PhraseAutomaton,
+    cluster_match_windows,
+    detect_keywords,
+    extract_segment,
+)
 
 
 SAMPLE_TRANSCRIPT = (
@@ -71,25 +76,89 @@ class TestDetectKeywordsRegex:
         assert len(matches) == 0
 
 
+class TestDetectKeywordsEngines:
+    KEYWORDS = [
+        {"id": "1", "phrase": "Acme Corp", "match_type": "contains"},
+        {"id": "2", "phrase": "acme", "match_type": "exact_word"},
+        {"id": "3", "phrase": "BetaCo", "match_type": "exact_word"},
+        {"id": "4", "phrase": r"work\w+", "match_type": "regex"},
+        {"id": "5", "phrase": "a", "match_type": "contains"},
+    ]
+
+    def test_automaton_matches_legacy(self):
+        automaton = detect_keywords(SAMPLE_TRANSCRIPT, self.KEYWORDS, engine="automaton")
+        legacy = detect_keywords(SAMPLE_TRANSCRIPT, self.KEYWORDS, engine="legacy")
+        assert automaton == legacy
+
+    def test_automaton_contains_is_non_overlapping(self):
+        keywords = [{"id": "1", "phrase": "aa", "match_type": "contains"}]
+        matches = detect_keywords("aaaaa", keywords, engine="automaton")
+        assert len(matches) == 2
+
+    def test_automaton_exact_word_checks_boundaries(self):
+        text = "-game- gaming endgame game_over game"
+        keywords = [{"id": "1", "phrase": "game", "match_type": "exact_word"}]
+        automaton = detect_keywords(text, keywords, engine="automaton")
+        assert [m.matched_text for m in automaton] == ["game", "game"]
+        assert automaton == detect_keywords(text, keywords, engine="legacy")
+
+    def test_automaton_falls_back_on_casefold_mismatch(self):
+        text = "The \u017fcale of scale"
+        keywords = [{"id": "1", "phrase": "scale", "match_type": "exact_word"}]
+        automaton = detect_keywords(text, keywords, engine="automaton")
+        assert automaton == detect_keywords(text, keywords, engine="legacy")
+
+    def test_unknown_engine_raises(self):
+        import pytest
+
+        with pytest.raises(ValueError):
+            detect_keywords("text", [], engine="fuzzy")
+
+
+class TestPhraseAutomaton:
+    def test_finds_overlapping_and_nested_phrases(self):
+        automaton = PhraseAutomaton(["he", "she", "his", "hers"])
+        positions = automaton.find_all("ushers")
+        assert positions == [[2], [1], [], [2]]
+
+
+class TestClusterMatchWindows:
+    def test_merges_overlapping_windows_for_same_key(self):
+        spans = [("a", 0, 5), ("a", 100, 105), ("a", 2000, 2005)]
+        assert cluster_match_windows(spans, max_span_chars=1500) == [[0, 1], [2]]
+
+    def test_keeps_different_keys_apart(self):
+        spans = [("a", 0, 5), ("b", 10, 15)]
+        assert cluster_match_windows(spans, max_span_chars=1500) == [[0], [1]]
+
+    def test_respects_max_span(self):
+        spans = [("a", 0, 5), ("a", 500, 505), ("a", 1000, 1005)]
+        assert cluster_match_windows(spans, max_span_chars=600) == [[0, 1], [2]]
+
+    def test_matches_without_offsets_stay_alone(self):
+        spans = [("a", None, None), ("a", 0, 5), ("a", 10, 15)]
+        assert cluster_match_windows(spans, max_span_chars=1500) == [[0], [1, 2]]
+
+
 class TestExtractSegment:
     def test_short_text_returns_full(self):
         text = "Hello world"
-        segment = _extract_segment(text, 0, 5)
+        segment = extract_segment(text, 0, 5)
         assert segment == "Hello world"
 
     def test_long_text_adds_ellipsis(self):
         text = "a" * 1000
-        segment = _extract_segment(text, 500, 505)
+        segment = extract_segment(text, 500, 505)
         assert segment.startswith("...")
         assert segment.endswith("...")
 
     def test_start_of_text_no_prefix_ellipsis(self):
         text = "a" * 1000
-        segment = _extract_segment(text, 0, 5)
+        segment = extract_segment(text, 0, 5)
         assert not segment.startswith("...")
         assert segment.endswith("...")
 
     def test_segment_includes_match(self):
         text = "x" * 400 + "MATCH" + "y" * 400
-        segment = _extract_segment(text, 400, 405)
+        segment = extract_segment(text, 400, 405)
         assert "MATCH" in segment
@@ -2,7 +2,8 @@
 import json
 from unittest.mock import patch, MagicMock
 
-from app.services import enrichment_service
+from app.services import enrichment_cache, enrichment_service
+from app.services.enrichment_cache import LocalEnrichmentCache
 from app.services.enrichment_service import enrich_mention, _validate_enrichment, _default_enrichment
 
 
@@ -56,8 +57,12 @@ class TestDefaultEnrichment:
 class TestEnrichMention:
     def setup_method(self):
         enrichment_service._NEXT_ALLOWED_TS = 0.0
+        enrichment_cache.set_enrichment_cache(LocalEnrichmentCache(max_entries=0, ttl_seconds=60))
 
-    @patch("app.services.enrichment_service.httpx.post")
+    def teardown_method(self):
+        enrichment_cache.set_enrichment_cache(None)
+
+    @patch("app.services.enrichment_service.httpx.Client.post")
     def test_successful_enrichment(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -80,7 +85,7 @@ class TestEnrichMention:
         assert result["sentiment"] == "positive"
         assert result["is_recommendation"] is True
 
-    @patch("app.services.enrichment_service.httpx.post")
+    @patch("app.services.enrichment_service.httpx.Client.post")
     def test_failed_enrichment_returns_default(self, mock_post):
         mock_post.side_effect = Exception("Connection refused")
 
@@ -88,7 +93,7 @@ class TestEnrichMention:
         assert result["sentiment"] == "neutral"
         assert result["context_summary"] == "Enrichment unavailable"
 
-    @patch("app.services.enrichment_service.httpx.post")
+    @patch("app.services.enrichment_service.httpx.Client.post")
     def test_failed_enrichment_raises_in_strict_mode(self, mock_post):
         mock_post.side_effect = Exception("Connection refused")
 
@@ -97,7 +102,7 @@ class TestEnrichMention:
         with pytest.raises(Exception, match="Connection refused"):
             enrich_mention("Acme Corp", "some text", raise_on_error=True)
 
-    @patch("app.services.enrichment_service.httpx.post")
+    @patch("app.services.enrichment_service.httpx.Client.post")
     def test_invalid_json_returns_default(self, mock_post):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -109,7 +114,7 @@ class TestEnrichMention:
         result = enrich_mention("Acme Corp", "some text")
         assert result["sentiment"] == "neutral"
 
-    @patch("app.services.enrichment_service.httpx.post")
+    @patch("app.services.enrichment_service.httpx.Client.post")
     def test_openrouter_enrichment(self, mock_post):
         from app.config import settings
 
@@ -145,7 +150,7 @@ class TestEnrichMention:
             settings.LLM_PROVIDER = old_provider
             settings.OPENROUTER_API_KEY = old_key
 
-    @patch("app.services.enrichment_service.httpx.post")
+    @patch("app.services.enrichment_service.httpx.Client.post")
     def test_openrouter_base_url_variants(self, mock_post):
         from app.config import settings
 
@@ -183,7 +188,7 @@ class TestEnrichMention:
             settings.OPENROUTER_BASE_URL = old_base
 
     @patch("app.services.enrichment_service.time.sleep")
-    @patch("app.services.enrichment_service.httpx.post")
+    @patch("app.services.enrichment_service.httpx.Client.post")
     def test_retries_429_then_succeeds(self, mock_post, mock_sleep):
         from app.config import settings
 
@@ -219,7 +224,7 @@ class TestEnrichMention:
 
     @patch("app.services.enrichment_service.time.sleep")
     @patch("app.services.enrichment_service.time.monotonic")
-    @patch("app.services.enrichment_service.httpx.post")
+    @patch("app.services.enrichment_service.httpx.Client.post")
     def test_rate_limit_applies_between_chat_and_fallback(self, mock_post, mock_monotonic, mock_sleep):
         from app.config import settings
 
@@ -250,3 +255,169 @@ class TestEnrichMention:
             assert abs(waited - 0.15) < 1e-6
         finally:
             settings.LLM_ENRICH_MIN_INTERVAL_SECONDS = old_min_interval
+
+
+class TestEnrichMentionsConcurrently:
+    def setup_method(self):
+        enrichment_service._NEXT_ALLOWED_TS = 0.0
+        enrichment_cache.set_enrichment_cache(LocalEnrichmentCache(max_entries=0, ttl_seconds=60))
+
+    def teardown_method(self):
+        enrichment_cache.set_enrichment_cache(None)
+
+    def test_returns_results_in_order_with_failures(self, monkeypatch):
+        import httpx
+
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            import asyncio
+
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            prompt = json.loads(request.content)["messages"][0]["content"]
+            if "broken" in prompt:
+                return httpx.Response(400, request=request)
+            sentiment = "positive" if "love" in prompt else "negative"
+            return httpx.Response(
+                200,
+                json={"message": {"content": json.dumps({"sentiment": sentiment})}},
+                request=request,
+            )
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            "app.services.enrichment_service.httpx.AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+
+        items = [
+            ("Acme", "I love Acme"),
+            ("Acme", "broken segment"),
+            ("Acme", "I hate Acme"),
+            ("Acme", "I love Acme too"),
+        ]
+        results = enrichment_service.enrich_mentions_concurrently(items, concurrency=2)
+
+        assert results[0]["sentiment"] == "positive"
+        assert isinstance(results[1], httpx.HTTPStatusError)
+        assert results[2]["sentiment"] == "negative"
+        assert results[3]["sentiment"] == "positive"
+        assert peak == 2
+
+    def test_reserve_rate_limit_slot_spaces_requests(self, monkeypatch):
+        monkeypatch.setattr("app.services.enrichment_service.settings.LLM_ENRICH_MIN_INTERVAL_SECONDS", 0.5)
+        monkeypatch.setattr("app.services.enrichment_service.time.monotonic", lambda: 100.0)
+        waits = [enrichment_service._reserve_rate_limit_slot() for _ in range(3)]
+        assert waits == [0.0, 0.5, 1.0]
+
+
+class TestEnrichmentCache:
+    def setup_method(self):
+        enrichment_service._NEXT_ALLOWED_TS = 0.0
+        self.cache = LocalEnrichmentCache(max_entries=2, ttl_seconds=60)
+        enrichment_cache.set_enrichment_cache(self.cache)
+
+    def teardown_method(self):
+        enrichment_cache.set_enrichment_cache(None)
+
+    @patch("app.services.enrichment_service.httpx.Client.post")
+    def test_repeated_segment_skips_llm(self, mock_post):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "message": {"content": json.dumps({"sentiment": "positive"})}
+        }
+        mock_post.return_value = mock_response
+
+        first = enrich_mention("Acme Corp", "I love Acme Corp")
+        second = enrich_mention("Acme Corp", "I love Acme Corp")
+
+        assert first == second
+        assert mock_post.call_count == 1
+        assert self.cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    @patch("app.services.enrichment_service.httpx.Client.post")
+    def test_failures_are_not_cached(self, mock_post):
+        mock_post.side_effect = Exception("Connection refused")
+
+        enrich_mention("Acme Corp", "some text")
+        enrich_mention("Acme Corp", "some text")
+
+        assert mock_post.call_count == 2
+        assert self.cache.stats()["entries"] == 0
+
+    def test_key_depends_on_model_and_prompt_version(self):
+        base = enrichment_cache.enrichment_cache_key("Acme", "text", "ollama:a", "v1")
+        assert base == enrichment_cache.enrichment_cache_key("Acme", "text", "ollama:a", "v1")
+        assert base != enrichment_cache.enrichment_cache_key("Acme", "text", "ollama:b", "v1")
+        assert base != enrichment_cache.enrichment_cache_key("Acme", "text", "ollama:a", "v2")
+
+    def test_lru_eviction(self):
+        self.cache.set("a", {"sentiment": "a"})
+        self.cache.set("b", {"sentiment": "b"})
+        self.cache.get("a")
+        self.cache.set("c", {"sentiment": "c"})
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") == {"sentiment": "a"}
+
+
+class TestBatchedEnrichment:
+    def setup_method(self):
+        enrichment_service._NEXT_ALLOWED_TS = 0.0
+        enrichment_cache.set_enrichment_cache(LocalEnrichmentCache(max_entries=0, ttl_seconds=60))
+
+    def teardown_method(self):
+        enrichment_cache.set_enrichment_cache(None)
+
+    def test_packs_segments_and_falls_back_for_bad_items(self, monkeypatch):
+        import httpx
+
+        prompts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            prompt = json.loads(request.content)["messages"][0]["content"]
+            prompts.append(prompt)
+            if prompt.startswith("Analyze each of the"):
+                # Segment 2 comes back without a usable score.
+                content = {"results": [
+                    {"index": 1, "sentiment": "positive"},
+                    {"index": 2, "sentiment_score": "not a number"},
+                    {"index": 3, "sentiment": "negative"},
+                ]}
+            else:
+                content = {"sentiment": "mixed"}
+            return httpx.Response(200, json={"message": {"content": json.dumps(content)}}, request=request)
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            "app.services.enrichment_service.httpx.AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+
+        items = [("Acme", "one"), ("Acme", "two"), ("Beta", "three")]
+        results = enrichment_service.enrich_mentions_concurrently(items, concurrency=1, batch_max_items=5)
+
+        assert [r["sentiment"] for r in results] == ["positive", "mixed", "negative"]
+        assert len(prompts) == 2
+        assert 'Segment 3 (keyword "Beta")' in prompts[0]
+
+    def test_batches_respect_token_budget(self, monkeypatch):
+        monkeypatch.setattr("app.services.enrichment_service.settings.ENRICHMENT_BATCH_PROMPT_TOKENS", 500)
+        items = [("Acme", "x" * 600)] * 5
+        batches = enrichment_service._pack_batches(items, list(range(5)), batch_max_items=10)
+        assert all(len(batch) <= 2 for batch in batches)
+        assert sum(len(batch) for batch in batches) == 5
+
+    def test_parse_batch_accepts_top_level_array(self):
+        parsed = enrichment_service._parse_batch_enrichment(
+            json.dumps([{"sentiment": "positive"}, {"sentiment": "negative"}]),
+            expected=3,
+        )
+        assert parsed[0]["sentiment"] == "positive"
+        assert parsed[1]["sentiment"] == "negative"
+        assert parsed[2] is None
@@ -0,0 +1,65 @@
+"""Tests for the adaptive feed polling schedule."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.feed_schedule import next_poll_at, poll_interval_seconds
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def schedule_settings(monkeypatch):
+    for name, value in {
+        "FEED_POLL_MIN_SECONDS": 300,
+        "FEED_POLL_MAX_SECONDS": 43200,
+        "FEED_POLL_DEFAULT_SECONDS": 900,
+        "FEED_POLL_INTERVAL_FRACTION": 0.1,
+        "FEED_POLL_JITTER": 0.1,
+    }.items():
+        monkeypatch.setattr(f"app.services.feed_schedule.settings.{name}", value)
+
+
+def _every(gap: timedelta, count: int, last: datetime = NOW):
+    return [last - gap * index for index in range(count)]
+
+
+def test_feed_without_history_uses_default_interval():
+    assert poll_interval_seconds([], NOW) == 900
+    assert poll_interval_seconds([NOW - timedelta(days=3)], NOW) == 900
+
+
+def test_interval_follows_median_publish_gap():
+    daily = _every(timedelta(days=1), 10)
+
+    assert poll_interval_seconds(daily, NOW) == pytest.approx(8640)
+
+
+def test_interval_is_clamped_to_bounds():
+    half_hourly = _every(timedelta(minutes=30), 10)
+    weekly = _every(timedelta(weeks=1), 10)
+
+    assert poll_interval_seconds(half_hourly, NOW) == 300
+    assert poll_interval_seconds(weekly, NOW) == 43200
+
+
+def test_dormant_feed_backs_off():
+    # Published daily, but nothing for the last 30 days.
+    stale = _every(timedelta(days=1), 10, last=NOW - timedelta(days=30))
+
+    assert poll_interval_seconds(stale, NOW) == 43200
+
+
+def test_naive_database_datetimes_are_treated_as_utc():
+    naive = [value.replace(tzinfo=None) for value in _every(timedelta(days=1), 5)]
+
+    assert poll_interval_seconds(naive, NOW) == pytest.approx(8640)
+
+
+def test_next_poll_at_is_jittered_within_bounds():
+    daily = _every(timedelta(days=1), 10)
+
+    times = {next_poll_at(daily, NOW) for _ in range(20)}
+
+    assert len(times) > 1
+    assert all(NOW + timedelta(seconds=7776) <= value <= NOW + timedelta(seconds=9504) for value in times)
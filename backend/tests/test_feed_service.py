@@ -1,6 +1,16 @@
 """Tests for feed parsing service."""
+import hashlib
 from unittest.mock import patch, MagicMock
-from app.services.feed_service import parse_feed
+
+import httpx
+
+from app.services.feed_service import (
+    fetch_feed,
+    fetch_feeds_concurrently,
+    parse_feed,
+    parse_feed_content,
+    parse_feed_streaming,
+)
 
 
 MOCK_RSS_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
@@ -91,3 +101,146 @@ def test_parse_feed_bozo_with_no_entries_raises(mock_parse):
         assert False, "Should have raised ValueError"
     except ValueError as e:
         assert "Failed to parse feed" in str(e)
+
+
+def _serve(monkeypatch, handler):
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("app.services.feed_service.get_http_client", lambda purpose, url: client)
+
+
+def test_fetch_feed_sends_validators_and_handles_304(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers)
+        return httpx.Response(304)
+
+    _serve(monkeypatch, handler)
+
+    fetched = fetch_feed("https://example.com/feed.xml", '"abc"', "Mon, 10 Feb 2026 10:00:00 GMT", "ff" * 32)
+
+    assert fetched.unchanged
+    assert seen[0]["If-None-Match"] == '"abc"'
+    assert seen[0]["If-Modified-Since"] == "Mon, 10 Feb 2026 10:00:00 GMT"
+    assert (fetched.etag, fetched.content_sha256) == ('"abc"', "ff" * 32)
+
+
+def test_fetch_feed_short_circuits_on_unchanged_body(monkeypatch):
+    body = MOCK_RSS_CONTENT.encode()
+    _serve(monkeypatch, lambda request: httpx.Response(200, content=body, headers={"ETag": '"v2"'}))
+
+    first = fetch_feed("https://example.com/feed.xml")
+    again = fetch_feed("https://example.com/feed.xml", content_sha256=first.content_sha256)
+
+    assert first.content == body
+    assert first.content_sha256 == hashlib.sha256(body).hexdigest()
+    assert again.unchanged
+    assert again.etag == '"v2"'
+
+
+def test_parse_feed_content_reads_downloaded_body():
+    result = parse_feed_content(MOCK_RSS_CONTENT.encode(), "application/rss+xml")
+
+    assert result["feed"]["title"] == "Test Podcast"
+    assert [e["guid"] for e in result["episodes"]] == ["ep-001", "ep-002", "ep-003"]
+
+
+def test_fetch_feeds_concurrently_keeps_order_and_isolates_failures(monkeypatch):
+    body = MOCK_RSS_CONTENT.encode()
+
+    def handler(request):
+        if request.url.host == "down.example.com":
+            return httpx.Response(500)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=body)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "app.services.feed_service.httpx.AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+
+    results = fetch_feeds_concurrently(
+        [
+            ("https://a.example.com/feed.xml", None, None, None),
+            ("https://down.example.com/feed.xml", None, None, None),
+            ("https://b.example.com/feed.xml", '"v1"', None, "ab" * 32),
+        ],
+        concurrency=2,
+    )
+
+    assert results[0].content == body
+    assert isinstance(results[1], httpx.HTTPStatusError)
+    assert results[2].unchanged
+
+
+def _rss_items(*guids):
+    return "".join(
+        f"""<item><guid>{guid}</guid><title>{guid}</title><pubDate>Thu, 13 Feb 2026 10:00:00 GMT</pubDate>
+        <enclosure url="https://example.com/{guid}.mp3" type="audio/mpeg" /></item>"""
+        for guid in guids
+    )
+
+
+def _rss(items: str, tail: str = "</channel></rss>") -> bytes:
+    head = """<?xml version="1.0"?><rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+    <channel><title>Test Podcast</title><itunes:image href="https://example.com/cover.jpg" />"""
+    return (head + items + tail).encode()
+
+
+def test_streaming_parse_matches_feedparser_fields():
+    content = MOCK_RSS_CONTENT.encode()
+
+    result = parse_feed_streaming(content)
+
+    assert result["feed"] == {"title": "Test Podcast", "image_url": "https://example.com/cover.jpg"}
+    assert [e["guid"] for e in result["episodes"]] == ["ep-001", "ep-002"]
+    assert result["episodes"] == [
+        {k: e[k] for k in ("guid", "title", "audio_url", "published_at")}
+        for e in parse_feed_content(content)["episodes"]
+        if e["audio_url"]
+    ]
+
+
+def test_streaming_parse_stops_at_run_of_known_guids(monkeypatch):
+    monkeypatch.setattr("app.services.feed_service.settings.FEED_KNOWN_GUID_RUN", 2)
+    # The body is cut off mid-catalogue; stopping early means it is never reached.
+    content = _rss(_rss_items("new-1", "old-1", "new-2", "old-2", "old-3") + "<item><guid>tru", tail="")
+
+    result = parse_feed_streaming(content, known_guids={"old-1", "old-2", "old-3"})
+
+    assert result["feed"]["image_url"] == "https://example.com/cover.jpg"
+    assert [e["guid"] for e in result["episodes"]] == ["new-1", "new-2"]
+
+
+def test_streaming_parse_stops_at_window_limit():
+    content = _rss(_rss_items(*(f"ep-{index}" for index in range(50))))
+
+    result = parse_feed_streaming(content, limit=3)
+
+    assert [e["guid"] for e in result["episodes"]] == ["ep-0", "ep-1", "ep-2"]
+
+
+def test_streaming_parse_reads_atom():
+    content = b"""<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">
+    <title>Atom Show</title><logo>https://example.com/logo.png</logo>
+    <entry><id>urn:ep:1</id><title>One</title><published>2026-02-13T10:00:00Z</published>
+    <link rel="alternate" href="https://example.com/1" />
+    <link rel="enclosure" type="audio/mpeg" href="https://example.com/1.mp3" /></entry>
+    </feed>"""
+
+    result = parse_feed_streaming(content)
+
+    assert result["feed"] == {"title": "Atom Show", "image_url": "https://example.com/logo.png"}
+    assert result["episodes"][0]["guid"] == "urn:ep:1"
+    assert result["episodes"][0]["audio_url"] == "https://example.com/1.mp3"
+    assert result["episodes"][0]["published_at"].isoformat() == "2026-02-13T10:00:00+00:00"
+
+
+def test_streaming_parse_falls_back_to_feedparser_on_malformed_xml():
+    content = MOCK_RSS_CONTENT.replace("<title>Episode One</title>", "<title>Fish & Chips</title>").encode()
+
+    result = parse_feed_streaming(content, known_guids={"ep-002"})
+
+    assert [e["guid"] for e in result["episodes"]] == ["ep-001"]
@@ -0,0 +1,66 @@
+"""Tests for per-host download slots."""
+import pytest
+import redis
+
+from app.services import host_limiter
+from app.services.host_limiter import LocalHostSemaphore, acquire_host_slot, host_backoff_countdown
+
+
+@pytest.fixture
+def local_semaphore(monkeypatch):
+    semaphore = LocalHostSemaphore()
+    host_limiter.set_host_semaphore(semaphore)
+    monkeypatch.setattr("app.services.host_limiter.settings.AUDIO_DOWNLOAD_PER_HOST_CONCURRENCY", 2)
+    yield semaphore
+    host_limiter.set_host_semaphore(None)
+
+
+def test_host_is_saturated_until_a_slot_is_released(local_semaphore):
+    first = acquire_host_slot("https://CDN.example.com/a.mp3")
+    second = acquire_host_slot("https://cdn.example.com/b.mp3")
+    assert first is not None and second is not None
+    assert acquire_host_slot("https://cdn.example.com/c.mp3") is None
+    assert acquire_host_slot("https://other.example.com/c.mp3") is not None
+
+    first.release()
+    assert acquire_host_slot("https://cdn.example.com/c.mp3") is not None
+
+
+def test_per_host_override_and_unlimited(local_semaphore, monkeypatch):
+    monkeypatch.setattr(
+        "app.services.host_limiter.settings.AUDIO_DOWNLOAD_HOST_CONCURRENCY",
+        {"slow.example.com": 1, "fast.example.com": 0},
+    )
+    assert acquire_host_slot("https://slow.example.com/a.mp3") is not None
+    assert acquire_host_slot("https://slow.example.com/b.mp3") is None
+    assert all(acquire_host_slot("https://fast.example.com/a.mp3") is not None for _ in range(5))
+
+
+def test_expired_lease_frees_slot(local_semaphore, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.services.host_limiter.time.monotonic", lambda: clock[0])
+    assert local_semaphore.acquire("cdn", 1, 10.0, "a")
+    assert not local_semaphore.acquire("cdn", 1, 10.0, "b")
+    clock[0] = 111.0
+    assert local_semaphore.acquire("cdn", 1, 10.0, "b")
+
+
+def test_redis_outage_fails_open(monkeypatch):
+    class _BrokenSemaphore:
+        def acquire(self, *args):
+            raise redis.ConnectionError("down")
+
+    host_limiter.set_host_semaphore(_BrokenSemaphore())
+    monkeypatch.setattr("app.services.host_limiter.settings.AUDIO_DOWNLOAD_PER_HOST_CONCURRENCY", 1)
+    try:
+        slot = acquire_host_slot("https://cdn.example.com/a.mp3")
+        assert slot is not None and slot.token is None
+    finally:
+        host_limiter.set_host_semaphore(None)
+
+
+def test_backoff_grows_with_jitter_and_cap(monkeypatch):
+    monkeypatch.setattr("app.services.host_limiter.settings.AUDIO_DOWNLOAD_HOST_BACKOFF_SECONDS", 10)
+    monkeypatch.setattr("app.services.host_limiter.settings.AUDIO_DOWNLOAD_HOST_BACKOFF_MAX_SECONDS", 60)
+    monkeypatch.setattr("app.services.host_limiter.random.uniform", lambda low, high: high)
+    assert [host_backoff_countdown(waits) for waits in range(5)] == [10, 20, 40, 60, 60]
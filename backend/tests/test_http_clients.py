@@ -0,0 +1,55 @@
+"""Tests for the per-process pooled HTTP client registry."""
+from app.services import http_clients
+from app.services.http_clients import close_http_clients, get_http_client
+
+
+def test_reuses_client_per_purpose_and_host():
+    try:
+        first = get_http_client("llm", "https://openrouter.ai/api/v1/chat/completions")
+        again = get_http_client("llm", "https://openrouter.ai/other")
+        other_host = get_http_client("llm", "http://ollama:11434/api/chat")
+        other_purpose = get_http_client("download", "https://openrouter.ai/file.mp3")
+
+        assert first is again
+        assert first is not other_host
+        assert first is not other_purpose
+    finally:
+        close_http_clients()
+
+
+def test_rebuilds_clients_after_fork(monkeypatch):
+    try:
+        parent = get_http_client("download", "https://cdn.example.com/a.mp3")
+        monkeypatch.setattr(http_clients.os, "getpid", lambda: -1)
+        child = get_http_client("download", "https://cdn.example.com/a.mp3")
+
+        assert child is not parent
+        assert not parent.is_closed
+    finally:
+        close_http_clients()
+        monkeypatch.undo()
+        close_http_clients()
+
+
+def test_close_http_clients_closes_pools():
+    client = get_http_client("transcription", "http://whisper:8000/v1/audio/transcriptions")
+    close_http_clients()
+    assert client.is_closed
+    assert get_http_client("transcription", "http://whisper:8000/v1/audio/transcriptions") is not client
+    close_http_clients()
+
+
+def test_least_recently_used_client_is_closed_at_capacity(monkeypatch):
+    monkeypatch.setattr("app.services.http_clients.settings.HTTP_CLIENT_MAX_CLIENTS", 2)
+    try:
+        first = get_http_client("download", "https://a.example.com/1.mp3")
+        second = get_http_client("download", "https://b.example.com/1.mp3")
+        assert get_http_client("download", "https://a.example.com/2.mp3") is first
+
+        third = get_http_client("download", "https://c.example.com/1.mp3")
+
+        assert second.is_closed
+        assert not first.is_closed and not third.is_closed
+        assert get_http_client("download", "https://b.example.com/2.mp3") is not second
+    finally:
+        close_http_clients()
@@ -0,0 +1,88 @@
+"""Tests for backfilling a new keyword over stored transcripts."""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import AppSetting, Episode, Feed, Keyword, TranscriptSegments
+from app.worker.tasks import backfill
+from app.worker.tasks.backfill import _detect_batch, backfill_keyword, backfill_keyword_batch
+
+
+@pytest.fixture
+def sync_session_factory(monkeypatch):
+    engine = create_engine("sqlite://")
+    tables = [
+        Feed.__table__,
+        Episode.__table__,
+        Keyword.__table__,
+        AppSetting.__table__,
+        TranscriptSegments.__table__,
+    ]
+    Feed.metadata.create_all(engine, tables=tables)
+    factory = sessionmaker(engine)
+    monkeypatch.setattr(backfill, "SyncSessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def test_detect_batch_only_returns_matching_episodes():
+    kw = {"id": "1", "phrase": "Acme Corp", "match_type": "contains"}
+    rows = [("ep-1", "We love acme corp."), ("ep-2", "Nothing to see here.")]
+    results = _detect_batch(kw, rows)
+    assert [episode_id for episode_id, _ in results] == ["ep-1"]
+    assert results[0][1][0].matched_text == "acme corp"
+
+
+def test_backfill_queues_additive_enrichment(sync_session_factory, monkeypatch):
+    monkeypatch.setattr("app.worker.tasks.backfill.settings.KEYWORD_BACKFILL_BATCH_SIZE", 1)
+    batches = []
+    monkeypatch.setattr(backfill.backfill_keyword_batch, "delay", lambda *args: batches.append(args))
+    queued = []
+    monkeypatch.setattr(
+        "app.worker.tasks.process.enrich_episode_mentions.apply_async",
+        lambda args, queue: queued.append((args[0], queue)),
+    )
+
+    keyword_id = uuid.uuid4()
+    with sync_session_factory() as db:
+        feed = Feed(id=uuid.uuid4(), rss_url="https://example.com/feed.xml")
+        db.add(feed)
+        db.add(Keyword(id=keyword_id, phrase="Acme Corp", match_type="contains"))
+        transcripts = {
+            "ep-1": ("completed", "Acme Corp is great. I recommend Acme Corp."),
+            "ep-2": ("completed", "No brands in this one."),
+            "ep-3": ("analyzing", "Acme Corp again."),
+            "ep-4": ("failed", "Acme Corp failed."),
+        }
+        for guid, (status, transcript) in transcripts.items():
+            episode_id = uuid.uuid4()
+            db.add(Episode(
+                id=episode_id,
+                feed_id=feed.id,
+                guid=guid,
+                status=status,
+                transcript_text=transcript,
+            ))
+            if guid == "ep-1":
+                db.add(TranscriptSegments(episode_id=episode_id, starts=[3.0, 7.5], ends=[7.5, 12.0], offsets=[0, 20]))
+        db.commit()
+
+    result = backfill_keyword.run(str(keyword_id))
+
+    # Mid-pipeline episodes are included; failed ones are not.
+    assert result["episodes"] == 3
+    assert result["batches"] == 3
+    assert all(len(episode_ids) == 1 for _, episode_ids in batches)
+
+    batch_results = [backfill_keyword_batch.run(*args) for args in batches]
+
+    assert sum(r["episodes"] for r in batch_results) == 2
+    assert sum(r["matches"] for r in batch_results) == 3
+    assert len(queued) == 2
+    payload, queue = next(item for item in queued if len(item[0]["matches"]) == 2)
+    assert queue == "llm"
+    assert payload["replace_existing"] is False
+    assert {m["keyword_id"] for m in payload["matches"]} == {str(keyword_id)}
+    assert [m["audio_seconds"] for m in payload["matches"]] == [3.0, 7.5]
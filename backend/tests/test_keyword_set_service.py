@@ -0,0 +1,80 @@
+"""Tests for the per-worker compiled keyword set cache."""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import AppSetting, Keyword
+from app.services import keyword_set_service
+from app.services.keyword_set_service import (
+    KEYWORD_SET_VERSION_KEY,
+    clear_compiled_keyword_set_cache,
+    get_compiled_keyword_set_sync,
+)
+
+
+@pytest.fixture
+def sync_db():
+    engine = create_engine("sqlite://")
+    tables = [Keyword.__table__, AppSetting.__table__]
+    Keyword.metadata.create_all(engine, tables=tables)
+    clear_compiled_keyword_set_cache()
+    with sessionmaker(engine)() as session:
+        yield session
+    clear_compiled_keyword_set_cache()
+    engine.dispose()
+
+
+def _set_version(db, version: str) -> None:
+    row = db.get(AppSetting, KEYWORD_SET_VERSION_KEY)
+    if row:
+        row.value = version
+    else:
+        db.add(AppSetting(key=KEYWORD_SET_VERSION_KEY, value=version))
+    db.commit()
+
+
+def _add_keyword(db, phrase: str, match_type: str = "contains") -> None:
+    db.add(Keyword(id=uuid.uuid4(), phrase=phrase, match_type=match_type))
+    db.commit()
+
+
+def test_reuses_compiled_set_while_version_unchanged(sync_db, monkeypatch):
+    _add_keyword(sync_db, "Acme Corp")
+    _set_version(sync_db, "v1")
+
+    first = get_compiled_keyword_set_sync(sync_db)
+
+    built = []
+    monkeypatch.setattr(
+        keyword_set_service,
+        "CompiledKeywordSet",
+        lambda *args, **kwargs: built.append(args) or first,
+    )
+    second = get_compiled_keyword_set_sync(sync_db)
+
+    assert second is first
+    assert built == []
+    assert [m.matched_text for m in first.detect("I like acme corp")] == ["acme corp"]
+
+
+def test_rebuilds_when_version_changes(sync_db):
+    _add_keyword(sync_db, "Acme Corp")
+    _set_version(sync_db, "v1")
+    first = get_compiled_keyword_set_sync(sync_db)
+
+    _add_keyword(sync_db, "BetaCo")
+    _set_version(sync_db, "v2")
+    second = get_compiled_keyword_set_sync(sync_db)
+
+    assert second is not first
+    assert second.version == "v2"
+    assert sorted(k["phrase"] for k in second.keywords) == ["Acme Corp", "BetaCo"]
+
+
+def test_rebuilds_every_call_without_version(sync_db):
+    _add_keyword(sync_db, "Acme Corp")
+    first = get_compiled_keyword_set_sync(sync_db)
+    second = get_compiled_keyword_set_sync(sync_db)
+    assert second is not first
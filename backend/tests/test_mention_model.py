@@ -0,0 +1,26 @@
+"""Tests for offset-based mention segments."""
+from app.models import Episode, Mention
+from app.worker.tasks.process import _match_segment
+
+
+TRANSCRIPT = "x" * 400 + "Acme Corp" + "y" * 400
+
+
+def test_segment_rebuilt_from_offsets():
+    mention = Mention(matched_text="Acme Corp", match_start=400, match_end=409)
+    mention.episode = Episode(transcript_text=TRANSCRIPT)
+    assert mention.stored_segment is None
+    assert mention.transcript_segment == "..." + TRANSCRIPT[100:709] + "..."
+
+
+def test_stored_segment_takes_precedence():
+    mention = Mention(matched_text="Acme Corp", transcript_segment="copied context")
+    mention.episode = Episode(transcript_text=TRANSCRIPT)
+    assert mention.transcript_segment == "copied context"
+
+
+def test_match_segment_supports_offset_and_legacy_payloads():
+    offset_match = {"match_start": 400, "match_end": 409}
+    legacy_match = {"transcript_segment": "copied context"}
+    assert "Acme Corp" in _match_segment(TRANSCRIPT, offset_match)
+    assert _match_segment(TRANSCRIPT, legacy_match) == "copied context"
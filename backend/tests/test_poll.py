@@ -0,0 +1,224 @@
+"""Tests for the feed polling tasks."""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Episode, Feed
+from app.services.feed_service import FeedFetch
+from app.worker.tasks import poll
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://")
+    Feed.metadata.create_all(engine, tables=[Feed.__table__, Episode.__table__])
+    with sessionmaker(engine)() as session:
+        monkeypatch.setattr(poll, "SyncSessionLocal", lambda: session)
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    from app.worker.tasks import process
+
+    episode_ids = []
+    monkeypatch.setattr(process.process_episode, "delay", episode_ids.append)
+    return episode_ids
+
+
+def _feed(db, rss_url="https://example.com/feed.xml", **fields):
+    feed = Feed(id=uuid.uuid4(), rss_url=rss_url, **fields)
+    db.add(feed)
+    db.commit()
+    return feed
+
+
+def test_unchanged_feed_skips_parse(db, queued, monkeypatch):
+    feed = _feed(db, etag='"v1"', content_sha256="ab" * 32)
+    requests = []
+
+    def _fetch(url, etag, last_modified, content_sha256):
+        requests.append((etag, content_sha256))
+        return FeedFetch(None, '"v1"', "Mon, 10 Feb 2026 10:00:00 GMT", content_sha256)
+
+    monkeypatch.setattr(poll, "fetch_feed", _fetch)
+    monkeypatch.setattr(poll, "parse_feed_content", lambda *args: pytest.fail("parsed an unchanged feed"))
+
+    poll.poll_single_feed.run(feed.id)
+
+    assert requests == [('"v1"', "ab" * 32)]
+    assert feed.last_modified == "Mon, 10 Feb 2026 10:00:00 GMT"
+    assert feed.last_polled_at is not None
+    assert queued == []
+
+
+def test_changed_feed_stores_validators_with_new_episodes(db, queued, monkeypatch):
+    feed = _feed(db)
+    data = {
+        "feed": {"title": "Show", "image_url": None},
+        "episodes": [{"guid": "ep-1", "title": "One", "audio_url": "https://cdn.example.com/1.mp3", "published_at": None}],
+    }
+    monkeypatch.setattr(poll, "fetch_feed", lambda *args: FeedFetch(b"<rss/>", '"v2"', None, "cd" * 32))
+    monkeypatch.setattr(poll, "parse_feed_content", lambda content, content_type: data)
+
+    poll.poll_single_feed.run(feed.id)
+
+    assert (feed.etag, feed.content_sha256) == ('"v2"', "cd" * 32)
+    assert [e.guid for e in db.query(Episode).all()] == ["ep-1"]
+    assert len(queued) == 1
+
+
+def _data(*guids):
+    return {
+        "feed": {"title": "Show", "image_url": None},
+        "episodes": [
+            {"guid": guid, "title": guid, "audio_url": f"https://cdn.example.com/{guid}.mp3", "published_at": None}
+            for guid in guids
+        ],
+    }
+
+
+def test_poll_all_feeds_shards_into_batches(db, monkeypatch):
+    for index in range(5):
+        db.add(Feed(id=uuid.uuid4(), rss_url=f"https://example.com/{index}.xml"))
+    db.commit()
+    monkeypatch.setattr("app.worker.tasks.poll.settings.FEED_POLL_BATCH_SIZE", 2)
+    groups = []
+
+    class _Group:
+        def __init__(self, signatures):
+            self.signatures = list(signatures)
+            groups.append(self)
+
+        def apply_async(self):
+            pass
+
+    monkeypatch.setattr(poll, "group", _Group)
+
+    poll.poll_all_feeds.run()
+
+    assert [len(signature.args[0]) for signature in groups[0].signatures] == [2, 2, 1]
+
+
+def test_feed_batch_ingests_changed_feeds_and_skips_failures(db, queued, monkeypatch):
+    changed = _feed(db)
+    unchanged = Feed(id=uuid.uuid4(), rss_url="https://example.com/same.xml", content_sha256="ab" * 32)
+    broken = Feed(id=uuid.uuid4(), rss_url="https://example.com/broken.xml", etag='"old"')
+    db.add_all([unchanged, broken])
+    db.commit()
+    fetches = {
+        changed.rss_url: FeedFetch(b"<rss/>", '"v2"', None, "cd" * 32),
+        unchanged.rss_url: FeedFetch(None, None, None, "ab" * 32),
+        broken.rss_url: RuntimeError("timeout"),
+    }
+    monkeypatch.setattr(
+        poll, "fetch_feeds_concurrently", lambda requests, concurrency: [fetches[r[0]] for r in requests]
+    )
+    monkeypatch.setattr(poll, "parse_feed_content", lambda content, content_type: _data("ep-1", "ep-2"))
+
+    feed_ids = [changed.id, unchanged.id, broken.id]
+
+    result = poll.poll_feed_batch.run([str(feed_id) for feed_id in feed_ids])
+
+    changed, unchanged, broken = (db.get(Feed, feed_id) for feed_id in feed_ids)
+    assert result == {"feeds": 3, "changed": 1, "failed": 1, "new_episodes": 2}
+    assert changed.etag == '"v2"'
+    assert unchanged.last_polled_at is not None
+    assert broken.etag == '"old"' and broken.last_polled_at is None
+    assert len(queued) == 2
+
+
+def test_parse_fetches_parses_only_changed_bodies():
+    rss = b"<rss version='2.0'><channel><title>Show</title><item><guid>ep-1</guid></item></channel></rss>"
+    fetches = [
+        FeedFetch(rss, None, None, "ab" * 32),
+        FeedFetch(None, None, None, "cd" * 32),
+        FeedFetch(b"not a feed", None, None, "ef" * 32),
+        RuntimeError("timeout"),
+    ]
+
+    results = poll._parse_fetches(fetches, [set()] * 4, [0] * 4)
+
+    assert [e["guid"] for e in results[0]["episodes"]] == ["ep-1"]
+    assert results[1] is None
+    assert isinstance(results[2], ValueError)
+    assert results[3] is None
+
+
+def test_new_episodes_are_inserted_in_one_statement_skipping_known_guids(db):
+    from sqlalchemy import event
+
+    feed = _feed(db)
+    other = _feed(db, rss_url="https://example.com/other.xml")
+    # Stored by another feed, or by a poller that won the race.
+    db.add(Episode(id=uuid.uuid4(), feed_id=other.id, guid="ep-1", status="completed"))
+    db.commit()
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+
+    new_count = poll._add_new_episodes(db, feed, _data("ep-1", "ep-2", "ep-3", "ep-2"))
+    db.commit()
+    ingest_statements = [sql.split()[0] for sql in statements if "episodes" in sql]
+
+    assert new_count == 2
+    assert ingest_statements == ["INSERT"]
+    assert sorted(e.guid for e in db.query(Episode).filter(Episode.feed_id == feed.id)) == ["ep-2", "ep-3"]
+
+
+def test_streaming_poll_stops_at_known_guids(db, queued, monkeypatch):
+    monkeypatch.setattr("app.worker.tasks.poll.settings.FEED_STREAMING_PARSE", True)
+    monkeypatch.setattr("app.worker.tasks.poll.settings.FEED_KNOWN_GUID_RUN", 1)
+    feed = _feed(db)
+    db.add(Episode(id=uuid.uuid4(), feed_id=feed.id, guid="ep-2", status="completed"))
+    db.commit()
+    items = "".join(
+        f"<item><guid>{guid}</guid><enclosure url='https://cdn.example.com/{guid}.mp3' type='audio/mpeg'/></item>"
+        for guid in ("ep-3", "ep-2", "ep-1")
+    )
+    body = f"<rss version='2.0'><channel><title>Show</title>{items}</channel></rss>".encode()
+    monkeypatch.setattr(poll, "fetch_feed", lambda *args: FeedFetch(body, None, None, "cd" * 32))
+
+    poll.poll_single_feed.run(feed.id)
+
+    assert sorted(e.guid for e in db.query(Episode).all()) == ["ep-2", "ep-3"]
+
+
+def test_poll_all_feeds_dispatches_only_due_feeds_and_leases_them(db, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+
+    now = datetime.now(timezone.utc)
+    never_polled = _feed(db)
+    overdue = _feed(db, rss_url="https://example.com/overdue.xml", next_poll_at=now - timedelta(minutes=1))
+    later = _feed(db, rss_url="https://example.com/later.xml", next_poll_at=now + timedelta(hours=2))
+    feed_ids = {"never_polled": never_polled.id, "overdue": overdue.id, "later": later.id}
+    dispatched = []
+    monkeypatch.setattr(poll.poll_single_feed, "delay", dispatched.append)
+
+    poll.poll_all_feeds.run()
+    poll.poll_all_feeds.run()
+
+    assert sorted(dispatched) == sorted([str(feed_ids["never_polled"]), str(feed_ids["overdue"])])
+    leased = db.get(Feed, feed_ids["overdue"]).next_poll_at.replace(tzinfo=timezone.utc)
+    assert leased > now + timedelta(minutes=14)
+
+
+def test_poll_schedules_next_poll_from_publish_cadence(db, queued, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+
+    monkeypatch.setattr("app.worker.tasks.poll.settings.FEED_POLL_JITTER", 0.0)
+    feed = _feed(db)
+    feed_id = feed.id
+    latest = datetime.now(timezone.utc)
+    for index in range(5):
+        db.add(Episode(id=uuid.uuid4(), feed_id=feed.id, guid=f"ep-{index}", published_at=latest - timedelta(days=index)))
+    db.commit()
+    monkeypatch.setattr(poll, "fetch_feed", lambda *args: FeedFetch(None, None, None, "ab" * 32))
+
+    poll.poll_single_feed.run(feed_id)
+
+    feed = db.get(Feed, feed_id)
+    delay = feed.next_poll_at.replace(tzinfo=timezone.utc) - feed.last_polled_at.replace(tzinfo=timezone.utc)
+    assert abs(delay.total_seconds() - 8640) < 5
@@ -0,0 +1,219 @@
+"""Tests for transcript reuse in the processing pipeline."""
+import hashlib
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Episode, Feed, Keyword, Mention, TranscriptSegments
+from app.worker.tasks.process import _reuse_duplicate_transcript
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = [Feed.__table__, Episode.__table__, TranscriptSegments.__table__, Keyword.__table__, Mention.__table__]
+    Feed.metadata.create_all(engine, tables=tables)
+    with sessionmaker(engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def _episode(db, feed, guid, **fields):
+    episode = Episode(id=uuid.uuid4(), feed_id=feed.id, guid=guid, **fields)
+    db.add(episode)
+    return episode
+
+
+def _mention(db, episode):
+    keyword = Keyword(id=uuid.uuid4(), phrase="Old")
+    db.add(keyword)
+    db.add(Mention(episode_id=episode.id, keyword_id=keyword.id, matched_text="Old", match_start=0, match_end=3))
+
+
+def test_duplicate_audio_reuses_existing_transcript_and_segments(db):
+    feed = Feed(id=uuid.uuid4(), rss_url="https://example.com/feed.xml")
+    db.add(feed)
+    donor = _episode(db, feed, "original", status="completed", transcript_text="Acme rerun", audio_sha256="ab" * 32)
+    rerun = _episode(db, feed, "rerun", status="transcribing", audio_sha256="ab" * 32)
+    db.add(TranscriptSegments(episode_id=donor.id, starts=[0.0], ends=[4.0], offsets=[0]))
+    db.commit()
+
+    assert _reuse_duplicate_transcript(db, rerun) is True
+
+    assert rerun.transcript_text == "Acme rerun"
+    assert db.get(TranscriptSegments, rerun.id).starts == [0.0]
+
+
+def test_unique_audio_is_transcribed(db):
+    feed = Feed(id=uuid.uuid4(), rss_url="https://example.com/feed.xml")
+    db.add(feed)
+    _episode(db, feed, "other", status="completed", transcript_text="Other", audio_sha256="cd" * 32)
+    pending = _episode(db, feed, "new", status="transcribing", audio_sha256="ab" * 32)
+    db.commit()
+
+    assert _reuse_duplicate_transcript(db, pending) is False
+    assert pending.transcript_text is None
+
+
+def test_saturated_host_reschedules_download(db, monkeypatch):
+    from celery.exceptions import Retry
+
+    from app.worker.tasks import process
+
+    feed = Feed(id=uuid.uuid4(), rss_url="https://example.com/feed.xml")
+    db.add(feed)
+    episode = _episode(db, feed, "ep", status="queued", audio_url="https://cdn.example.com/ep.mp3")
+    db.commit()
+
+    monkeypatch.setattr(process, "SyncSessionLocal", lambda: db)
+    calls = []
+    monkeypatch.setattr(process.audio_cache, "wait_for_space", lambda loader: calls.append("wait_for_space"))
+    monkeypatch.setattr(process, "acquire_host_slot", lambda url: calls.append("acquire_host_slot"))
+    monkeypatch.setattr(process, "host_backoff_countdown", lambda waits: 45)
+    monkeypatch.setattr(process, "_download_audio", lambda *args: pytest.fail("downloaded on a saturated host"))
+    retries = []
+
+    def _retry(**kwargs):
+        retries.append(kwargs)
+        raise Retry()
+
+    monkeypatch.setattr(process.download_episode_audio, "retry", _retry)
+
+    with pytest.raises(Retry):
+        process.download_episode_audio.run(episode.id, host_waits=3)
+
+    max_retries = process.download_episode_audio.max_retries + 4
+    assert retries == [{"countdown": 45, "kwargs": {"host_waits": 4}, "max_retries": max_retries}]
+    # The slot lease must not be spent waiting for disk space.
+    assert calls == ["wait_for_space", "acquire_host_slot"]
+    assert episode.status == "queued"
+
+
+def test_reprocess_reuses_verified_cached_audio(db, monkeypatch, tmp_path):
+    from app.worker.tasks import process
+
+    monkeypatch.setattr("app.worker.tasks.process.settings.AUDIO_DIR", str(tmp_path))
+    feed = Feed(id=uuid.uuid4(), rss_url="https://example.com/feed.xml")
+    db.add(feed)
+    episode = _episode(
+        db,
+        feed,
+        "ep",
+        status="pending",
+        audio_url="https://cdn.example.com/ep.mp3",
+        audio_sha256=hashlib.sha256(b"cached audio").hexdigest(),
+    )
+    db.commit()
+    (tmp_path / f"{episode.id}.mp3").write_bytes(b"cached audio")
+
+    monkeypatch.setattr(process, "SyncSessionLocal", lambda: db)
+    monkeypatch.setattr(process, "_download_audio", lambda *args: pytest.fail("downloaded cached audio"))
+
+    assert process.download_episode_audio.run(episode.id) == episode.id
+
+
+def _failing_enrichment(monkeypatch, db):
+    from app.worker.tasks import process
+
+    monkeypatch.setattr(process, "SyncSessionLocal", lambda: db)
+    monkeypatch.setattr(process.enrich_episode_mentions, "max_retries", 0)
+    monkeypatch.setattr("app.worker.tasks.process.settings.ENRICHMENT_CONCURRENCY", 2)
+
+    def _prefetch(*args):
+        raise RuntimeError("llm down")
+
+    monkeypatch.setattr(process, "_prefetch_unit_enrichments", _prefetch)
+    return process
+
+
+def _match_payload(episode_id, **fields):
+    match = {"keyword_id": str(uuid.uuid4()), "phrase": "Acme", "matched_text": "Acme", "match_start": 0, "match_end": 4}
+    return {"episode_id": episode_id, "matches": [match], **fields}
+
+
+def test_failed_backfill_enrichment_keeps_episode_completed(db, monkeypatch):
+    process = _failing_enrichment(monkeypatch, db)
+    feed = Feed(id=uuid.uuid4(), rss_url="https://example.com/feed.xml")
+    db.add(feed)
+    episode = _episode(db, feed, "ep", status="completed", transcript_text="Acme is great.")
+    db.commit()
+
+    episode_id = episode.id
+
+    with pytest.raises(RuntimeError, match="llm down"):
+        process.enrich_episode_mentions.run(_match_payload(episode_id, replace_existing=False))
+
+    episode = db.get(Episode, episode_id)
+    assert episode.status == "completed"
+    assert episode.error_message is None
+
+
+
+def test_enrichment_planning_failure_is_retried(db, monkeypatch):
+    from celery.exceptions import Retry
+
+    process = _failing_enrichment(monkeypatch, db)
+    monkeypatch.setattr(process.enrich_episode_mentions, "max_retries", 2)
+
+    def _plan(*args):
+        raise RuntimeError("bad transcript")
+
+    monkeypatch.setattr(process, "_plan_enrichment_units", _plan)
+    retries = []
+
+    def _retry(**kwargs):
+        retries.append(kwargs)
+        raise Retry()
+
+    monkeypatch.setattr(process.enrich_episode_mentions, "retry", _retry)
+    feed = Feed(id=uuid.uuid4(), rss_url="https://example.com/feed.xml")
+    db.add(feed)
+    episode = _episode(db, feed, "ep", status="analyzing", transcript_text="Acme is great.")
+    db.commit()
+
+    with pytest.raises(Retry):
+        process.enrich_episode_mentions.run(_match_payload(episode.id, start_index=0))
+
+    assert retries[0]["args"][0]["start_index"] == 0
+    assert str(retries[0]["exc"]) == "bad transcript"
+
+
+def test_reusing_transcript_without_segments_drops_stale_segments(db):
+    feed = Feed(id=uuid.uuid4(), rss_url="https://example.com/feed.xml")
+    db.add(feed)
+    _episode(db, feed, "original", status="completed", transcript_text="Acme rerun", audio_sha256="ab" * 32)
+    rerun = _episode(db, feed, "rerun", status="transcribing", transcript_text="Old text", audio_sha256="ab" * 32)
+    db.add(TranscriptSegments(episode_id=rerun.id, starts=[0.0], ends=[4.0], offsets=[0]))
+    _mention(db, rerun)
+    db.commit()
+
+    assert _reuse_duplicate_transcript(db, rerun) is True
+
+    assert rerun.transcript_text == "Acme rerun"
+    assert db.get(TranscriptSegments, rerun.id) is None
+    assert db.query(Mention).filter(Mention.episode_id == rerun.id).count() == 0
+
+
+def test_text_only_retranscription_drops_stale_segments(db, monkeypatch, tmp_path):
+    from app.worker.tasks import process
+
+    monkeypatch.setattr("app.worker.tasks.process.settings.AUDIO_DIR", str(tmp_path))
+    monkeypatch.setattr("app.worker.tasks.process.settings.TRANSCRIPTION_TIMESTAMPS", False)
+    monkeypatch.setattr(process, "SyncSessionLocal", lambda: db)
+    monkeypatch.setattr(process, "transcribe_audio", lambda path: "Fresh text")
+    feed = Feed(id=uuid.uuid4(), rss_url="https://example.com/feed.xml")
+    db.add(feed)
+    episode = _episode(db, feed, "ep", status="queued", transcript_text="Old text")
+    db.add(TranscriptSegments(episode_id=episode.id, starts=[0.0], ends=[4.0], offsets=[0]))
+    _mention(db, episode)
+    db.commit()
+    episode_id = episode.id
+    (tmp_path / f"{episode_id}.mp3").write_bytes(b"audio")
+
+    process.transcribe_episode_audio.run(episode_id)
+
+    assert db.get(Episode, episode_id).transcript_text == "Fresh text"
+    assert db.get(TranscriptSegments, episode_id) is None
+    assert db.query(Mention).filter(Mention.episode_id == episode_id).count() == 0
@@ -0,0 +1,45 @@
+"""Tests for planning enrichment units from detection payloads."""
+from app.worker.tasks.process import _plan_enrichment_units
+
+
+TRANSCRIPT = "Acme Corp is great, Acme Corp rocks. " + "filler " * 200 + "BetaCo is fine."
+
+
+def _match(keyword_id: str, phrase: str, start: int) -> dict:
+    return {
+        "keyword_id": keyword_id,
+        "phrase": phrase,
+        "matched_text": TRANSCRIPT[start:start + len(phrase)],
+        "match_start": start,
+        "match_end": start + len(phrase),
+    }
+
+
+MATCHES = [
+    _match("1", "Acme Corp", 0),
+    _match("1", "Acme Corp", 20),
+    _match("2", "BetaCo", TRANSCRIPT.index("BetaCo")),
+]
+
+
+def test_overlapping_matches_share_one_unit():
+    unit_of, units = _plan_enrichment_units(TRANSCRIPT, MATCHES)
+    assert unit_of == [0, 0, 1]
+    assert units[0][0] == "Acme Corp"
+    assert units[0][1].startswith("Acme Corp is great, Acme Corp rocks.")
+    assert units[1][0] == "BetaCo"
+
+
+def test_clustering_can_be_disabled(monkeypatch):
+    monkeypatch.setattr("app.worker.tasks.process.settings.ENRICHMENT_CLUSTER_MATCHES", False)
+    unit_of, units = _plan_enrichment_units(TRANSCRIPT, MATCHES)
+    assert unit_of == [0, 1, 2]
+    assert len(units) == 3
+
+
+def test_across_keywords_merges_distinct_phrases(monkeypatch):
+    monkeypatch.setattr("app.worker.tasks.process.settings.ENRICHMENT_CLUSTER_ACROSS_KEYWORDS", True)
+    matches = [_match("1", "Acme Corp", 0), _match("2", "great", 13)]
+    unit_of, units = _plan_enrichment_units(TRANSCRIPT, matches)
+    assert unit_of == [0, 0]
+    assert units[0][0] == "Acme Corp, great"
@@ -0,0 +1,78 @@
+"""Tests for the shared token-bucket rate limiter."""
+import pytest
+import redis
+
+from app.services import rate_limiter
+from app.services.rate_limiter import Bucket, LocalTokenBucketLimiter, llm_buckets, reserve
+
+
+@pytest.fixture
+def local_limiter(monkeypatch):
+    limiter = LocalTokenBucketLimiter()
+    rate_limiter.set_limiter(limiter)
+    yield limiter
+    rate_limiter.set_limiter(None)
+
+
+def test_burst_then_paced(local_limiter, monkeypatch):
+    monkeypatch.setattr("app.services.rate_limiter.time.monotonic", lambda: 50.0)
+    bucket = Bucket("llm:test", rate_per_second=2.0, capacity=2)
+    waits = [local_limiter.reserve(bucket) for _ in range(4)]
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_tokens_refill_over_time(local_limiter, monkeypatch):
+    clock = iter([10.0, 10.0, 11.0])
+    monkeypatch.setattr("app.services.rate_limiter.time.monotonic", lambda: next(clock))
+    bucket = Bucket("llm:test", rate_per_second=1.0, capacity=1)
+    assert local_limiter.reserve(bucket) == 0.0
+    assert local_limiter.reserve(bucket) == 1.0
+    # One second later the debt is repaid, so the next token waits a full interval.
+    assert local_limiter.reserve(bucket) == 1.0
+
+
+def test_reserve_uses_longest_wait_across_buckets(local_limiter, monkeypatch):
+    monkeypatch.setattr("app.services.rate_limiter.time.monotonic", lambda: 0.0)
+    provider = Bucket("llm:openrouter", rate_per_second=10.0, capacity=1)
+    model = Bucket("llm:openrouter:gpt", rate_per_second=1.0, capacity=1)
+    assert reserve([provider, model]) == 0.0
+    assert reserve([provider, model]) == 1.0
+
+
+def test_llm_buckets_follow_settings(monkeypatch):
+    monkeypatch.setattr("app.services.rate_limiter.settings.LLM_RATE_LIMIT_PER_SECOND", 5.0)
+    monkeypatch.setattr("app.services.rate_limiter.settings.LLM_MODEL_RATE_LIMIT_PER_SECOND", 0.0)
+    monkeypatch.setattr("app.services.rate_limiter.settings.LLM_RATE_LIMIT_BURST", 3)
+    assert llm_buckets("ollama", "llama3.2:3b") == [Bucket("llm:ollama", 5.0, 3)]
+
+
+def test_reserve_fails_open_when_redis_is_down():
+    class _DownLimiter:
+        def reserve(self, bucket):
+            raise redis.ConnectionError("down")
+
+    rate_limiter.set_limiter(_DownLimiter())
+    try:
+        assert reserve([Bucket("llm:ollama", 1.0, 1)]) == 0.0
+    finally:
+        rate_limiter.set_limiter(None)
+
+
+async def test_async_wait_reserves_off_the_event_loop():
+    import threading
+
+    loop_thread = threading.get_ident()
+    reserving_threads = []
+
+    class _RecordingLimiter:
+        def reserve(self, bucket):
+            reserving_threads.append(threading.get_ident())
+            return 0.0
+
+    rate_limiter.set_limiter(_RecordingLimiter())
+    try:
+        await rate_limiter.wait_for_slot_async([Bucket("llm:ollama", 1.0, 1)])
+    finally:
+        rate_limiter.set_limiter(None)
+
+    assert reserving_threads and reserving_threads[0] != loop_thread
@@ -0,0 +1,75 @@
+import subprocess
+
+import pytest
+
+from app.services.silence_trim import OffsetMap, _parse_silencedetect, speech_spans, trim_silence
+
+SILENCEDETECT_OUTPUT = """\
+Input #0, mp3, from 'episode.mp3':
+  Duration: 00:02:00.00, start: 0.025057, bitrate: 128 kb/s
+[silencedetect @ 0x1] silence_start: 0
+[silencedetect @ 0x1] silence_end: 10.5 | silence_duration: 10.5
+[silencedetect @ 0x1] silence_start: 40
+[silencedetect @ 0x1] silence_end: 90 | silence_duration: 50
+[silencedetect @ 0x1] silence_start: 110.2
+size=N/A time=00:02:00.00 bitrate=N/A speed= 500x
+"""
+
+
+def test_parse_silencedetect_closes_trailing_silence_at_duration():
+    silences, duration = _parse_silencedetect(SILENCEDETECT_OUTPUT)
+
+    assert duration == 120.0
+    assert silences == [(0.0, 10.5), (40.0, 90.0), (110.2, 120.0)]
+
+
+def test_speech_spans_keep_padding_around_speech():
+    spans = speech_spans([(0.0, 10.5), (40.0, 90.0), (110.2, 120.0)], 120.0, padding_seconds=0.5)
+
+    assert spans == [(10.0, 40.5), (89.5, 110.7)]
+
+
+def test_speech_spans_ignore_silence_shorter_than_padding():
+    assert speech_spans([(5.0, 5.4)], 20.0, padding_seconds=0.5) == [(0.0, 20.0)]
+
+
+def test_offset_map_translates_trimmed_time_to_original():
+    offset_map = OffsetMap(((10.0, 40.0), (90.0, 110.0)))
+
+    assert offset_map.to_original(0.0) == 10.0
+    assert offset_map.to_original(29.0) == 39.0
+    assert offset_map.to_original(30.0) == 90.0
+    assert offset_map.to_original(35.5) == 95.5
+    assert offset_map.to_original(500.0) == 110.0
+
+
+def _fake_ffmpeg(calls, stderr):
+    def _run(cmd, check, capture_output, text):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr=stderr)
+
+    return _run
+
+
+def test_trim_silence_writes_selected_spans_and_reports_savings(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr("app.services.silence_trim.subprocess.run", _fake_ffmpeg(calls, SILENCEDETECT_OUTPUT))
+    monkeypatch.setattr("app.services.silence_trim.settings.TRANSCRIPTION_VAD_PADDING_SECONDS", 0.0)
+    monkeypatch.setattr("app.services.silence_trim.settings.TRANSCRIPTION_VAD_MIN_SAVED_SECONDS", 30.0)
+
+    result = trim_silence("episode.mp3", str(tmp_path / "trimmed.mp3"))
+
+    assert result is not None
+    assert result.seconds_saved == pytest.approx(70.3)
+    assert result.offset_map.spans == ((10.5, 40.0), (90.0, 110.2))
+    assert "between(t,10.500,40.000)+between(t,90.000,110.200)" in calls[1][calls[1].index("-af") + 1]
+    assert calls[1][-1] == str(tmp_path / "trimmed.mp3")
+
+
+def test_trim_silence_skips_small_savings(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr("app.services.silence_trim.subprocess.run", _fake_ffmpeg(calls, SILENCEDETECT_OUTPUT))
+    monkeypatch.setattr("app.services.silence_trim.settings.TRANSCRIPTION_VAD_MIN_SAVED_SECONDS", 600.0)
+
+    assert trim_silence("episode.mp3", str(tmp_path / "trimmed.mp3")) is None
+    assert len(calls) == 1
@@ -1,10 +1,48 @@
+import io
 from pathlib import Path
 
 import httpx
+import pytest
 
 from app.services.transcription_service import transcribe_audio
 
 
+@pytest.fixture(autouse=True)
+def _checkpoint_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "app.services.transcription_checkpoint.settings.TRANSCRIPTION_CHECKPOINT_DIR",
+        str(tmp_path / "checkpoints"),
+    )
+
+
+class _FakeFfmpeg:
+    """Stands in for ``subprocess.Popen``: writes segments and lists them on stdout as CSV."""
+
+    def __init__(self, cmd, chunk_sizes, returncode=0, durations=None):
+        pattern = Path(cmd[-1])
+        start = int(cmd[cmd.index("-segment_start_number") + 1])
+        segment_time = float(cmd[cmd.index("-segment_time") + 1])
+        durations = durations or [segment_time] * len(chunk_sizes)
+        lines = []
+        elapsed = 0.0
+        for index, size in enumerate(chunk_sizes[start:], start=start):
+            name = f"chunk_{index:04d}.mp3"
+            (pattern.parent / name).write_bytes(b"a" * size)
+            lines.append(f"{name},{elapsed:.6f},{elapsed + durations[index]:.6f}\n")
+            elapsed += durations[index]
+        self.stdout = io.StringIO("".join(lines))
+        self.returncode = returncode
+
+    def wait(self):
+        return self.returncode
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        pass
+
+
 class _FakeResponse:
     def __init__(self, text: str = "ok"):
         self.text = text
@@ -26,7 +64,7 @@ def test_transcribe_audio_external_direct_upload(monkeypatch, tmp_path):
             "model": "gpt-4o-mini-transcribe",
         },
     )
-    monkeypatch.setattr("app.services.transcription_service.httpx.post", lambda *args, **kwargs: _FakeResponse("hello"))
+    monkeypatch.setattr("app.services.transcription_service.httpx.Client.post", lambda *args, **kwargs: _FakeResponse("hello"))
 
     transcript = transcribe_audio(str(audio_path))
     assert transcript == "hello"
@@ -49,17 +87,13 @@ def test_transcribe_audio_external_large_file_chunked(monkeypatch, tmp_path):
     monkeypatch.setattr("app.services.transcription_service.settings.TRANSCRIPTION_EXTERNAL_CHUNK_SECONDS", 60)
     monkeypatch.setattr("app.services.transcription_service.settings.TRANSCRIPTION_EXTERNAL_CHUNK_BITRATE_KBPS", 32)
 
-    def _fake_ffmpeg_run(cmd, check, capture_output, text):
-        pattern = Path(cmd[-1])
-        pattern.parent.mkdir(parents=True, exist_ok=True)
-        (pattern.parent / "chunk_0000.mp3").write_bytes(b"a" * 50)
-        (pattern.parent / "chunk_0001.mp3").write_bytes(b"b" * 50)
-        return None
-
-    monkeypatch.setattr("app.services.transcription_service.subprocess.run", _fake_ffmpeg_run)
+    monkeypatch.setattr(
+        "app.services.transcription_service.subprocess.Popen",
+        lambda cmd, **kwargs: _FakeFfmpeg(cmd, [50, 50]),
+    )
 
     responses = iter([_FakeResponse("first"), _FakeResponse("second")])
-    monkeypatch.setattr("app.services.transcription_service.httpx.post", lambda *args, **kwargs: next(responses))
+    monkeypatch.setattr("app.services.transcription_service.httpx.Client.post", lambda *args, **kwargs: next(responses))
 
     transcript = transcribe_audio(str(audio_path))
     assert transcript == "first\nsecond"
@@ -88,10 +122,261 @@ def test_transcribe_audio_external_413_raises_runtime_error(monkeypatch, tmp_pat
         def raise_for_status(self):
             raise httpx.HTTPStatusError("too large", request=request, response=response)
 
-    monkeypatch.setattr("app.services.transcription_service.httpx.post", lambda *args, **kwargs: _ErrorResponse())
+    monkeypatch.setattr("app.services.transcription_service.httpx.Client.post", lambda *args, **kwargs: _ErrorResponse())
 
     try:
         transcribe_audio(str(audio_path))
         assert False, "Expected RuntimeError"
     except RuntimeError as exc:
         assert "too large" in str(exc).lower()
+
+
+def _configure_chunked_external(monkeypatch, chunk_count: int):
+    monkeypatch.setattr(
+        "app.services.transcription_service.get_transcription_config_sync",
+        lambda: {
+            "provider": "external",
+            "external_url": "https://example.com/v1/audio/transcriptions",
+            "external_api_key": "",
+            "model": "gpt-4o-mini-transcribe",
+        },
+    )
+    monkeypatch.setattr("app.services.transcription_service.settings.TRANSCRIPTION_EXTERNAL_MAX_UPLOAD_BYTES", 100)
+
+    monkeypatch.setattr(
+        "app.services.transcription_service.subprocess.Popen",
+        lambda cmd, **kwargs: _FakeFfmpeg(cmd, [50] * chunk_count),
+    )
+    monkeypatch.setattr("app.services.transcription_service.time.sleep", lambda seconds: None)
+
+
+def _rate_limited_error() -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://example.com/v1/audio/transcriptions")
+    response = httpx.Response(429, headers={"Retry-After": "1"}, request=request)
+    return httpx.HTTPStatusError("rate limited", request=request, response=response)
+
+
+def test_transcribe_audio_parallel_chunks_keep_order_and_retry(monkeypatch, tmp_path):
+    import threading
+
+    audio_path = tmp_path / "audio.mp3"
+    audio_path.write_bytes(b"x" * 1024)
+    _configure_chunked_external(monkeypatch, chunk_count=4)
+    monkeypatch.setattr("app.services.transcription_service.settings.TRANSCRIPTION_CHUNK_CONCURRENCY", 3)
+
+    lock = threading.Lock()
+    attempts: dict[str, int] = {}
+
+    def _fake_submit(url, headers, model, chunk_path):
+        name = Path(chunk_path).stem
+        with lock:
+            attempts[name] = attempts.get(name, 0) + 1
+            attempt = attempts[name]
+        if name == "chunk_0001" and attempt == 1:
+            raise _rate_limited_error()
+        return f"text-{name[-1]}"
+
+    monkeypatch.setattr("app.services.transcription_service._submit_transcription_request", _fake_submit)
+
+    transcript = transcribe_audio(str(audio_path))
+    assert transcript == "text-0\ntext-1\ntext-2\ntext-3"
+    assert attempts["chunk_0001"] == 2
+
+
+def test_transcribe_audio_chunk_fails_after_retries(monkeypatch, tmp_path):
+    audio_path = tmp_path / "audio.mp3"
+    audio_path.write_bytes(b"x" * 1024)
+    _configure_chunked_external(monkeypatch, chunk_count=2)
+    monkeypatch.setattr("app.services.transcription_service.settings.TRANSCRIPTION_CHUNK_CONCURRENCY", 2)
+    monkeypatch.setattr("app.services.transcription_service.settings.TRANSCRIPTION_CHUNK_MAX_RETRIES", 1)
+
+    calls = []
+
+    def _fake_submit(url, headers, model, chunk_path):
+        calls.append(chunk_path)
+        if chunk_path.endswith("chunk_0001.mp3"):
+            raise _rate_limited_error()
+        return "ok"
+
+    monkeypatch.setattr("app.services.transcription_service._submit_transcription_request", _fake_submit)
+
+    try:
+        transcribe_audio(str(audio_path))
+        assert False, "Expected HTTPStatusError"
+    except httpx.HTTPStatusError as exc:
+        assert exc.response.status_code == 429
+    assert sum(1 for path in calls if path.endswith("chunk_0001.mp3")) == 2
+
+
+def test_transcribe_audio_resumes_from_chunk_checkpoint(monkeypatch, tmp_path):
+    audio_path = tmp_path / "audio.mp3"
+    audio_path.write_bytes(b"x" * 1024)
+    _configure_chunked_external(monkeypatch, chunk_count=3)
+    monkeypatch.setattr("app.services.transcription_service.settings.TRANSCRIPTION_CHUNK_MAX_RETRIES", 0)
+
+    ffmpeg_calls = []
+
+    def _fake_popen(cmd, **kwargs):
+        ffmpeg_calls.append(cmd)
+        return _FakeFfmpeg(cmd, [50] * 3)
+
+    monkeypatch.setattr("app.services.transcription_service.subprocess.Popen", _fake_popen)
+
+    calls = []
+    fail = {"chunk_0002"}
+
+    def _fake_submit(url, headers, model, chunk_path):
+        name = Path(chunk_path).stem
+        calls.append(name)
+        if name in fail:
+            raise _rate_limited_error()
+        return f"text-{name[-1]}"
+
+    monkeypatch.setattr("app.services.transcription_service._submit_transcription_request", _fake_submit)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        transcribe_audio(str(audio_path))
+    assert calls == ["chunk_0000", "chunk_0001", "chunk_0002"]
+
+    fail.clear()
+    calls.clear()
+    transcript = transcribe_audio(str(audio_path))
+
+    assert transcript == "text-0\ntext-1\ntext-2"
+    assert calls == ["chunk_0002"]
+    assert ffmpeg_calls[1][ffmpeg_calls[1].index("-ss") + 1] == "1200"
+    assert not any((tmp_path / "checkpoints").iterdir())
+
+
+def test_transcribe_audio_uploads_and_deletes_chunks_while_streaming(monkeypatch, tmp_path):
+    audio_path = tmp_path / "audio.mp3"
+    audio_path.write_bytes(b"x" * 1024)
+    _configure_chunked_external(monkeypatch, chunk_count=3)
+
+    def _fake_submit(url, headers, model, chunk_path):
+        chunk_dir = Path(chunk_path).parent
+        # Earlier chunks are gone once uploaded.
+        assert sorted(path.name for path in chunk_dir.glob("chunk_*.mp3"))[0] == Path(chunk_path).name
+        return Path(chunk_path).stem
+
+    monkeypatch.setattr("app.services.transcription_service._submit_transcription_request", _fake_submit)
+
+    assert transcribe_audio(str(audio_path)) == "chunk_0000\nchunk_0001\nchunk_0002"
+
+
+def test_transcribe_audio_rejects_oversized_streamed_chunk(monkeypatch, tmp_path):
+    audio_path = tmp_path / "audio.mp3"
+    audio_path.write_bytes(b"x" * 1024)
+    _configure_chunked_external(monkeypatch, chunk_count=0)
+    monkeypatch.setattr(
+        "app.services.transcription_service.subprocess.Popen",
+        lambda cmd, **kwargs: _FakeFfmpeg(cmd, [50, 500]),
+    )
+    submitted = []
+    monkeypatch.setattr(
+        "app.services.transcription_service._submit_transcription_request",
+        lambda url, headers, model, chunk_path: submitted.append(chunk_path) or "ok",
+    )
+
+    with pytest.raises(RuntimeError, match="too large"):
+        transcribe_audio(str(audio_path))
+    assert [Path(path).name for path in submitted] == ["chunk_0000.mp3"]
+
+
+def test_transcribe_audio_reports_ffmpeg_failure(monkeypatch, tmp_path):
+    audio_path = tmp_path / "audio.mp3"
+    audio_path.write_bytes(b"x" * 1024)
+    _configure_chunked_external(monkeypatch, chunk_count=0)
+    monkeypatch.setattr(
+        "app.services.transcription_service.subprocess.Popen",
+        lambda cmd, **kwargs: _FakeFfmpeg(cmd, [], returncode=1),
+    )
+
+    with pytest.raises(RuntimeError, match="Failed to chunk audio"):
+        transcribe_audio(str(audio_path))
+
+
+def test_transcribe_audio_timed_shifts_segments_by_chunk_and_trim(monkeypatch, tmp_path):
+    import json
+
+    from app.services.silence_trim import OffsetMap
+    from app.services.transcription_service import transcribe_audio_timed
+
+    audio_path = tmp_path / "audio.mp3"
+    audio_path.write_bytes(b"x" * 1024)
+    _configure_chunked_external(monkeypatch, chunk_count=2)
+    monkeypatch.setattr("app.services.transcription_service.settings.TRANSCRIPTION_EXTERNAL_CHUNK_SECONDS", 60)
+    # ffmpeg cut the first chunk on a packet boundary past the nominal 60s.
+    monkeypatch.setattr(
+        "app.services.transcription_service.subprocess.Popen",
+        lambda cmd, **kwargs: _FakeFfmpeg(cmd, [50, 50], durations=[61.5, 30.0]),
+    )
+
+    chunk_segments = {
+        "chunk_0000": [[0.0, 4.0, " Hello there."], [4.0, 9.5, " Acme is great."]],
+        "chunk_0001": [[1.0, 3.0, " Second chunk."], [3.0, 3.5, " "]],
+    }
+
+    def _fake_timed_submit(url, headers, model, chunk_path):
+        return json.dumps(chunk_segments[Path(chunk_path).stem])
+
+    monkeypatch.setattr(
+        "app.services.transcription_service._submit_timestamped_transcription_request",
+        _fake_timed_submit,
+    )
+
+    # 20s of leading silence and 40s between 50s and 90s were trimmed.
+    offset_map = OffsetMap(((20.0, 50.0), (90.0, 300.0)))
+    transcript = transcribe_audio_timed(str(audio_path), offset_map)
+
+    assert transcript.text == "Hello there. Acme is great.\nSecond chunk."
+    assert transcript.offsets == [0, 13, 28]
+    assert transcript.text[transcript.offsets[2]:].startswith("Second")
+    assert transcript.starts == [20.0, 24.0, 122.5]
+    assert transcript.ends == [24.0, 29.5, 124.5]
+
+
+def test_transcribe_audio_timed_resume_keeps_checkpointed_chunk_starts(monkeypatch, tmp_path):
+    import json
+
+    from app.services.transcription_service import transcribe_audio_timed
+
+    audio_path = tmp_path / "audio.mp3"
+    audio_path.write_bytes(b"x" * 1024)
+    _configure_chunked_external(monkeypatch, chunk_count=3)
+    monkeypatch.setattr("app.services.transcription_service.settings.TRANSCRIPTION_CHUNK_MAX_RETRIES", 0)
+    monkeypatch.setattr(
+        "app.services.transcription_service.subprocess.Popen",
+        lambda cmd, **kwargs: _FakeFfmpeg(cmd, [50] * 3, durations=[601.0, 599.0, 600.0]),
+    )
+    fail = {"chunk_0002"}
+
+    def _fake_timed_submit(url, headers, model, chunk_path):
+        name = Path(chunk_path).stem
+        if name in fail:
+            raise _rate_limited_error()
+        return json.dumps([[0.0, 1.0, name]])
+
+    monkeypatch.setattr(
+        "app.services.transcription_service._submit_timestamped_transcription_request",
+        _fake_timed_submit,
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        transcribe_audio_timed(str(audio_path))
+    fail.clear()
+    transcript = transcribe_audio_timed(str(audio_path))
+
+    # Chunk 1 keeps the start recorded by the first split; chunk 2 starts at the seek point.
+    assert transcript.starts == [0.0, 601.0, 1200.0]
+
+
+def test_transcript_segments_audio_time_at():
+    from app.models import TranscriptSegments
+
+    segments = TranscriptSegments(starts=[20.0, 24.0, 121.0], ends=[24.0, 29.5, 123.0], offsets=[0, 13, 28])
+
+    assert segments.audio_time_at(0) == 20.0
+    assert segments.audio_time_at(15) == 24.0
+    assert segments.audio_time_at(40) == 121.0
+    assert segments.audio_time_at(None) is None